@@ -34,6 +34,8 @@ class Config:
         'HS', 'CNN', 'J', 'P', 'NT', 'MH',
     ]
     highlight_pin1_choices = ['none', 'all', 'selected']
+    compression_codec_choices = ['lzstring', 'deflate', 'none']
+    validation_choices = ['full', 'structural', 'none']
     default_checkboxes = ['Sourced', 'Placed']
     html_config_fields = [
         'dark_mode', 'show_pads', 'show_fabrication', 'show_silkscreen',
@@ -59,6 +61,7 @@ class Config:
     bom_view = bom_view_choices[1]
     layer_view = layer_view_choices[1]
     compression = True
+    compression_codec = compression_codec_choices[0]
     open_browser = True
 
     # General section
@@ -71,6 +74,14 @@ class Config:
     include_tracks = False
     include_nets = False
     kicad_text_formatting = True
+    float_precision = 6
+    section_float_precision = {}
+    packed_geometry = False
+    footprint_templates = False
+    indexed_nets = False
+    merge_tracks = False
+    zone_simplify_tolerance = 0.0
+    validation = validation_choices[0]
 
     # Extra fields section
     extra_data_file = None
@@ -95,6 +106,23 @@ class Config:
     def _join(lst):
         return ','.join([s.replace(',', '\\,') for s in lst])
 
+    @classmethod
+    def _parse_section_precision(cls, s):
+        """Parses "section=precision,..." string into a dict"""
+        result = {}
+        for item in cls._split(s):
+            section, _, precision = item.partition('=')
+            try:
+                result[section.strip()] = int(precision)
+            except ValueError:
+                raise argparse.ArgumentTypeError(
+                    'Invalid section precision "%s"' % item)
+        return result
+
+    @staticmethod
+    def _join_section_precision(d):
+        return ','.join(['%s=%d' % (k, v) for k, v in d.items()])
+
     def __init__(self, version, local_dir):
         self.version = version
         self.local_config_file = os.path.join(local_dir, 'ibom.config.ini')
@@ -129,6 +157,8 @@ class Config:
         self.bom_view = f.Read('bom_view', self.bom_view)
         self.layer_view = f.Read('layer_view', self.layer_view)
         self.compression = f.ReadBool('compression', self.compression)
+        self.compression_codec = f.Read(
+            'compression_codec', self.compression_codec)
         self.open_browser = f.ReadBool('open_browser', self.open_browser)
 
         f.SetPath('/general')
@@ -146,6 +176,20 @@ class Config:
             'blacklist_empty_val', self.blacklist_empty_val)
         self.include_tracks = f.ReadBool('include_tracks', self.include_tracks)
         self.include_nets = f.ReadBool('include_nets', self.include_nets)
+        self.float_precision = f.ReadInt(
+            'float_precision', self.float_precision)
+        self.section_float_precision = self._parse_section_precision(f.Read(
+            'section_float_precision',
+            self._join_section_precision(self.section_float_precision)))
+        self.packed_geometry = f.ReadBool(
+            'packed_geometry', self.packed_geometry)
+        self.footprint_templates = f.ReadBool(
+            'footprint_templates', self.footprint_templates)
+        self.indexed_nets = f.ReadBool('indexed_nets', self.indexed_nets)
+        self.merge_tracks = f.ReadBool('merge_tracks', self.merge_tracks)
+        self.zone_simplify_tolerance = f.ReadDouble(
+            'zone_simplify_tolerance', self.zone_simplify_tolerance)
+        self.validation = f.Read('validation', self.validation)
 
         f.SetPath('/fields')
         self.show_fields = self._split(f.Read(
@@ -189,6 +233,7 @@ class Config:
         f.Write('bom_view', self.bom_view)
         f.Write('layer_view', self.layer_view)
         f.WriteBool('compression', self.compression)
+        f.Write('compression_codec', self.compression_codec)
         f.WriteBool('open_browser', self.open_browser)
 
         f.SetPath('/general')
@@ -206,6 +251,15 @@ class Config:
         f.WriteBool('blacklist_empty_val', self.blacklist_empty_val)
         f.WriteBool('include_tracks', self.include_tracks)
         f.WriteBool('include_nets', self.include_nets)
+        f.WriteInt('float_precision', self.float_precision)
+        f.Write('section_float_precision',
+                self._join_section_precision(self.section_float_precision))
+        f.WriteBool('packed_geometry', self.packed_geometry)
+        f.WriteBool('footprint_templates', self.footprint_templates)
+        f.WriteBool('indexed_nets', self.indexed_nets)
+        f.WriteBool('merge_tracks', self.merge_tracks)
+        f.WriteDouble('zone_simplify_tolerance', self.zone_simplify_tolerance)
+        f.Write('validation', self.validation)
 
         f.SetPath('/fields')
         f.Write('show_fields', self._join(self.show_fields))
@@ -237,6 +291,7 @@ class Config:
         self.layer_view = self.layer_view_choices[
             dlg.html.layerDefaultView.Selection]
         self.compression = dlg.html.compressionCheckbox.IsChecked()
+        # No dialog for compression_codec ...
         self.open_browser = dlg.html.openBrowserCheckbox.IsChecked()
 
         # General
@@ -250,6 +305,10 @@ class Config:
             dlg.general.blacklistEmptyValCheckbox.IsChecked()
         self.include_tracks = dlg.general.includeTracksCheckbox.IsChecked()
         self.include_nets = dlg.general.includeNetsCheckbox.IsChecked()
+        # No dialog for float_precision and section_float_precision ...
+        # No dialog for packed_geometry, footprint_templates,
+        # indexed_nets, merge_tracks, zone_simplify_tolerance and
+        # validation ...
 
         # Fields
         self.extra_data_file = dlg.fields.extraDataFilePicker.Path
@@ -288,6 +347,7 @@ class Config:
         dlg.html.layerDefaultView.Selection = self.layer_view_choices.index(
             self.layer_view)
         dlg.html.compressionCheckbox.Value = self.compression
+        # No dialog for compression_codec ...
         dlg.html.openBrowserCheckbox.Value = self.open_browser
 
         # General
@@ -304,6 +364,10 @@ class Config:
         dlg.general.blacklistEmptyValCheckbox.Value = self.blacklist_empty_val
         dlg.general.includeTracksCheckbox.Value = self.include_tracks
         dlg.general.includeNetsCheckbox.Value = self.include_nets
+        # No dialog for float_precision and section_float_precision ...
+        # No dialog for packed_geometry, footprint_templates,
+        # indexed_nets, merge_tracks, zone_simplify_tolerance and
+        # validation ...
 
         # Fields
         dlg.fields.extraDataFilePicker.SetInitialDirectory(
@@ -410,6 +474,13 @@ class Config:
         parser.add_argument('--compression', dest='no_compression',
                             help='Enable compression of pcb data.',
                             action='store_false', default=False)
+        parser.add_argument('--compression-codec',
+                            default=cls.compression_codec,
+                            choices=cls.compression_codec_choices,
+                            help='Compression codec of pcb data. deflate '
+                                 'is faster to compress and to load but '
+                                 'needs a browser with DecompressionStream '
+                                 'support for best performance.')
         parser.add_argument('--no-browser', help='Do not launch browser.',
                             action='store_true')
         parser.add_argument('--browser', dest='no_browser',
@@ -435,6 +506,43 @@ class Config:
         parser.add_argument('--exclude-nets', dest='include_nets',
                            action='store_false', default=False,
                            help='Exclude netlist information from output.')
+        parser.add_argument('--float-precision', type=int,
+                            default=cls.float_precision,
+                            help='Number of decimals that coordinates and '
+                                 'sizes are rounded to in pcb data.')
+        parser.add_argument('--section-float-precision',
+                            type=cls._parse_section_precision,
+                            default=cls._join_section_precision(
+                                cls.section_float_precision),
+                            help='Comma separated list of pcb data sections '
+                                 'with their own float precision. '
+                                 'E.g. "zones=4,tracks=5"')
+        parser.add_argument('--packed-geometry', action='store_true',
+                            help='Store tracks, zones, edges and custom pad '
+                                 'polygons in compact binary buffers. '
+                                 'Makes pcb data smaller and faster to '
+                                 'load.')
+        parser.add_argument('--footprint-templates', action='store_true',
+                            help='Store pads of identical footprints once '
+                                 'and reference them from each footprint.')
+        parser.add_argument('--indexed-nets', action='store_true',
+                            help='Refer to nets of tracks, zones and pads by '
+                                 'their index in netlist instead of by name. '
+                                 'Only has effect with --include-nets.')
+        parser.add_argument('--merge-tracks', action='store_true',
+                            help='Chain connected track segments with the '
+                                 'same net and width into polylines.')
+        parser.add_argument('--zone-simplify-tolerance', type=float,
+                            default=cls.zone_simplify_tolerance,
+                            help='Simplify zone outlines removing vertices '
+                                 'that deviate less than this distance from '
+                                 'the simplified outline. 0 disables '
+                                 'simplification.')
+        parser.add_argument('--validation', default=cls.validation,
+                            choices=cls.validation_choices,
+                            help='Schema validation of generic json input. '
+                                 'structural only validates a sample of '
+                                 'components, footprints and drawings.')
         parser.add_argument('--sort-order',
                             help='Default sort order for components. '
                                  'Must contain "~" once.',
@@ -549,6 +657,8 @@ class Config:
             ('html_defaults', 'bom_view', 'bom_view', 'str'),
             ('html_defaults', 'layer_view', 'layer_view', 'str'),
             ('html_defaults', 'compression', 'no_compression', 'not'),
+            ('html_defaults', 'compression_codec', 'compression_codec',
+             'str'),
             ('html_defaults', 'open_browser', 'no_browser', 'not'),
             # General
             ('general', 'bom_dest_dir', 'dest_dir', 'str'),
@@ -560,6 +670,17 @@ class Config:
              'bool'),
             ('general', 'include_tracks', 'include_tracks', 'bool'),
             ('general', 'include_nets', 'include_nets', 'bool'),
+            ('general', 'float_precision', 'float_precision', 'str'),
+            ('general', 'section_float_precision', 'section_float_precision',
+             'str'),
+            ('general', 'packed_geometry', 'packed_geometry', 'bool'),
+            ('general', 'footprint_templates', 'footprint_templates',
+             'bool'),
+            ('general', 'indexed_nets', 'indexed_nets', 'bool'),
+            ('general', 'merge_tracks', 'merge_tracks', 'bool'),
+            ('general', 'zone_simplify_tolerance', 'zone_simplify_tolerance',
+             'str'),
+            ('general', 'validation', 'validation', 'str'),
             # Fields
             ('fields', 'show_fields', 'show_fields', 'str'),
             ('fields', 'group_fields', 'group_fields', 'str'),
@@ -618,6 +739,7 @@ class Config:
         self.bom_view = args.bom_view
         self.layer_view = args.layer_view
         self.compression = not args.no_compression
+        self.compression_codec = args.compression_codec
         self.open_browser = not args.no_browser
 
         # General
@@ -629,6 +751,14 @@ class Config:
         self.blacklist_empty_val = args.blacklist_empty_val
         self.include_tracks = args.include_tracks
         self.include_nets = args.include_nets
+        self.float_precision = args.float_precision
+        self.section_float_precision = args.section_float_precision
+        self.packed_geometry = args.packed_geometry
+        self.footprint_templates = args.footprint_templates
+        self.indexed_nets = args.indexed_nets
+        self.merge_tracks = args.merge_tracks
+        self.zone_simplify_tolerance = args.zone_simplify_tolerance
+        self.validation = args.validation
 
         # Fields
         self.extra_data_file = args.extra_data_file or args.netlist_file
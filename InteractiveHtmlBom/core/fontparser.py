@@ -1,4 +1,87 @@
-from .newstroke_font import NEWSTROKE_FONT
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+# Compact copy of NEWSTROKE_FONT from newstroke_font.py, regenerate with
+# python -m InteractiveHtmlBom.core.fontparser
+# after changing the font. Layout, little endian:
+#   uint32 glyph count N
+#   uint32 offsets[N + 1] of each glyph in coordinate pairs
+#   int8 coordinate pairs, glyph characters minus 'R'
+GLYPH_STORE = os.path.join(os.path.dirname(__file__), 'newstroke_font.bin')
+# ' R' in glyph strings lifts the pen
+PEN_UP = (ord(' ') - ord('R'), 0)
+
+_glyph_store = None
+
+
+def build_glyph_store():
+    from .newstroke_font import NEWSTROKE_FONT
+
+    offsets = array('I', [0])
+    coords = array('b')
+    for glyph_str in NEWSTROKE_FONT:
+        coords.extend(ord(c) - ord('R') for c in glyph_str)
+        offsets.append(len(coords) // 2)
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    return (struct.pack('<I', len(NEWSTROKE_FONT)) + offsets.tobytes() +
+            coords.tobytes())
+
+
+def load_glyph_store():
+    """Returns (offsets, coords) arrays, the file is read on first use."""
+    global _glyph_store
+    if _glyph_store is None:
+        with open(GLYPH_STORE, 'rb') as f:
+            data = f.read()
+        count = struct.unpack_from('<I', data)[0]
+        coords_start = 4 + 4 * (count + 1)
+        offsets = array('I')
+        offsets.frombytes(data[4:coords_start])
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        coords = array('b')
+        coords.frombytes(data[coords_start:])
+        _glyph_store = offsets, coords
+    return _glyph_store
+
+
+@lru_cache(maxsize=1024)
+def parse_glyph(index):
+    """Decodes glyph of the font. Returned glyphs are shared between
+    parsers and must not be modified."""
+    scale = FontParser.STROKE_FONT_SCALE
+    offset = FontParser.FONT_OFFSET
+    offsets, coords = load_glyph_store()
+    if index >= len(offsets) - 1:
+        index = ord('?') - ord(' ')
+    start = offsets[index] * 2
+    end = offsets[index + 1] * 2
+
+    # The first two values contain the width of the char
+    glyph_x = coords[start] * scale
+    glyph_width = (coords[start + 1] - coords[start]) * scale
+    lines = []
+    line = []
+    for i in range(start + 2, end, 2):
+        x = coords[i]
+        y = coords[i + 1]
+        if (x, y) == PEN_UP:
+            lines.append(line)
+            line = []
+        else:
+            line.append([x * scale - glyph_x, (y + offset) * scale])
+
+    if len(line) > 0:
+        lines.append(line)
+
+    return {
+        'w': glyph_width,
+        'l': lines
+    }
 
 
 class FontParser:
@@ -9,44 +92,23 @@ class FontParser:
         self.parsed_font = {}
 
     def parse_font_char(self, chr):
-        lines = []
-        line = []
-        glyph_x = 0
-        index = ord(chr) - ord(' ')
-        if index >= len(NEWSTROKE_FONT):
-            index = ord('?') - ord(' ')
-        glyph_str = NEWSTROKE_FONT[index]
-        for i in range(0, len(glyph_str), 2):
-            coord = glyph_str[i:i + 2]
-
-            # The first two values contain the width of the char
-            if i < 2:
-                glyph_x = (ord(coord[0]) - ord('R')) * self.STROKE_FONT_SCALE
-                glyph_width = (ord(coord[1]) - ord(coord[0])) * self.STROKE_FONT_SCALE
-            elif coord[0] == ' ' and coord[1] == 'R':
-                lines.append(line)
-                line = []
-            else:
-                line.append([
-                    (ord(coord[0]) - ord('R')) * self.STROKE_FONT_SCALE - glyph_x,
-                    (ord(coord[1]) - ord('R') + self.FONT_OFFSET) * self.STROKE_FONT_SCALE
-                ])
-
-        if len(line) > 0:
-            lines.append(line)
-
-        return {
-            'w': glyph_width,
-            'l': lines
-        }
+        return parse_glyph(ord(chr) - ord(' '))
 
     def parse_font_for_string(self, s):
+        parsed_font = self.parsed_font
         for c in s:
-            if c == '\t' and ' ' not in self.parsed_font:
+            if c in parsed_font:
+                continue
+            if c == '\t' and ' ' not in parsed_font:
                 # tabs rely on space char to calculate offset
-                self.parsed_font[' '] = self.parse_font_char(' ')
-            if c not in self.parsed_font and ord(c) >= ord(' '):
-                self.parsed_font[c] = self.parse_font_char(c)
+                parsed_font[' '] = self.parse_font_char(' ')
+            if ord(c) >= ord(' '):
+                parsed_font[c] = self.parse_font_char(c)
 
     def get_parsed_font(self):
         return self.parsed_font
+
+
+if __name__ == '__main__':
+    with open(GLYPH_STORE, 'wb') as f:
+        f.write(build_glyph_store())
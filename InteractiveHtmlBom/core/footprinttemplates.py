@@ -0,0 +1,109 @@
+"""
+Deduplicates pad geometry of identical footprints.
+
+Pads of footprints that share the same definition are stored once in
+pcbdata["footprint_templates"] in footprint local coordinates. Each
+footprint instance then only refers to its template and carries its own
+transform and pad nets. See "footprint templates" in DATAFORMAT.md.
+"""
+import math
+
+from .jsonencoder import PcbdataEncoder
+
+
+class FootprintTemplates(object):
+    # Decimals of local coordinates that have to match for footprints to
+    # share a template. Absorbs rounding noise of the transforms.
+    KEY_PRECISION = 4
+
+    def __init__(self):
+        self.key_encoder = PcbdataEncoder(self.KEY_PRECISION)
+
+    @staticmethod
+    def _rotate(v, angle):
+        # Same as rotateVector() in render.js but drops trigonometry noise
+        # and negative zeros so that equal pads encode to the same key.
+        angle = math.radians(angle)
+        return [round(v[0] * math.cos(angle) - v[1] * math.sin(angle), 9)
+                + 0.0,
+                round(v[0] * math.sin(angle) + v[1] * math.cos(angle), 9)
+                + 0.0]
+
+    @staticmethod
+    def _normalize_angle(angle):
+        angle = angle % 360
+        return angle - 360 if angle > 180 else angle
+
+    def local_pad(self, pad, pos, angle, mirror):
+        # type: (dict, list, float, bool) -> dict | None
+        """
+        Returns pad in coordinates of footprint placed at pos and rotated by
+        angle, mirrored along x axis and flipped to the other side of the
+        board if mirror is set. Returns None if pad can't be templated.
+        """
+        if 'svgpath' in pad:
+            # svg paths are in board coordinates
+            return None
+        local = {k: v for k, v in pad.items() if k != 'net'}
+        x, y = self._rotate(
+            [pad['pos'][0] - pos[0], pad['pos'][1] - pos[1]], angle)
+        if not mirror:
+            local['pos'] = [x, y]
+            local['angle'] = self._normalize_angle(pad['angle'] - angle)
+            return local
+
+        local['pos'] = [-x + 0.0, y]
+        local['angle'] = self._normalize_angle(angle - pad['angle'])
+        if 'offset' in pad:
+            local['offset'] = [-pad['offset'][0], pad['offset'][1]]
+        if 'polygons' in pad:
+            local['polygons'] = [[[-p[0], p[1]] for p in polygon]
+                                 for polygon in pad['polygons']]
+        if 'chamfpos' in pad:
+            # swap left and right corner bits
+            c = pad['chamfpos']
+            local['chamfpos'] = ((c & 5) << 1) | ((c & 10) >> 1)
+        local['layers'] = [{'F': 'B', 'B': 'F'}[layer]
+                           for layer in pad['layers']]
+        return local
+
+    def apply(self, pcbdata):
+        # type: (dict) -> dict
+        """
+        Replaces pads of footprints that have at least one identical twin
+        with template references. Modifies pcbdata in place and returns it.
+        """
+        candidates = {}
+        for footprint in pcbdata['footprints']:
+            if not footprint['pads']:
+                continue
+            pos = footprint['bbox']['pos']
+            angle = footprint['bbox']['angle']
+            mirror = footprint['layer'] == 'B'
+            pads = [self.local_pad(pad, pos, angle, mirror)
+                    for pad in footprint['pads']]
+            if None in pads:
+                continue
+            key = self.key_encoder.encode(pads)
+            candidates.setdefault(key, []).append((footprint, pads))
+
+        templates = []
+        for instances in candidates.values():
+            if len(instances) < 2:
+                continue
+            templates.append({'pads': instances[0][1]})
+            for footprint, _ in instances:
+                footprint['template'] = len(templates) - 1
+                footprint['transform'] = [
+                    footprint['bbox']['pos'][0],
+                    footprint['bbox']['pos'][1],
+                    footprint['bbox']['angle'],
+                    1 if footprint['layer'] == 'B' else 0,
+                ]
+                if any('net' in pad for pad in footprint['pads']):
+                    footprint['nets'] = [pad.get('net')
+                                         for pad in footprint['pads']]
+                del footprint['pads']
+
+        pcbdata['footprint_templates'] = templates
+        return pcbdata
@@ -0,0 +1,137 @@
+"""
+Packs coordinate heavy pcbdata sections into binary buffers.
+
+Nested json lists of coordinates are replaced with references into two
+shared buffers, one of float32 and one of int32 values, that are embedded
+in pcbdata as base64 strings. The page turns the references into typed
+array views on load. See "packed geometry" in DATAFORMAT.md.
+"""
+import base64
+import sys
+from array import array
+from itertools import chain
+
+# Increment when packed layout changes in a way older pages can't read.
+FORMAT_VERSION = 1
+
+
+class GeometryPacker(object):
+
+    def __init__(self):
+        self.float32 = array('f')
+        self.int32 = array('i')
+
+    def f32(self, values):
+        offset = len(self.float32)
+        self.float32.extend(values)
+        return {'f32': [offset, len(self.float32) - offset]}
+
+    def i32(self, values):
+        offset = len(self.int32)
+        self.int32.extend(values)
+        return {'i32': [offset, len(self.int32) - offset]}
+
+    def pack_polygons(self, polygons):
+        """
+        Packs list of outlines into flat [x, y, ...] point buffer
+        and a buffer of point counts per outline.
+        """
+        return {
+            'points': self.f32(chain.from_iterable(
+                chain.from_iterable(polygons))),
+            'lengths': self.i32([len(p) for p in polygons]),
+        }
+
+    def pack_tracks(self, tracks):
+        segments = [t for t in tracks if 'start' in t]
+        arcs = [t for t in tracks if 'radius' in t]
+        polylines = [t for t in tracks if 'points' in t]
+
+        def pack_common(group, tracks):
+            group['width'] = self.f32([t['width'] for t in tracks])
+            if any('net' in t for t in tracks):
+                group['net'] = [t.get('net') for t in tracks]
+            return group
+
+        packed_segments = pack_common({
+            'coords': self.f32(chain.from_iterable(
+                (t['start'][0], t['start'][1], t['end'][0], t['end'][1])
+                for t in segments)),
+        }, segments)
+        if any('drillsize' in t for t in segments):
+            # 0 means tented via or a track
+            packed_segments['drillsize'] = self.f32(
+                [t.get('drillsize', 0) for t in segments])
+        packed_arcs = pack_common({
+            'coords': self.f32(chain.from_iterable(
+                (t['center'][0], t['center'][1], t['radius'],
+                 t['startangle'], t['endangle'])
+                for t in arcs)),
+        }, arcs)
+        result = {'segments': packed_segments, 'arcs': packed_arcs}
+        if polylines:
+            result['polylines'] = pack_common({
+                'coords': self.f32(chain.from_iterable(
+                    chain.from_iterable(t['points'] for t in polylines))),
+                'lengths': self.i32([len(t['points']) for t in polylines]),
+            }, polylines)
+        return result
+
+    def pack_edges(self, edges):
+        result = []
+        # Plain segments are merged into one drawing per line width.
+        segments_by_width = {}
+        for edge in edges:
+            if 'svgpath' in edge:
+                result.append(edge)
+            elif edge['type'] == 'segment':
+                segments_by_width.setdefault(edge['width'], []).append(edge)
+            elif edge['type'] == 'polygon':
+                edge = dict(edge)
+                edge['polygons'] = self.pack_polygons(edge['polygons'])
+                result.append(edge)
+            else:
+                result.append(edge)
+        for width, segments in segments_by_width.items():
+            result.append({
+                'type': 'segments',
+                'coords': self.f32(chain.from_iterable(
+                    (s['start'][0], s['start'][1], s['end'][0], s['end'][1])
+                    for s in segments)),
+                'width': width,
+            })
+        return result
+
+    def pack(self, pcbdata):
+        # type: (dict) -> dict
+        """Packs pcbdata geometry in place and returns pcbdata."""
+        pcbdata['edges'] = self.pack_edges(pcbdata['edges'])
+        # Templated footprints have their pads in footprint_templates
+        for footprint in (pcbdata['footprints'] +
+                          pcbdata.get('footprint_templates', [])):
+            for pad in footprint.get('pads', []):
+                if 'polygons' in pad and 'svgpath' not in pad:
+                    pad['polygons'] = self.pack_polygons(pad['polygons'])
+        if 'tracks' in pcbdata:
+            pcbdata['tracks'] = {layer: self.pack_tracks(tracks)
+                                 for layer, tracks in
+                                 pcbdata['tracks'].items()}
+        for zones in pcbdata.get('zones', {}).values():
+            for zone in zones:
+                if 'polygons' in zone and 'svgpath' not in zone:
+                    zone['polygons'] = self.pack_polygons(zone['polygons'])
+
+        pcbdata['geometry_encoding'] = {
+            'version': FORMAT_VERSION,
+            'float32': self._to_base64(self.float32),
+            'int32': self._to_base64(self.int32),
+        }
+        return pcbdata
+
+    @staticmethod
+    def _to_base64(buffer):
+        # Typed arrays in browsers are little endian
+        if sys.byteorder != 'little':
+            buffer = array(buffer.typecode, buffer)
+            buffer.byteswap()
+        return base64.b64encode(buffer.tobytes()).decode('ascii')
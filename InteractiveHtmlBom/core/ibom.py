@@ -10,6 +10,12 @@ from datetime import datetime
 
 from . import units
 from .config import Config
+from .footprinttemplates import FootprintTemplates
+from .geometrypacker import GeometryPacker
+from .jsonencoder import PcbdataEncoder
+from .netindices import index_nets
+from .polylines import merge_track_polylines
+from .simplify import simplify_zones
 from ..ecad.common import EcadParser, Component
 from ..errors import ParsingException
 from ..compat import get_wx
@@ -21,6 +27,9 @@ class Logger(object):
         self.cli = cli
         self.logger = logging.getLogger('InteractiveHtmlBom')
         self.logger.setLevel(logging.INFO)
+        if self.logger.handlers:
+            # Already configured by another Logger in this process
+            return
         ch = logging.StreamHandler(sys.stdout)
         ch.setLevel(logging.INFO)
         formatter = logging.Formatter(
@@ -48,45 +57,66 @@ class Logger(object):
 log = None
 
 
-def skip_component(m, config):
-    # type: (Component, Config) -> bool
-    # skip blacklisted components
-    ref_prefix = re.findall('^[A-Z]*', m.ref)[0]
-    if m.ref in config.component_blacklist:
-        return True
-    if ref_prefix + '*' in config.component_blacklist:
-        return True
-
-    if config.blacklist_empty_val and m.val in ['', '~']:
-        return True
-
-    # skip virtual components if needed
-    if config.blacklist_virtual and m.attr == 'Virtual':
-        return True
-
-    # skip components with dnp field not empty
-    if config.dnp_field \
-            and config.dnp_field in m.extra_fields \
-            and m.extra_fields[config.dnp_field]:
-        return True
-
-    # skip components with wrong variant field
-    empty_str = '<empty>'
-    if config.board_variant_field and config.board_variant_whitelist:
-        ref_variant = m.extra_fields.get(config.board_variant_field, '')
-        if ref_variant == '':
-            ref_variant = empty_str
-        if ref_variant not in config.board_variant_whitelist:
+class ComponentFilter(object):
+    """Component filters of the config compiled into a predicate.
+
+    Calling the filter with a component returns True if it should be
+    skipped.
+    """
+    REF_PREFIX_RE = re.compile('^[A-Z]*')
+    EMPTY_VARIANT = '<empty>'
+
+    def __init__(self, config):
+        # type: (Config) -> None
+        self.refs = set(config.component_blacklist)
+        self.ref_prefixes = {ref[:-1] for ref in self.refs
+                             if ref.endswith('*')}
+        self.empty_values = {'', '~'} if config.blacklist_empty_val else set()
+        self.blacklist_virtual = config.blacklist_virtual
+        self.dnp_field = config.dnp_field
+        self.variant_field = config.board_variant_field
+        self.variant_whitelist = None
+        self.variant_blacklist = None
+        if self.variant_field:
+            if config.board_variant_whitelist:
+                self.variant_whitelist = set(config.board_variant_whitelist)
+            if config.board_variant_blacklist:
+                self.variant_blacklist = set(config.board_variant_blacklist)
+
+    def __call__(self, m):
+        # type: (Component) -> bool
+        # skip blacklisted components
+        if m.ref in self.refs:
+            return True
+        if self.ref_prefixes and \
+                self.REF_PREFIX_RE.match(m.ref).group() in self.ref_prefixes:
             return True
 
-    if config.board_variant_field and config.board_variant_blacklist:
-        ref_variant = m.extra_fields.get(config.board_variant_field, '')
-        if ref_variant == '':
-            ref_variant = empty_str
-        if ref_variant != empty_str and ref_variant in config.board_variant_blacklist:
+        if m.val in self.empty_values:
             return True
 
-    return False
+        # skip virtual components if needed
+        if self.blacklist_virtual and m.attr == 'Virtual':
+            return True
+
+        # skip components with dnp field not empty
+        if self.dnp_field and m.extra_fields.get(self.dnp_field):
+            return True
+
+        # skip components with wrong variant field
+        if self.variant_field:
+            ref_variant = m.extra_fields.get(self.variant_field, '')
+            if ref_variant == '':
+                ref_variant = self.EMPTY_VARIANT
+            if self.variant_whitelist is not None and \
+                    ref_variant not in self.variant_whitelist:
+                return True
+            if self.variant_blacklist is not None and \
+                    ref_variant != self.EMPTY_VARIANT and \
+                    ref_variant in self.variant_blacklist:
+                return True
+
+        return False
 
 
 def generate_bom(pcb_footprints, config):
@@ -119,8 +149,9 @@ def generate_bom(pcb_footprints, config):
     group_by = set(config.group_fields)
     index_to_fields = {}
 
+    skip = ComponentFilter(config)
     for i, f in enumerate(pcb_footprints):
-        if skip_component(f, config):
+        if skip(f):
             skipped_components.append(i)
             continue
 
@@ -243,75 +274,159 @@ def process_substitutions(bom_name_format, pcb_file_name, metadata):
     return name + '.html'
 
 
-def round_floats(o, precision):
-    if isinstance(o, float):
-        return round(o, precision)
-    if isinstance(o, dict):
-        return {k: round_floats(v, precision) for k, v in o.items()}
-    if isinstance(o, (list, tuple)):
-        return [round_floats(x, precision) for x in o]
-    return o
+def get_pcbdata_javascript(pcbdata, codec, encoder):
+    # type: (dict, str, PcbdataEncoder) -> str | function
+    """
+    Returns pcbdata javascript. Compressed data is returned as a string,
+    uncompressed data as a function that streams it into a text file.
+    """
+    from . import lzstring_fast
+
+    if codec == 'lzstring':
+        log.info("Compressing pcb data")
+        pcbdata_str = json.dumps(
+            lzstring_fast.compress_to_base64(encoder.encode(pcbdata)))
+        return "var pcbdata = JSON.parse(LZString.decompressFromBase64({}))" \
+            .format(pcbdata_str)
+
+    if codec == 'deflate':
+        import base64
+        import zlib
+        log.info("Compressing pcb data")
+        compressor = zlib.compressobj()
+        compressed = []
+        # encoder output is pure ascii
+        encoder.dump(pcbdata, lambda s: compressed.append(
+            compressor.compress(s.encode('ascii'))))
+        compressed.append(compressor.flush())
+        pcbdata_str = json.dumps(
+            base64.b64encode(b''.join(compressed)).decode('ascii'))
+        return ("var pcbdata = null;\n"
+                "var pcbdataPromise = decompressPcbdata(%s)" % pcbdata_str)
 
+    def write(f):
+        f.write("var pcbdata = ")
+        encoder.dump(pcbdata, f.write)
 
-def get_pcbdata_javascript(pcbdata, compression):
-    from .lzstring import LZString
+    return write
 
-    js = "var pcbdata = {}"
-    pcbdata_str = json.dumps(round_floats(pcbdata, 6))
 
-    if compression:
-        log.info("Compressing pcb data")
-        pcbdata_str = json.dumps(LZString().compress_to_base64(pcbdata_str))
-        js = "var pcbdata = JSON.parse(LZString.decompressFromBase64({}))"
+class HtmlTemplate(object):
+    """Html page template split into static text and ///NAME/// placeholders.
+
+    Page is streamed into the output file segment by segment instead of
+    building the whole document in memory with chained str.replace().
+    """
+    PLACEHOLDER_REGEX = re.compile(r'///([A-Z][A-Z_-]*)///')
+    # Large substitutions (pcbdata) are written in chunks of this size so
+    # that text encoding never copies the whole blob at once.
+    CHUNK_SIZE = 1 << 20
+
+    _cache = {}
+
+    def __init__(self, html):
+        # Even indices are static text, odd indices are placeholder names.
+        self.segments = self.PLACEHOLDER_REGEX.split(html)
+
+    @classmethod
+    def load(cls, path):
+        # type: (str) -> HtmlTemplate
+        """Returns template for the file, split only once per process."""
+        key = (path, os.path.getmtime(path))
+        if key not in cls._cache:
+            with io.open(path, 'r', encoding='utf-8') as f:
+                cls._cache[key] = cls(f.read())
+        return cls._cache[key]
+
+    def write(self, f, substitutions):
+        # type: (io.TextIOBase, dict) -> None
+        """
+        Writes the page to f. Substitution values are either strings or
+        functions that take f and write the content themselves.
+        """
+        for i, segment in enumerate(self.segments):
+            if i % 2 == 0:
+                f.write(segment)
+            elif segment in substitutions:
+                value = substitutions[segment]
+                if callable(value):
+                    value(f)
+                else:
+                    self._write_chunked(f, value)
+            else:
+                f.write('///%s///' % segment)
+
+    @classmethod
+    def _write_chunked(cls, f, text):
+        if len(text) <= cls.CHUNK_SIZE:
+            f.write(text)
+            return
+        for i in range(0, len(text), cls.CHUNK_SIZE):
+            f.write(text[i:i + cls.CHUNK_SIZE])
+
+
+# Javascript that decodes pcbdata for each compression codec.
+DECOMPRESSOR_JS = {
+    'lzstring': 'lz-string.js',
+    'deflate': 'inflate.js',
+}
+
 
-    return js.format(pcbdata_str)
+def get_web_file_path(file_name):
+    return os.path.join(os.path.dirname(__file__), "..", "web", file_name)
+
+
+def get_bom_file_name(config, pcb_file_dir, pcb_file_name, metadata):
+    # type: (Config, str, str, dict) -> str
+    if os.path.isabs(config.bom_dest_dir):
+        bom_file_dir = config.bom_dest_dir
+    else:
+        bom_file_dir = os.path.join(pcb_file_dir, config.bom_dest_dir)
+    bom_file_name = process_substitutions(
+        config.bom_name_format, pcb_file_name, metadata)
+    return os.path.join(bom_file_dir, bom_file_name)
 
 
 def generate_file(pcb_file_dir, pcb_file_name, pcbdata, config):
     def get_file_content(file_name):
-        path = os.path.join(os.path.dirname(__file__), "..", "web", file_name)
+        path = get_web_file_path(file_name)
         if not os.path.exists(path):
             return ""
         with io.open(path, 'r', encoding='utf-8') as f:
             return f.read()
 
-    if os.path.isabs(config.bom_dest_dir):
-        bom_file_dir = config.bom_dest_dir
-    else:
-        bom_file_dir = os.path.join(pcb_file_dir, config.bom_dest_dir)
-    bom_file_name = process_substitutions(
-        config.bom_name_format, pcb_file_name, pcbdata['metadata'])
-    bom_file_name = os.path.join(bom_file_dir, bom_file_name)
+    bom_file_name = get_bom_file_name(
+        config, pcb_file_dir, pcb_file_name, pcbdata['metadata'])
     bom_file_dir = os.path.dirname(bom_file_name)
     if not os.path.isdir(bom_file_dir):
         os.makedirs(bom_file_dir)
-    pcbdata_js = get_pcbdata_javascript(pcbdata, config.compression)
+    codec = config.compression_codec if config.compression else 'none'
+    encoder = PcbdataEncoder(config.float_precision,
+                             config.section_float_precision)
+    pcbdata_js = get_pcbdata_javascript(pcbdata, codec, encoder)
     log.info("Dumping pcb data")
     config_js = "var config = " + config.get_html_config()
-    html = get_file_content("ibom.html")
-    html = html.replace('///CSS///', get_file_content('ibom.css'))
-    html = html.replace('///USERCSS///', get_file_content('user.css'))
-    html = html.replace('///SPLITJS///', get_file_content('split.js'))
-    html = html.replace('///LZ-STRING///',
-                        get_file_content('lz-string.js')
-                        if config.compression else '')
-    html = html.replace('///POINTER_EVENTS_POLYFILL///',
-                        get_file_content('pep.js'))
-    html = html.replace('///CONFIG///', config_js)
-    html = html.replace('///UTILJS///', get_file_content('util.js'))
-    html = html.replace('///RENDERJS///', get_file_content('render.js'))
-    html = html.replace('///TABLEUTILJS///', get_file_content('table-util.js'))
-    html = html.replace('///IBOMJS///', get_file_content('ibom.js'))
-    html = html.replace('///USERJS///', get_file_content('user.js'))
-    html = html.replace('///USERHEADER///',
-                        get_file_content('userheader.html'))
-    html = html.replace('///USERFOOTER///',
-                        get_file_content('userfooter.html'))
-    # Replace pcbdata last for better performance.
-    html = html.replace('///PCBDATA///', pcbdata_js)
+    template = HtmlTemplate.load(get_web_file_path("ibom.html"))
+    substitutions = {
+        'CSS': get_file_content('ibom.css'),
+        'USERCSS': get_file_content('user.css'),
+        'SPLITJS': get_file_content('split.js'),
+        'DECOMPRESSOR': (get_file_content(DECOMPRESSOR_JS[codec])
+                         if codec in DECOMPRESSOR_JS else ''),
+        'POINTER_EVENTS_POLYFILL': get_file_content('pep.js'),
+        'CONFIG': config_js,
+        'PCBDATA': pcbdata_js,
+        'UTILJS': get_file_content('util.js'),
+        'RENDERJS': get_file_content('render.js'),
+        'TABLEUTILJS': get_file_content('table-util.js'),
+        'IBOMJS': get_file_content('ibom.js'),
+        'USERJS': get_file_content('user.js'),
+        'USERHEADER': get_file_content('userheader.html'),
+        'USERFOOTER': get_file_content('userfooter.html'),
+    }
 
     with io.open(bom_file_name, 'wt', encoding='utf-8') as bom:
-        bom.write(html)
+        template.write(bom, substitutions)
 
     log.info("Created file %s", bom_file_name)
     return bom_file_name
@@ -330,6 +445,19 @@ def main(parser, config, logger):
 
     pcbdata["bom"] = generate_bom(components, config)
     pcbdata["ibom_version"] = config.version
+    if config.zone_simplify_tolerance > 0:
+        removed, total = simplify_zones(pcbdata,
+                                        config.zone_simplify_tolerance)
+        logger.info("Zone simplification removed %d of %d vertices",
+                    removed, total)
+    if config.merge_tracks:
+        merge_track_polylines(pcbdata)
+    if config.indexed_nets:
+        index_nets(pcbdata)
+    if config.footprint_templates:
+        FootprintTemplates().apply(pcbdata)
+    if config.packed_geometry:
+        GeometryPacker().pack(pcbdata)
 
     # build BOM
     bom_file = generate_file(pcb_file_dir, pcb_file_name, pcbdata, config)
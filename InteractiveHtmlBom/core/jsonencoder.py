@@ -0,0 +1,122 @@
+"""Single pass json encoder for pcbdata that rounds floats on the fly."""
+
+import json
+from json.encoder import encode_basestring_ascii
+
+_SPECIAL_FLOATS = {
+    'nan': 'NaN',
+    'inf': 'Infinity',
+    '-inf': '-Infinity',
+}
+
+
+class PcbdataEncoder(object):
+    """
+    Serializes pcbdata to json text identical to
+    json.dumps(<pcbdata with floats rounded>) without making a rounded copy
+    of the whole tree first. Output is produced in chunks so it can be
+    written to a stream as it is generated.
+    """
+    # Number of buffered string parts before a chunk is emitted.
+    BUFFER_PARTS = 4096
+
+    def __init__(self, precision=6, section_precision=None):
+        """
+        :param precision: number of decimals floats are rounded to.
+        :param section_precision: optional dict of top level pcbdata key to
+                                  precision overriding the default for that
+                                  section, e.g. {'zones': 4}.
+        """
+        self.precision = precision
+        self.section_precision = section_precision or {}
+
+    def encode(self, o):
+        # type: (object) -> str
+        chunks = []
+        self.dump(o, chunks.append)
+        return ''.join(chunks)
+
+    def dump(self, o, write):
+        """
+        Serializes o calling write() with consecutive chunks of json text.
+        """
+        buf = []
+        append = buf.append
+        buffer_parts = self.BUFFER_PARTS
+
+        def flush():
+            write(''.join(buf))
+            del buf[:]
+
+        def float_str(f, precision):
+            s = repr(round(f, precision))
+            return _SPECIAL_FLOATS.get(s, s)
+
+        def key_str(k):
+            if isinstance(k, str):
+                return encode_basestring_ascii(k)
+            # json converts numbers, bools and None keys to strings
+            return '"%s"' % json.dumps(k)
+
+        def enc(o, precision, sections=None):
+            # bool is a subclass of int, so it is tested first
+            if o is True:
+                append('true')
+            elif o is False:
+                append('false')
+            elif isinstance(o, int):
+                append(int.__repr__(o))
+            elif isinstance(o, float):
+                # subclasses like numpy.float64 have their own repr
+                append(float_str(float(o), precision))
+            elif isinstance(o, str):
+                append(encode_basestring_ascii(o))
+            elif isinstance(o, (list, tuple)):
+                if not o:
+                    append('[]')
+                    return
+                if all(type(x) is float for x in o):
+                    # Fast path for coordinates. Non finite values contain
+                    # 'n' when formatted (nan, inf).
+                    s = ', '.join([repr(round(x, precision)) for x in o])
+                    if 'n' in s:
+                        s = ', '.join([float_str(x, precision) for x in o])
+                    append('[' + s + ']')
+                    return
+                append('[')
+                first = True
+                for v in o:
+                    if first:
+                        first = False
+                    else:
+                        append(', ')
+                    enc(v, precision)
+                    if len(buf) > buffer_parts:
+                        flush()
+                append(']')
+            elif isinstance(o, dict):
+                if not o:
+                    append('{}')
+                    return
+                append('{')
+                first = True
+                for k, v in o.items():
+                    if first:
+                        first = False
+                    else:
+                        append(', ')
+                    append(key_str(k))
+                    append(': ')
+                    if sections:
+                        enc(v, sections.get(k, precision))
+                    else:
+                        enc(v, precision)
+                    if len(buf) > buffer_parts:
+                        flush()
+                append('}')
+            else:
+                # None and types json handles itself
+                append(json.dumps(o))
+
+        enc(o, self.precision, self.section_precision)
+        flush()
@@ -0,0 +1,147 @@
+"""
+Faster LZString compressor.
+
+Produces exactly the same output as LZString.compress() and
+LZString.compress_to_base64() from lzstring.py (and therefore stays
+compatible with the decompressor in web/lz-string.js) but does not build
+the bit stream one bit at a time:
+ * every code is bit reversed with a lookup table and appended to a small
+   integer accumulator in one step,
+ * finished 16 bit words are collected in a list,
+ * base64 conversion is done by the base64 module on the raw bytes.
+"""
+import base64
+import sys
+from array import array
+
+_REVERSED16 = None
+
+
+def _reversed16():
+    """Table of bit reversed 16 bit values, built on first use."""
+    global _REVERSED16
+    if _REVERSED16 is None:
+        rev8 = [int('{:08b}'.format(i)[::-1], 2) for i in range(256)]
+        _REVERSED16 = [(rev8[i & 0xff] << 8) | rev8[i >> 8]
+                       for i in range(1 << 16)]
+    return _REVERSED16
+
+
+def _compress_words(uncompressed):
+    # type: (str) -> list
+    """LZString compression, returns list of 16 bit output words."""
+    rev16 = _reversed16()
+    out = []
+    # Output bit accumulator. Holds less than 16 bits between emits.
+    acc = 0
+    acc_bits = 0
+
+    dictionary = {}
+    # Single char phrases that were not written to the output yet.
+    chars_to_create = set()
+    enlarge_in = 2
+    dict_size = 3
+    num_bits = 2
+
+    def emit_code(acc, value, num_bits):
+        # Codes are written least significant bit first.
+        if num_bits <= 16:
+            return (acc << num_bits) | (rev16[value] >> (16 - num_bits))
+        return (acc << num_bits) | (((rev16[value & 0xffff] << 16) |
+                                     rev16[value >> 16]) >> (32 - num_bits))
+
+    def emit_literal(acc, c, num_bits):
+        # Returns accumulator and its bit count increment.
+        if c < 256:
+            # marker 0 followed by 8 bit char
+            return (acc << num_bits << 8) | (rev16[c] >> 8), num_bits + 8
+        # marker 1 followed by 16 bit char
+        acc = (acc << num_bits) | (1 << (num_bits - 1))
+        return (acc << 16) | rev16[c & 0xffff], num_bits + 16
+
+    def flush(acc, acc_bits):
+        while acc_bits >= 16:
+            acc_bits -= 16
+            out.append(acc >> acc_bits)
+            acc &= (1 << acc_bits) - 1
+        return acc, acc_bits
+
+    if not uncompressed:
+        w = ''
+    else:
+        # First char is always new, handling it here lets the main loop
+        # skip the new char check for phrases found in the dictionary.
+        w = uncompressed[0]
+        dictionary[w] = dict_size
+        dict_size += 1
+        chars_to_create.add(w)
+
+    for c in uncompressed[1:]:
+        wc = w + c
+        if wc in dictionary:
+            w = wc
+            continue
+        if c not in dictionary:
+            dictionary[c] = dict_size
+            dict_size += 1
+            chars_to_create.add(c)
+        if w in chars_to_create:
+            acc, bits = emit_literal(acc, ord(w), num_bits)
+            acc_bits += bits
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+            chars_to_create.discard(w)
+        else:
+            acc = emit_code(acc, dictionary[w], num_bits)
+            acc_bits += num_bits
+        if acc_bits >= 16:
+            acc, acc_bits = flush(acc, acc_bits)
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+        dictionary[wc] = dict_size
+        dict_size += 1
+        w = c
+
+    if w != '':
+        if w in chars_to_create:
+            acc, bits = emit_literal(acc, ord(w), num_bits)
+            acc_bits += bits
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+        else:
+            acc = emit_code(acc, dictionary[w], num_bits)
+            acc_bits += num_bits
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            num_bits += 1
+
+    # End of stream marker 2, i.e. bits 0, 1 followed by zeros
+    acc = (acc << num_bits) | (1 << (num_bits - 2))
+    acc, acc_bits = flush(acc, acc_bits + num_bits)
+    # Last word is always written even if it is empty
+    out.append(acc << (16 - acc_bits))
+
+    return out
+
+
+def compress(uncompressed):
+    # type: (str) -> str
+    if uncompressed is None:
+        return ''
+    return ''.join(map(chr, _compress_words(uncompressed)))
+
+
+def compress_to_base64(string):
+    # type: (str) -> str
+    if string is None:
+        return ''
+    words = array('H', _compress_words(string))
+    if sys.byteorder == 'little':
+        words.byteswap()
+    return base64.b64encode(words.tobytes()).decode('ascii')
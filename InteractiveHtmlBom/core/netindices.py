@@ -0,0 +1,34 @@
+"""
+Replaces net names of tracks, zones and pads with indices into
+pcbdata["nets"]. See "indexed nets" in DATAFORMAT.md.
+"""
+
+
+def index_nets(pcbdata):
+    # type: (dict) -> dict
+    """Modifies pcbdata in place and returns it. No-op without net list."""
+    nets = pcbdata.get('nets')
+    if nets is None:
+        return pcbdata
+    indices = {net: i for i, net in enumerate(nets)}
+
+    def replace_net(item):
+        net = item.get('net')
+        if net is None:
+            return
+        if net not in indices:
+            # Geometry may refer to nets that the netlist omits
+            indices[net] = len(nets)
+            nets.append(net)
+        item['net'] = indices[net]
+
+    for layer_items in (list(pcbdata.get('tracks', {}).values()) +
+                        list(pcbdata.get('zones', {}).values())):
+        for item in layer_items:
+            replace_net(item)
+    for footprint in pcbdata['footprints']:
+        for pad in footprint['pads']:
+            replace_net(pad)
+
+    pcbdata['indexed_nets'] = 1
+    return pcbdata
@@ -0,0 +1,98 @@
+"""
+Chains connected track segments into polylines.
+
+Segments on the same layer with the same net and width that share end
+points are replaced with a single {"points": [...]} track. See tracks in
+DATAFORMAT.md.
+"""
+from collections import defaultdict
+
+# Decimals of end point coordinates that have to match for segments to be
+# considered connected.
+POINT_PRECISION = 6
+
+_SEGMENT_KEYS = {'start', 'end', 'width', 'net'}
+
+
+def _point_key(p):
+    return round(p[0], POINT_PRECISION), round(p[1], POINT_PRECISION)
+
+
+def _chain_segments(segments):
+    # type: (list[dict]) -> list[list]
+    """
+    Covers segments with as few connected paths as the greedy walk finds.
+    Returns list of paths, each a list of points.
+    """
+    adjacent = defaultdict(list)
+    for i, s in enumerate(segments):
+        adjacent[_point_key(s['start'])].append(i)
+        adjacent[_point_key(s['end'])].append(i)
+    used = [False] * len(segments)
+
+    def walk(point):
+        path = [point]
+        key = _point_key(point)
+        while True:
+            edges = adjacent[key]
+            while edges and used[edges[-1]]:
+                edges.pop()
+            if not edges:
+                return path
+            i = edges.pop()
+            used[i] = True
+            s = segments[i]
+            if _point_key(s['start']) == key:
+                point = s['end']
+            else:
+                point = s['start']
+            key = _point_key(point)
+            path.append(point)
+
+    paths = []
+    # Start at dead ends and junctions first so that paths don't begin in
+    # the middle of a chain, then pick up closed loops.
+    starts = [s[end] for s in segments for end in ('start', 'end')
+              if len(adjacent[_point_key(s[end])]) != 2]
+    starts += [s['start'] for s in segments]
+    for point in starts:
+        while True:
+            path = walk(point)
+            if len(path) < 2:
+                break
+            paths.append(path)
+    return paths
+
+
+def merge_tracks(tracks):
+    # type: (list[dict]) -> list[dict]
+    """Returns layer track list with connected segments merged."""
+    result = []
+    groups = defaultdict(list)
+    for track in tracks:
+        if (set(track) <= _SEGMENT_KEYS and
+                _point_key(track['start']) != _point_key(track['end'])):
+            groups[(track.get('net'), track['width'])].append(track)
+        else:
+            # arcs, vias and anything with extra attributes
+            result.append(track)
+
+    for (net, width), segments in groups.items():
+        for path in _chain_segments(segments):
+            if len(path) == 2:
+                track = {'start': path[0], 'end': path[1], 'width': width}
+            else:
+                track = {'points': path, 'width': width}
+            if net is not None:
+                track['net'] = net
+            result.append(track)
+    return result
+
+
+def merge_track_polylines(pcbdata):
+    # type: (dict) -> dict
+    """Modifies pcbdata tracks in place and returns pcbdata."""
+    if 'tracks' in pcbdata:
+        pcbdata['tracks'] = {layer: merge_tracks(tracks)
+                             for layer, tracks in pcbdata['tracks'].items()}
+    return pcbdata
@@ -0,0 +1,153 @@
+"""Douglas-Peucker simplification of zone outlines."""
+
+
+def _simplify_chain(points, first, last, tolerance_sq, keep):
+    """Marks points between first and last that have to be kept."""
+    stack = [(first, last)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx = bx - ax
+        dy = by - ay
+        length_sq = dx * dx + dy * dy
+        max_dist_sq = tolerance_sq
+        index = None
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length_sq == 0:
+                dist_sq = (px - ax) ** 2 + (py - ay) ** 2
+            else:
+                # squared distance to the line through a and b
+                cross = dx * (py - ay) - dy * (px - ax)
+                dist_sq = cross * cross / length_sq
+            if dist_sq > max_dist_sq:
+                max_dist_sq = dist_sq
+                index = i
+        if index is not None:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+
+def _area2(ring):
+    return sum(ring[i - 1][0] * ring[i][1] - ring[i][0] * ring[i - 1][1]
+               for i in range(len(ring)))
+
+
+def simplify_ring(ring, tolerance):
+    # type: (list, float) -> list
+    """
+    Returns simplified closed outline. Ring is returned unchanged if
+    simplification would collapse it or flip its orientation.
+    """
+    if len(ring) <= 4:
+        return ring
+    # Split the ring at the point farthest from the first one so that
+    # both halves are open chains with distinct end points.
+    x0, y0 = ring[0]
+    far = max(range(len(ring)),
+              key=lambda i: (ring[i][0] - x0) ** 2 + (ring[i][1] - y0) ** 2)
+    points = list(ring) + [ring[0]]
+    keep = [False] * len(points)
+    keep[0] = keep[far] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    _simplify_chain(points, 0, far, tolerance_sq, keep)
+    _simplify_chain(points, far, len(points) - 1, tolerance_sq, keep)
+    result = [p for p, k in zip(ring, keep) if k]
+    if len(result) < 3:
+        return ring
+    area = _area2(ring)
+    simplified_area = _area2(result)
+    if area * simplified_area <= 0:
+        return ring
+    return result
+
+
+def _side(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _segments_cross(a, b, c, d):
+    """True if segments ab and cd cross, touching does not count."""
+    d1 = _side(c, d, a)
+    d2 = _side(c, d, b)
+    if not (d1 > 0 > d2 or d1 < 0 < d2):
+        return False
+    d3 = _side(a, b, c)
+    d4 = _side(a, b, d)
+    return d3 > 0 > d4 or d3 < 0 < d4
+
+
+def _crossing_rings(rings, check):
+    # type: (list, set) -> set
+    """
+    Returns indices of rings that have a segment crossing another segment
+    of the same or another ring. Only crossings involving a ring from check
+    are looked for. Segments are bucketed in a uniform grid so that only
+    nearby segments are compared.
+    """
+    segments = []
+    for index, ring in enumerate(rings):
+        for i in range(len(ring)):
+            segments.append((index, ring[i - 1], ring[i]))
+    xs = [p[0] for ring in rings for p in ring]
+    ys = [p[1] for ring in rings for p in ring]
+    min_x = min(xs)
+    min_y = min(ys)
+    cell = max(max(xs) - min_x, max(ys) - min_y) / len(segments) ** 0.5
+    if cell <= 0:
+        return set()
+    grid = {}
+    for segment in segments:
+        _, a, b = segment
+        x0, x1 = sorted((int((a[0] - min_x) / cell),
+                         int((b[0] - min_x) / cell)))
+        y0, y1 = sorted((int((a[1] - min_y) / cell),
+                         int((b[1] - min_y) / cell)))
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                grid.setdefault((x, y), []).append(segment)
+    result = set()
+    for bucket in grid.values():
+        for i, (ring1, a, b) in enumerate(bucket):
+            for ring2, c, d in bucket[i + 1:]:
+                if ring1 not in check and ring2 not in check:
+                    continue
+                if _segments_cross(a, b, c, d):
+                    result.add(ring1)
+                    result.add(ring2)
+    return result
+
+
+def simplify_zones(pcbdata, tolerance):
+    # type: (dict, float) -> tuple[int, int]
+    """
+    Simplifies zone polygons in place. Every outline is simplified on its
+    own and is never removed. Simplified outlines that would cross
+    themselves or other outlines of the zone are reverted, so zones keep
+    the topology of their outlines and holes.
+
+    :return: tuple of (removed vertices, total vertices)
+    """
+    removed = total = 0
+    for zones in pcbdata.get('zones', {}).values():
+        for zone in zones:
+            if 'svgpath' in zone or 'polygons' not in zone:
+                continue
+            rings = zone['polygons']
+            polygons = [simplify_ring(ring, tolerance) for ring in rings]
+            changed = set(i for i, ring in enumerate(rings)
+                          if polygons[i] is not ring)
+            while changed:
+                crossing = _crossing_rings(polygons, changed) & changed
+                if not crossing:
+                    break
+                for i in crossing:
+                    polygons[i] = rings[i]
+                changed -= crossing
+            for ring, simplified in zip(rings, polygons):
+                total += len(ring)
+                removed += len(ring) - len(simplified)
+            zone['polygons'] = polygons
+    return removed, total
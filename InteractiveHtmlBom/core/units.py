@@ -14,6 +14,7 @@ in different formats e.g.
 
 import re
 import locale
+from functools import lru_cache
 
 current_locale = locale.setlocale(locale.LC_NUMERIC)
 try:
@@ -43,6 +44,27 @@ UNIT_L = ["henry", "h"]
 
 UNIT_ALL = UNIT_R + UNIT_C + UNIT_L
 
+PREFIX_VALUES = {
+    prefix: value
+    for prefixes, value in ((PREFIX_PICO, 1.0e-12),
+                            (PREFIX_NANO, 1.0e-9),
+                            (PREFIX_MICRO, 1.0e-6),
+                            (PREFIX_MILLI, 1.0e-3),
+                            (PREFIX_KILO, 1.0e3),
+                            (PREFIX_MEGA, 1.0e6),
+                            (PREFIX_GIGA, 1.0e9))
+    for prefix in prefixes
+}
+
+UNIT_NAMES = {
+    unit: name
+    for units, name in ((UNIT_R, "R"), (UNIT_C, "F"), (UNIT_L, "H"))
+    for unit in units
+}
+
+# Units implied by reference designator prefix
+REFERENCE_UNITS = {"r": "R", "rv": "R", "c": "F", "l": "H"}
+
 VALUE_REGEX = re.compile(
     "^([0-9\\.]+)(" + "|".join(PREFIX_ALL) + ")*(" + "|".join(
         UNIT_ALL) + ")*(\\d*)$")
@@ -57,16 +79,7 @@ def getUnit(unit):
     if not unit:
         return None
 
-    unit = unit.lower()
-
-    if unit in UNIT_R:
-        return "R"
-    if unit in UNIT_C:
-        return "F"
-    if unit in UNIT_L:
-        return "H"
-
-    return None
+    return UNIT_NAMES.get(unit.lower())
 
 
 def getPrefix(prefix):
@@ -76,26 +89,11 @@ def getPrefix(prefix):
     if not prefix:
         return 1
 
-    prefix = prefix.lower()
-
-    if prefix in PREFIX_PICO:
-        return 1.0e-12
-    if prefix in PREFIX_NANO:
-        return 1.0e-9
-    if prefix in PREFIX_MICRO:
-        return 1.0e-6
-    if prefix in PREFIX_MILLI:
-        return 1.0e-3
-    if prefix in PREFIX_KILO:
-        return 1.0e3
-    if prefix in PREFIX_MEGA:
-        return 1.0e6
-    if prefix in PREFIX_GIGA:
-        return 1.0e9
-
-    return 1
+    return PREFIX_VALUES.get(prefix.lower(), 1)
 
 
+# Boards repeat a small set of values across many components
+@lru_cache(maxsize=4096)
 def compMatch(component):
     """
     Return a normalized value and units for a given component value string
@@ -158,14 +156,7 @@ def componentValue(valString, reference):
         match = REFERENCE_REGEX.match(reference.lower())
         if match and len(match.groups()) == 2:
             prefix, _ = match.groups()
-            unit = None
-            if prefix in ['r', 'rv']:
-                unit = 'R'
-            if prefix == 'c':
-                unit = 'F'
-            if prefix == 'l':
-                unit = 'H'
-            result = (result[0], unit)
+            result = (result[0], REFERENCE_UNITS.get(prefix))
 
     return result  # (val,unit)
 
@@ -11,10 +11,11 @@ def get_parser_by_extension(file_name, config, logger):
         import json
         with io.open(file_name, 'r', encoding='utf-8') as f:
             obj = json.load(f)
+        # loaded document is handed to the parser so it is not loaded again
         if 'pcbdata' in obj:
-            return get_generic_json_parser(file_name, config, logger)
+            return get_generic_json_parser(file_name, config, logger, obj)
         else:
-            return get_easyeda_parser(file_name, config, logger)
+            return get_easyeda_parser(file_name, config, logger, obj)
     elif ext in ['.fbrd', '.brd']:
         return get_fusion_eagle_parser(file_name, config, logger)
     else:
@@ -22,18 +23,31 @@ def get_parser_by_extension(file_name, config, logger):
 
 
 def get_kicad_parser(file_name, config, logger, board=None):
-    from .kicad import PcbnewParser
+    if board is None and 'INTERACTIVE_HTML_BOM_NO_PCBNEW' in os.environ:
+        return get_kicad_sexpr_parser(file_name, config, logger)
+    try:
+        from .kicad import PcbnewParser
+    except ImportError:
+        if board is not None:
+            raise
+        # pcbnew is not available outside of KiCad's python
+        return get_kicad_sexpr_parser(file_name, config, logger)
     return PcbnewParser(file_name, config, logger, board)
 
 
-def get_easyeda_parser(file_name, config, logger):
+def get_kicad_sexpr_parser(file_name, config, logger):
+    from .kicad_sexpr import KicadSexprParser
+    return KicadSexprParser(file_name, config, logger)
+
+
+def get_easyeda_parser(file_name, config, logger, pcb=None):
     from .easyeda import EasyEdaParser
-    return EasyEdaParser(file_name, config, logger)
+    return EasyEdaParser(file_name, config, logger, pcb)
 
 
-def get_generic_json_parser(file_name, config, logger):
+def get_generic_json_parser(file_name, config, logger, pcb=None):
     from .genericjson import GenericJsonParser
-    return GenericJsonParser(file_name, config, logger)
+    return GenericJsonParser(file_name, config, logger, pcb)
 
 
 def get_fusion_eagle_parser(file_name, config, logger):
@@ -1,6 +1,8 @@
 import math
 
-from .svgpath import parse_path
+from .svgpath import path_bbox
+
+_numpy = None
 
 
 class ExtraFieldData(object):
@@ -110,8 +112,8 @@ class EcadParser(object):
                 add_svgpath()
                 return
             polygon = drawing['polygons'][0]
-            for point in polygon:
-                bbox.add_point(point[0], point[1])
+            bbox.add_points([point[0] for point in polygon],
+                            [point[1] for point in polygon])
 
         def add_arc():
             if 'svgpath' in drawing:
@@ -132,12 +134,23 @@ class EcadParser(object):
                           (x1, y1, r, r, la, x2, y2)
                 bbox.add_svgpath(svgpath, width, self.logger)
 
+        def add_curve():
+            # bezier curve is contained in the hull of its control points
+            points = [drawing['start'], drawing['cpa'], drawing['cpb'],
+                      drawing['end']]
+            w = drawing.get('width', 0) / 2
+            bbox.add_points([p[0] - w for p in points] +
+                            [p[0] + w for p in points],
+                            [p[1] - w for p in points] +
+                            [p[1] + w for p in points])
+
         {
             'segment': add_segment,
             'rect': add_segment,  # bbox of a rect and segment are the same
             'circle': add_circle,
             'arc': add_arc,
             'polygon': add_polygon,
+            'curve': add_curve,
             'text': lambda: None,  # text is not really needed for bounding box
         }.get(drawing['type'])()
 
@@ -154,9 +167,25 @@ class Component(object):
         self.extra_fields = extra_fields
 
 
+def get_numpy():
+    """Get the numpy module, or None if not available."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
 class BoundingBox(object):
     """Geometry util to calculate and combine bounding box of simple shapes."""
 
+    # add_points() uses numpy for point sets at least this large, converting
+    # smaller ones to arrays costs more than it saves
+    NUMPY_MIN_POINTS = 256
+
     def __init__(self):
         self._x0 = None
         self._y0 = None
@@ -186,8 +215,7 @@ class BoundingBox(object):
         :type other: BoundingBox
         """
         if other._x0 is not None:
-            self.add_point(other._x0, other._y0)
-            self.add_point(other._x1, other._y1)
+            self._add_extents(other._x0, other._y0, other._x1, other._y1)
         return self
 
     @staticmethod
@@ -198,18 +226,52 @@ class BoundingBox(object):
         new_y = ry + (x - rx) * sin + (y - ry) * cos
         return new_x, new_y
 
-    def add_point(self, x, y, rx=0, ry=0, angle=0):
-        x, y = self._rotate(x, y, rx, ry, angle)
+    def _add_extents(self, x0, y0, x1, y1):
         if self._x0 is None:
-            self._x0 = x
-            self._y0 = y
-            self._x1 = x
-            self._y1 = y
+            self._x0 = x0
+            self._y0 = y0
+            self._x1 = x1
+            self._y1 = y1
+        else:
+            self._x0 = min(self._x0, x0)
+            self._y0 = min(self._y0, y0)
+            self._x1 = max(self._x1, x1)
+            self._y1 = max(self._y1, y1)
+
+    def add_point(self, x, y, rx=0, ry=0, angle=0):
+        if angle:
+            x, y = self._rotate(x, y, rx, ry, angle)
+        self._add_extents(x, y, x, y)
+        return self
+
+    def add_points(self, xs, ys, rx=0, ry=0, angle=0):
+        """Add points given as sequences of x and y coordinates, rotated by
+        angle around (rx, ry)."""
+        if len(xs) == 0:
+            return self
+        numpy = None
+        if len(xs) >= self.NUMPY_MIN_POINTS:
+            numpy = get_numpy()
+        if numpy is not None:
+            xs = numpy.asarray(xs, dtype=float)
+            ys = numpy.asarray(ys, dtype=float)
+        if angle:
+            sin = math.sin(math.radians(angle))
+            cos = math.cos(math.radians(angle))
+            if numpy is not None:
+                xs, ys = (rx + (xs - rx) * cos - (ys - ry) * sin,
+                          ry + (xs - rx) * sin + (ys - ry) * cos)
+            else:
+                xs, ys = (
+                    [rx + (x - rx) * cos - (y - ry) * sin
+                     for x, y in zip(xs, ys)],
+                    [ry + (x - rx) * sin + (y - ry) * cos
+                     for x, y in zip(xs, ys)])
+        if numpy is not None:
+            self._add_extents(float(xs.min()), float(ys.min()),
+                              float(xs.max()), float(ys.max()))
         else:
-            self._x0 = min(self._x0, x)
-            self._y0 = min(self._y0, y)
-            self._x1 = max(self._x1, x)
-            self._y1 = max(self._y1, y)
+            self._add_extents(min(xs), min(ys), max(xs), max(ys))
         return self
 
     def add_segment(self, x0, y0, x1, y1, r):
@@ -218,25 +280,24 @@ class BoundingBox(object):
         return self
 
     def add_rectangle(self, x, y, w, h, angle=0):
-        self.add_point(x - w / 2, y - h / 2, x, y, angle)
-        self.add_point(x + w / 2, y - h / 2, x, y, angle)
-        self.add_point(x - w / 2, y + h / 2, x, y, angle)
-        self.add_point(x + w / 2, y + h / 2, x, y, angle)
+        self.add_points(
+            [x - w / 2, x + w / 2, x - w / 2, x + w / 2],
+            [y - h / 2, y - h / 2, y + h / 2, y + h / 2],
+            x, y, angle)
         return self
 
     def add_circle(self, x, y, r):
-        self.add_point(x - r, y)
-        self.add_point(x, y - r)
-        self.add_point(x + r, y)
-        self.add_point(x, y + r)
+        r = abs(r)
+        self._add_extents(x - r, y - r, x + r, y + r)
         return self
 
     def add_svgpath(self, svgpath, width, logger):
+        bbox = path_bbox(svgpath, logger)
+        if bbox is None:
+            return
+        x0, x1, y0, y1 = bbox
         w = width / 2
-        for segment in parse_path(svgpath, logger):
-            x0, x1, y0, y1 = segment.bbox()
-            self.add_point(x0 - w, y0 - w)
-            self.add_point(x1 + w, y1 + w)
+        self._add_extents(x0 - w, y0 - w, x1 + w, y1 + w)
 
     def pad(self, amount):
         """Add small padding to the box."""
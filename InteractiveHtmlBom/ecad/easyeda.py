@@ -21,6 +21,13 @@ class EasyEdaParser(EcadParser):
     BOT_ASSEMBLY_LAYER = 14
     ALL_LAYERS = 11
 
+    def __init__(self, file_name, config, logger, pcb=None):
+        """
+        :param pcb: json document of file_name if it was already loaded.
+        """
+        super(EasyEdaParser, self).__init__(file_name, config, logger)
+        self.pcb = pcb
+
     def extra_data_file_filter(self):
         return "Json file ({f})|{f}".format(f=os.path.basename(self.file_name))
 
@@ -49,6 +56,10 @@ class EasyEdaParser(EcadParser):
         return ExtraFieldData(list(field_set), comp_dict, by_index)
 
     def get_easyeda_pcb(self):
+        if self.pcb is not None:
+            # preloaded document is used once and not kept in memory
+            pcb, self.pcb = self.pcb, None
+            return pcb
         import json
         with io.open(self.file_name, 'r', encoding='utf-8') as f:
             return json.load(f)
@@ -304,8 +315,8 @@ class EasyEdaParser(EcadParser):
             x = pad['pos'][0]
             y = pad['pos'][1]
             polygon = pad['polygons'][0]
-            for point in polygon:
-                bbox.add_point(x + point[0], y + point[1])
+            bbox.add_points([x + point[0] for point in polygon],
+                            [y + point[1] for point in polygon])
 
         {
             'circle': add_circle,
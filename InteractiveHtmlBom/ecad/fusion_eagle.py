@@ -1,7 +1,11 @@
+import contextlib
+import html
 import io
 import math
 import os
+import re
 import string
+import time
 import zipfile
 from datetime import datetime
 from xml.etree import ElementTree
@@ -10,6 +14,8 @@ from .common import EcadParser, Component, BoundingBox
 from .svgpath import Arc
 from ..core.fontparser import FontParser
 
+WHITESPACE_TO_SPACE = {ord(c): ' ' for c in '\t\n\r'}
+
 
 class FusionEagleParser(EcadParser):
     TOP_COPPER_LAYER = '1'
@@ -21,6 +27,14 @@ class FusionEagleParser(EcadParser):
     DIMENSION_LAYER = '20'
     TOP_DOCU_LAYER = '51'
     BOT_DOCU_LAYER = '52'
+    COPPER_LAYERS = {TOP_COPPER_LAYER, BOT_COPPER_LAYER}
+    # Layers of package drawings that end up in pcbdata
+    PACKAGE_LAYERS = {TOP_PLACE_LAYER, BOT_PLACE_LAYER, TOP_DOCU_LAYER,
+                      BOT_DOCU_LAYER, DIMENSION_LAYER}
+    ELEMENT_TAG_RE = re.compile(r'<element\s[^>]*>')
+    ATTRIBUTE_RE = re.compile(
+        r'''([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+    SCAN_CHUNK_SIZE = 1 << 20
 
     def __init__(self, file_name, config, logger):
         super(FusionEagleParser, self).__init__(file_name, config, logger)
@@ -43,19 +57,76 @@ class FusionEagleParser(EcadParser):
             'font_data': {}
         }
         self.components = []
+        self.package_geometry = {}
+
+    def _parse_signal(self, signal):
+        """
+        Collects pad nets, net name, tracks and zones of a signal in a single
+        pass over its subtree.
+        """
+        net = signal.attrib['name']
+        if self.config.include_nets:
+            self.pcbdata['nets'].append(net)
+
+        wires, vias, pours = [], [], []
+        for el in signal.iter():
+            if el.tag == 'contactref':
+                pads = self.elements_pad_nets.setdefault(
+                    el.attrib['element'], {})
+                pads[el.attrib['pad']] = net
+            elif el.tag == 'wire':
+                wires.append(el)
+            elif el.tag == 'via':
+                vias.append(el)
+            elif el.tag == 'polygonpour':
+                pours.append(el)
 
-    def _parse_pad_nets(self, signals):
-        elements = {}
+        if self.config.include_tracks:
+            for wire in wires:
+                self._add_track(wire, net)
+            for via in vias:
+                self._add_track(via, net)
+            for poly in pours:
+                self._add_zone(poly, net)
 
-        for signal in signals.iter('signal'):
-            net = signal.attrib['name']
-            for c in signal.iter('contactref'):
-                e = c.attrib['element']
-                if e not in elements:
-                    elements[e] = {}
-                elements[e][c.attrib['pad']] = net
+    @staticmethod
+    def _index_tags(root, tags, skipped=()):
+        """
+        Maps each of tags to all its elements in document order. Subtrees of
+        skipped tags are not searched.
+        """
+        index = {tag: [] for tag in tags}
+        stack = [iter([root])]
+        while stack:
+            for el in stack[-1]:
+                found = index.get(el.tag)
+                if found is not None:
+                    found.append(el)
+                if el.tag not in skipped:
+                    stack.append(iter(el))
+                break
+            else:
+                stack.pop()
+        return index
 
-        self.elements_pad_nets = elements
+    def _log_stage(self, stage, start):
+        now = time.time()
+        self.logger.info("%s took %.3f s", stage, now - start)
+        return now
+
+    @staticmethod
+    def _index_packages(board):
+        """Maps (library name, package name) to all matching packages."""
+        index = {}
+        for lib in board.find('libraries').findall('library'):
+            packages = lib.find('packages')
+            if packages is None:
+                continue
+            lib_name = lib.attrib['name']
+            for pac in packages.findall('package'):
+                key = (lib_name, pac.attrib['name'])
+                index.setdefault(key, []).append(pac)
+        return index
 
     @staticmethod
     def _radian(ux, uy, vx, vy):
@@ -272,8 +343,9 @@ class FusionEagleParser(EcadParser):
                 self.pcbdata['tracks']['F'].append(trk)
                 self.pcbdata['tracks']['B'].append(trk)
 
-    def _calculate_footprint_bbox(self, package, x, y, angle, mirrored):
-        _angle = angle if not mirrored else -angle
+    def _package_extents(self, package):
+        """Returns (xmin, ymin, xmax, ymax) of package in its own coordinates.
+        """
         layers = [
             self.TOP_PLACE_LAYER,
             self.BOT_PLACE_LAYER,
@@ -310,49 +382,24 @@ class FusionEagleParser(EcadParser):
                 xmax, ymax = max(xmax, elx + dx), max(ymax, ely + dy)
                 xmin, ymin = min(xmin, elx - dx), min(ymin, ely - dy)
 
-        if not math.isinf(xmin):
-            if mirrored:
-                xmin, xmax = -xmax, -xmin
-            dx, dy = self._rotate(xmin, ymax, _angle)
-            sx = abs(xmax - xmin)
-            sy = abs(ymax - ymin)
-        else:
-            dx, dy = 0, 0
-            sx, sy = 0, 0
-
-        return {
-            'pos': [x + dx, -y - dy],
-            'angle': _angle,
-            'relpos': [0, 0],
-            'size': [sx, sy]
-        }
+        return xmin, ymin, xmax, ymax
 
-    def _footprint_pads(self, package, x, y, angle, mirrored, refdes):
+    def _package_pads(self, package):
+        """
+        Returns pads of package in its own coordinates. Each pad is a tuple
+        of (tag, name, x, y, layer, rot, fields, list_fields) where fields
+        are the pad properties that do not depend on placement and
+        list_fields are the keys of fields that have to be copied.
+        """
         pads = []
-        element_pad_nets = self.elements_pad_nets.get(refdes)
-        pin1_allocated = False
         for el in package.iter():
             if el.tag == 'pad':
-                elx = float(el.attrib['x'])
-                ely = -float(el.attrib['y'])
                 drill = float(el.attrib['drill'])
-
-                dx, dy = self._rotate(elx, ely, -angle, mirrored)
-
                 diameter = drill + 2 * self.min_via_w \
                     if 'diameter' not in el.attrib \
                     else float(el.attrib['diameter'])
 
-                pr = self.Rot(el.get('rot'))
-                if mirrored ^ pr.mirrored:
-                    pad_angle = -angle - pr.angle
-                else:
-                    pad_angle = angle + pr.angle
-
-                pad = {
-                    'layers': ['F', 'B'],
-                    'pos': [x + dx, -y + dy],
-                    'angle': pad_angle,
+                fields = {
                     'type': 'th',
                     'drillshape': 'circle',
                     'drillsize': [
@@ -361,106 +408,200 @@ class FusionEagleParser(EcadParser):
                     ]
                 }
 
-                if el.get('name') in ['1', 'A', 'A1', 'P1', 'PAD1'] and \
-                        not pin1_allocated:
-                    pad['pin1'] = 1
-                    pin1_allocated = True
-
                 if 'shape' not in el.attrib or el.attrib['shape'] == 'round':
-                    pad['shape'] = 'circle'
-                    pad['size'] = [diameter, diameter]
+                    fields['shape'] = 'circle'
+                    fields['size'] = [diameter, diameter]
                 elif el.attrib['shape'] == 'square':
-                    pad['shape'] = 'rect'
-                    pad['size'] = [diameter, diameter]
+                    fields['shape'] = 'rect'
+                    fields['size'] = [diameter, diameter]
                 elif el.attrib['shape'] == 'octagon':
-                    pad['shape'] = 'chamfrect'
-                    pad['size'] = [diameter, diameter]
-                    pad['radius'] = 0
-                    pad['chamfpos'] = 0b1111  # all corners
-                    pad['chamfratio'] = 0.333
+                    fields['shape'] = 'chamfrect'
+                    fields['size'] = [diameter, diameter]
+                    fields['radius'] = 0
+                    fields['chamfpos'] = 0b1111  # all corners
+                    fields['chamfratio'] = 0.333
                 elif el.attrib['shape'] == 'long':
-                    pad['shape'] = 'roundrect'
-                    pad['radius'] = diameter / 2
-                    pad['size'] = [2 * diameter, diameter]
+                    fields['shape'] = 'roundrect'
+                    fields['radius'] = diameter / 2
+                    fields['size'] = [2 * diameter, diameter]
                 elif el.attrib['shape'] == 'offset':
-                    pad['shape'] = 'roundrect'
-                    pad['radius'] = diameter / 2
-                    pad['size'] = [2 * diameter, diameter]
-                    pad['offset'] = [diameter / 2, 0]
+                    fields['shape'] = 'roundrect'
+                    fields['radius'] = diameter / 2
+                    fields['size'] = [2 * diameter, diameter]
+                    fields['offset'] = [diameter / 2, 0]
                 elif el.attrib['shape'] == 'slot':
-                    pad['shape'] = 'roundrect'
-                    pad['radius'] = diameter / 2
+                    fields['shape'] = 'roundrect'
+                    fields['radius'] = diameter / 2
                     slot_length = float(el.attrib['slotLength'])
-                    pad['size'] = [slot_length + diameter / 2, diameter]
-                    pad['drillshape'] = 'oblong'
-                    pad['drillsize'] = [slot_length, drill]
+                    fields['size'] = [slot_length + diameter / 2, diameter]
+                    fields['drillshape'] = 'oblong'
+                    fields['drillsize'] = [slot_length, drill]
                 else:
                     self.logger.info(
                         "Unsupported footprint pad shape %s, skipping",
                         el.attrib['shape'])
-
-                if self.config.include_nets and element_pad_nets is not None:
-                    net = element_pad_nets.get(el.attrib['name'])
-                    if net is not None:
-                        pad['net'] = net
-
-                pads.append(pad)
+                layer = None
 
             elif el.tag == 'smd':
-                layer = el.attrib['layer']
-                if layer == self.TOP_COPPER_LAYER and not mirrored or \
-                        layer == self.BOT_COPPER_LAYER and mirrored:
-                    layers = ['F']
-                elif layer == self.TOP_COPPER_LAYER and mirrored or \
-                        layer == self.BOT_COPPER_LAYER and not mirrored:
-                    layers = ['B']
+                fields = {
+                    'size': [
+                        float(el.attrib['dx']),
+                        float(el.attrib['dy'])
+                    ],
+                    'type': 'smd',
+                }
+                if 'roundness' not in el.attrib:
+                    fields['shape'] = 'rect'
                 else:
-                    self.logger.error('Unable to determine layer for '
-                                      '{0} pad {1}'.format(refdes,
-                                                           el.attrib['name']))
-                    layers = None
+                    fields['shape'] = 'roundrect'
+                    fields['radius'] = (float(el.attrib['roundness']) / 100) \
+                        * float(el.attrib['dy']) / 2
+                layer = el.attrib['layer']
 
-                if layers is not None:
-                    elx = float(el.attrib['x'])
-                    ely = -float(el.attrib['y'])
+            else:
+                continue
 
-                    dx, dy = self._rotate(elx, ely, -angle, mirrored)
+            list_fields = [k for k, v in fields.items()
+                           if isinstance(v, list)]
+            pads.append((el.tag, el.get('name'), float(el.attrib['x']),
+                         -float(el.attrib['y']), layer,
+                         self.Rot(el.get('rot')), fields, list_fields))
+        return pads
 
-                    pr = self.Rot(el.get('rot'))
-                    if mirrored ^ pr.mirrored:
-                        pad_angle = -angle - pr.angle
-                    else:
-                        pad_angle = angle + pr.angle
-
-                    pad = {'layers': layers,
-                           'pos': [x + dx, -y + dy],
-                           'size': [
-                               float(el.attrib['dx']),
-                               float(el.attrib['dy'])
-                           ],
-                           'angle': pad_angle,
-                           'type': 'smd',
-                           }
-
-                    if el.get('name') in ['1', 'A', 'A1', 'P1', 'PAD1'] and \
-                            not pin1_allocated:
-                        pad['pin1'] = 1
-                        pin1_allocated = True
-
-                    if 'roundness' not in el.attrib:
-                        pad['shape'] = 'rect'
-                    else:
-                        pad['shape'] = 'roundrect'
-                        pad['radius'] = (float(el.attrib['roundness']) / 100) \
-                            * float(el.attrib['dy']) / 2
+    def _package_drawings(self, package):
+        """
+        Returns drawings of package in its own coordinates as tuples of
+        (tag, layer, data). Layer is None for holes. Drawings on layers that
+        are not rendered are left out.
+        """
+        layers = [
+            self.TOP_PLACE_LAYER,
+            self.BOT_PLACE_LAYER,
+            self.TOP_DOCU_LAYER,
+            self.BOT_DOCU_LAYER
+        ]
+        drawings = []
+        for el in package.iter():
+            if el.tag not in ['wire', 'rectangle', 'circle', 'hole',
+                              'polygonshape', 'polygon']:
+                continue
+            layer = None if el.tag == 'hole' else el.attrib['layer']
+            if layer is not None and layer not in layers and not (
+                    el.tag == 'wire' and layer == self.DIMENSION_LAYER):
+                continue
+            if el.tag == 'wire':
+                data = (float(el.attrib['x1']), -float(el.attrib['y1']),
+                        float(el.attrib['x2']), -float(el.attrib['y2']),
+                        float(el.attrib['width']),
+                        el if el.get('curve') else None)
+            elif el.tag == 'rectangle':
+                data = self._rectangle_vertices(el)
+            elif el.tag == 'circle':
+                data = (float(el.attrib['x']), -float(el.attrib['y']),
+                        float(el.attrib['radius']), float(el.attrib['width']))
+            elif el.tag == 'hole':
+                data = (float(el.attrib['x']), -float(el.attrib['y']),
+                        float(el.attrib['drill']) / 2, 0)
+            else:
+                segs = el if el.tag == 'polygon' \
+                    else el.find('polygonoutlinesegments')
+                data = [(float(v.attrib['x']), -float(v.attrib['y']))
+                        for v in segs.iter('vertex')]
+            drawings.append((el.tag, layer, data))
+        return drawings
+
+    def _package_geometry(self, package):
+        """
+        Returns pads, drawings, refdes texts and bounding box extents of
+        package with all attributes already parsed. Geometry only depends on
+        the package, so it is built once and every element placing the
+        package only has to transform it.
+        """
+        geometry = self.package_geometry.get(package)
+        if geometry is None:
+            names = [(float(t.attrib['x']), float(t.attrib['y']), t.get('rot'),
+                      t.get('align'), float(t.attrib['size']),
+                      float(t.get('ratio', '8')) / 100)
+                     for t in package.iter('text') if t.text == '>NAME']
+            geometry = {
+                'extents': self._package_extents(package),
+                'pads': self._package_pads(package),
+                'drawings': self._package_drawings(package),
+                'names': names,
+            }
+            self.package_geometry[package] = geometry
+        return geometry
 
-                    if self.config.include_nets and \
-                            element_pad_nets is not None:
-                        net = element_pad_nets.get(el.attrib['name'])
-                        if net is not None:
-                            pad['net'] = net
+    def _calculate_footprint_bbox(self, geometry, x, y, angle, mirrored):
+        _angle = angle if not mirrored else -angle
+        xmin, ymin, xmax, ymax = geometry['extents']
 
-                    pads.append(pad)
+        if not math.isinf(xmin):
+            if mirrored:
+                xmin, xmax = -xmax, -xmin
+            dx, dy = self._rotate(xmin, ymax, _angle)
+            sx = abs(xmax - xmin)
+            sy = abs(ymax - ymin)
+        else:
+            dx, dy = 0, 0
+            sx, sy = 0, 0
+
+        return {
+            'pos': [x + dx, -y - dy],
+            'angle': _angle,
+            'relpos': [0, 0],
+            'size': [sx, sy]
+        }
+
+    def _footprint_pads(self, geometry, x, y, angle, mirrored, refdes):
+        pads = []
+        element_pad_nets = self.elements_pad_nets.get(refdes)
+        pin1_allocated = False
+        include_nets = self.config.include_nets and \
+            element_pad_nets is not None
+        rotate = self._rotation(-angle, mirrored)
+        for (tag, name, elx, ely, layer, pr, fields,
+             list_fields) in geometry['pads']:
+            if tag == 'pad':
+                layers = ['F', 'B']
+            elif layer == self.TOP_COPPER_LAYER and not mirrored or \
+                    layer == self.BOT_COPPER_LAYER and mirrored:
+                layers = ['F']
+            elif layer == self.TOP_COPPER_LAYER and mirrored or \
+                    layer == self.BOT_COPPER_LAYER and not mirrored:
+                layers = ['B']
+            else:
+                self.logger.error('Unable to determine layer for '
+                                  '{0} pad {1}'.format(refdes, name))
+                continue
+
+            dx, dy = rotate(elx, ely)
+
+            if mirrored ^ pr.mirrored:
+                pad_angle = -angle - pr.angle
+            else:
+                pad_angle = angle + pr.angle
+
+            pad = {
+                'layers': layers,
+                'pos': [x + dx, -y + dy],
+                'angle': pad_angle,
+            }
+            pad.update(fields)
+            for k in list_fields:
+                pad[k] = list(fields[k])
+
+            if name in ['1', 'A', 'A1', 'P1', 'PAD1'] and \
+                    not pin1_allocated:
+                pad['pin1'] = 1
+                pin1_allocated = True
+
+            if include_nets:
+                net = element_pad_nets.get(name)
+                if net is not None:
+                    pad['net'] = net
+
+            pads.append(pad)
         return pads
 
     @staticmethod
@@ -474,125 +615,107 @@ class FusionEagleParser(EcadParser):
         else:
             return xr, yr
 
-    def _process_footprint(self, package, x, y, angle, mirrored, populate):
-        for el in package.iter():
-            if el.tag in ['wire', 'rectangle', 'circle', 'hole',
-                          'polygonshape', 'polygon', 'hole']:
-                if el.tag == 'hole':
-                    dwg_layer = self.pcbdata['edges']
-                elif el.attrib['layer'] in [self.TOP_PLACE_LAYER,
-                                            self.BOT_PLACE_LAYER]:
-                    dwg_layer = self.pcbdata['drawings']['silkscreen']
-                    top = el.attrib['layer'] == self.TOP_PLACE_LAYER
-                elif el.attrib['layer'] in [self.TOP_DOCU_LAYER,
-                                            self.BOT_DOCU_LAYER]:
-                    if not populate:
-                        return
-                    dwg_layer = self.pcbdata['drawings']['fabrication']
-                    top = el.attrib['layer'] == self.TOP_DOCU_LAYER
-                elif el.tag == 'wire' and \
-                        el.attrib['layer'] == self.DIMENSION_LAYER:
-                    dwg_layer = self.pcbdata['edges']
-                    top = True
-                else:
-                    continue
-
-                dwg = None
-
-                if el.tag == 'wire':
-                    _dx1 = float(el.attrib['x1'])
-                    _dx2 = float(el.attrib['x2'])
-                    _dy1 = -float(el.attrib['y1'])
-                    _dy2 = -float(el.attrib['y2'])
-
-                    dx1, dy1 = self._rotate(_dx1, _dy1, -angle, mirrored)
-                    dx2, dy2 = self._rotate(_dx2, _dy2, -angle, mirrored)
-
-                    x1, y1 = x + dx1, -y + dy1
-                    x2, y2 = x + dx2, -y + dy2
-
-                    if el.get('curve'):
-                        dwg = {
-                            'type': 'arc',
-                            'width': float(el.attrib['width']),
-                            'svgpath': self._curve_to_svgpath(el, x, y, angle,
-                                                              mirrored)
-                        }
-                    else:
-                        dwg = {
-                            'type': 'segment',
-                            'start': [x1, y1],
-                            'end': [x2, y2],
-                            'width': float(el.attrib['width'])
-                        }
-
-                elif el.tag == 'rectangle':
-                    _dv = self._rectangle_vertices(el)
-
-                    # Rotate rectangle about component origin based on
-                    # component angle
-                    dv = [self._rotate(_x, _y, -angle, mirrored)
-                          for (_x, _y) in _dv]
-
-                    # Map vertices back to absolute coordinates
-                    v = [(x + _x, -y + _y) for (_x, _y) in dv]
+    @staticmethod
+    def _rotation(angle, mirrored=False):
+        """Returns a function doing the same as _rotate for many points."""
+        sin = math.sin(math.radians(angle))
+        cos = math.cos(math.radians(angle))
+        sign = -1 if mirrored else 1
+
+        def rotate(x, y):
+            return sign * (x * cos - y * sin), y * cos + x * sin
+
+        return rotate
+
+    def _process_footprint(self, geometry, x, y, angle, mirrored, populate):
+        rotate = self._rotation(-angle, mirrored)
+        for tag, layer, data in geometry['drawings']:
+            if tag == 'hole':
+                dwg_layer = self.pcbdata['edges']
+            elif layer in [self.TOP_PLACE_LAYER, self.BOT_PLACE_LAYER]:
+                dwg_layer = self.pcbdata['drawings']['silkscreen']
+                top = layer == self.TOP_PLACE_LAYER
+            elif layer in [self.TOP_DOCU_LAYER, self.BOT_DOCU_LAYER]:
+                if not populate:
+                    return
+                dwg_layer = self.pcbdata['drawings']['fabrication']
+                top = layer == self.TOP_DOCU_LAYER
+            elif tag == 'wire' and layer == self.DIMENSION_LAYER:
+                dwg_layer = self.pcbdata['edges']
+                top = True
+            else:
+                continue
 
+            if tag == 'wire':
+                _dx1, _dy1, _dx2, _dy2, width, curve = data
+                if curve is not None:
                     dwg = {
-                        'type': 'polygon',
-                        'filled': 1,
-                        'pos': [0, 0],
-                        'polygons': [v]
+                        'type': 'arc',
+                        'width': width,
+                        'svgpath': self._curve_to_svgpath(curve, x, y, angle,
+                                                          mirrored)
                     }
-
-                elif el.tag in ['circle', 'hole']:
-                    _x = float(el.attrib['x'])
-                    _y = -float(el.attrib['y'])
-                    dxc, dyc = self._rotate(_x, _y, -angle, mirrored)
-                    xc, yc = x + dxc, -y + dyc
-
-                    if el.tag == 'circle':
-                        radius = float(el.attrib['radius'])
-                        width = float(el.attrib['width'])
-                    else:
-                        radius = float(el.attrib['drill']) / 2
-                        width = 0
-
+                else:
+                    dx1, dy1 = rotate(_dx1, _dy1)
+                    dx2, dy2 = rotate(_dx2, _dy2)
                     dwg = {
-                        'type': 'circle',
-                        'start': [xc, yc],
-                        'radius': radius,
+                        'type': 'segment',
+                        'start': [x + dx1, -y + dy1],
+                        'end': [x + dx2, -y + dy2],
                         'width': width
                     }
 
-                elif el.tag in ['polygonshape', 'polygon']:
-                    segs = el if el.tag == 'polygon' \
-                        else el.find('polygonoutlinesegments')
+            elif tag == 'rectangle':
+                # Rotate rectangle about component origin based on
+                # component angle and map vertices back to absolute
+                # coordinates
+                v = []
+                for (_x, _y) in data:
+                    dx, dy = rotate(_x, _y)
+                    v.append((x + dx, -y + dy))
 
-                    dv = self._segments_to_polygon(segs, angle, mirrored)
+                dwg = {
+                    'type': 'polygon',
+                    'filled': 1,
+                    'pos': [0, 0],
+                    'polygons': [v]
+                }
 
-                    polygon = [[x + v[0], -y + v[1]] for v in dv]
+            elif tag in ['circle', 'hole']:
+                _x, _y, radius, width = data
+                dxc, dyc = rotate(_x, _y)
+                dwg = {
+                    'type': 'circle',
+                    'start': [x + dxc, -y + dyc],
+                    'radius': radius,
+                    'width': width
+                }
 
-                    dwg = {
-                        'type': 'polygon',
-                        'filled': 1,
-                        'pos': [0, 0],
-                        'polygons': [polygon]
-                    }
+            else:
+                polygon = []
+                for (_x, _y) in data:
+                    dx, dy = rotate(_x, _y)
+                    polygon.append([x + dx, -y + dy])
 
-                if dwg is not None:
-                    if el.tag == 'hole' or \
-                            el.attrib['layer'] == self.DIMENSION_LAYER:
-                        dwg_layer.append(dwg)
-                    else:
-                        bot = not top
+                dwg = {
+                    'type': 'polygon',
+                    'filled': 1,
+                    'pos': [0, 0],
+                    'polygons': [polygon]
+                }
+
+            if tag == 'hole' or layer == self.DIMENSION_LAYER:
+                dwg_layer.append(dwg)
+            else:
+                bot = not top
 
-                        # Note that in Eagle terminology, 'mirrored'
-                        # essentially means 'flipped' (i.e. to the opposite
-                        # side of the board)
-                        if (mirrored and bot) or (not mirrored and top):
-                            dwg_layer['F'].append(dwg)
-                        elif (mirrored and top) or (not mirrored and bot):
-                            dwg_layer['B'].append(dwg)
+                # Note that in Eagle terminology, 'mirrored'
+                # essentially means 'flipped' (i.e. to the opposite
+                # side of the board)
+                if (mirrored and bot) or (not mirrored and top):
+                    dwg_layer['F'].append(dwg)
+                elif (mirrored and top) or (not mirrored and bot):
+                    dwg_layer['B'].append(dwg)
 
     def _name_to_silk(self, name, x, y, elr, tr, align, size, ratio):
         angle = tr.angle
@@ -638,28 +761,25 @@ class FusionEagleParser(EcadParser):
         else:
             self.pcbdata['drawings']['silkscreen']['F'].append(dwg)
 
-    def _element_refdes_to_silk(self, el, package):
+    def _element_refdes_to_silk(self, el, geometry):
         if 'smashed' not in el.attrib:
             elx = float(el.attrib['x'])
             ely = -float(el.attrib['y'])
-            for p_el in package.iter('text'):
-                if p_el.text == '>NAME':
-                    dx = float(p_el.attrib['x'])
-                    dy = float(p_el.attrib['y'])
-                    elr = self.Rot(el.get('rot'))
-                    dx, dy = self._rotate(dx, dy, elr.angle, elr.mirrored)
-                    tr = self.Rot(p_el.get('rot'))
-                    tr.angle += elr.angle
-                    tr.mirrored ^= elr.mirrored
-                    self._name_to_silk(
-                        name=el.attrib['name'],
-                        x=elx + dx,
-                        y=ely - dy,
-                        elr=elr,
-                        tr=tr,
-                        align=p_el.get('align'),
-                        size=float(p_el.attrib['size']),
-                        ratio=float(p_el.get('ratio', '8')) / 100)
+            for dx, dy, rot, align, size, ratio in geometry['names']:
+                elr = self.Rot(el.get('rot'))
+                dx, dy = self._rotate(dx, dy, elr.angle, elr.mirrored)
+                tr = self.Rot(rot)
+                tr.angle += elr.angle
+                tr.mirrored ^= elr.mirrored
+                self._name_to_silk(
+                    name=el.attrib['name'],
+                    x=elx + dx,
+                    y=ely - dy,
+                    elr=elr,
+                    tr=tr,
+                    align=align,
+                    size=size,
+                    ratio=ratio)
 
         for attr in el.iter('attribute'):
             if attr.attrib['name'] == 'NAME':
@@ -719,18 +839,18 @@ class FusionEagleParser(EcadParser):
             if c not in self.pcbdata['font_data']:
                 self.pcbdata['font_data'][c] = wl
 
-    def _parse_param_length(self, name, root, default):
+    def _parse_param_length(self, name, params, default):
         # parse named parameter (typically a design rule) assuming it is in
         # length units (mil or mm)
-        p = [el.attrib['value'] for el in root.iter('param') if
-              el.attrib['name'] == name]
+        p = [el.attrib['value'] for el in params if
+             el.attrib['name'] == name]
         if len(p) == 0:
-            self.logger.warning("{0} not found, defaulting to {1}"
-                                .format(name, default))
+            self.logger.warn("{0} not found, defaulting to {1}"
+                             .format(name, default))
             return default
         else:
             if len(p) > 1:
-                self.logger.warning(
+                self.logger.warn(
                     "Multiple {0} found, using first occurrence".format(name))
             p = p[0]
             p_val = float(''.join(d for d in p if d in string.digits + '.'))
@@ -744,73 +864,161 @@ class FusionEagleParser(EcadParser):
                 self.logger.error("Unsupported units {0} on {1}"
                                   .format(p_units, name))
 
-    def parse(self):
-        ext = os.path.splitext(self.file_name)[1]
-
-        if ext.lower() == '.fbrd':
+    @contextlib.contextmanager
+    def _open_board(self):
+        if os.path.splitext(self.file_name)[1].lower() == '.fbrd':
             with zipfile.ZipFile(self.file_name) as myzip:
                 brdfilename = [fname for fname in myzip.namelist() if
                                os.path.splitext(fname)[1] == '.brd']
                 with myzip.open(brdfilename[0]) as brdfile:
-                    return self._parse(brdfile)
-
-        elif ext.lower() == '.brd':
+                    yield io.TextIOWrapper(brdfile, encoding='utf-8')
+        else:
             with io.open(self.file_name, 'r', encoding='utf-8') as brdfile:
-                return self._parse(brdfile)
+                yield brdfile
+
+    def parse(self):
+        ext = os.path.splitext(self.file_name)[1]
+        if ext.lower() not in ['.brd', '.fbrd']:
+            return None
 
-    def _parse(self, brdfile):
+        # Board is read twice, first pass only collects placed packages so
+        # that the rest of the libraries are not kept in memory.
+        with self._open_board() as brdfile:
+            used_packages = self._used_packages(brdfile)
+        with self._open_board() as brdfile:
+            return self._parse(brdfile, used_packages)
+
+    @staticmethod
+    def _attribute_value(raw):
+        # same normalization as done by the xml parser
+        raw = raw.replace('\r\n', ' ').translate(WHITESPACE_TO_SPACE)
+        return html.unescape(raw)
+
+    def _used_packages(self, brdfile):
+        """
+        Returns set of (library name, package name) of all board elements.
+        Elements follow libraries in board files, so they are picked out of
+        the raw text before the xml is parsed.
+        """
+        used = set()
+        tail = ''
+        while True:
+            chunk = brdfile.read(self.SCAN_CHUNK_SIZE)
+            text = tail + chunk
+            # attribute values can not contain '<', so every tag that
+            # starts before the last '<' is complete
+            end = text.rfind('<') if chunk else len(text)
+            for tag in self.ELEMENT_TAG_RE.finditer(text, 0, end):
+                attrs = {m[0]: self._attribute_value(m[1] or m[2])
+                         for m in self.ATTRIBUTE_RE.findall(tag.group())}
+                used.add((attrs.get('library'), attrs.get('package')))
+            if not chunk:
+                return used
+            tail = text[end:]
+
+    def _is_discarded(self, el, parents, used_packages):
+        """
+        Returns True if element is never used when building pcbdata. Only
+        direct children of signals, libraries and packages are checked.
+        """
+        parent = parents[-1]
+        if parent.tag == 'signal':
+            # inner layer copper
+            return el.tag in ['wire', 'polygon', 'polygonpour'] and \
+                el.get('layer') not in self.COPPER_LAYERS
+        if parent.tag == 'library':
+            # descriptions, 3d models and schematic parts
+            return el.tag != 'packages'
+        if parent.tag == 'packages' and el.tag == 'package':
+            library = parents[-2].get('name')
+            return (library, el.get('name')) not in used_packages
+        if parent.tag == 'package':
+            if el.tag == 'text':
+                return el.text != '>NAME'
+            if el.tag in ['wire', 'rectangle', 'circle', 'polygon']:
+                return el.get('layer') not in self.PACKAGE_LAYERS
+            return el.tag in ['description', 'package3dinstances']
+        return False
+
+    def _read_board(self, brdfile, used_packages):
+        """
+        Reads board xml and returns its root element. Subtrees that are never
+        used, like inner layer copper, packages that are not placed and
+        package drawings on layers that are not rendered, are dropped as soon
+        as they are parsed so they do not add to peak memory.
+        """
+        parents = []
+        root = None
+        for event, el in ElementTree.iterparse(brdfile, ('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = el
+                parents.append(el)
+                continue
+            parents.pop()
+            if parents and self._is_discarded(el, parents, used_packages):
+                # Events are reported a chunk at a time, so siblings that
+                # follow the element may already be parsed.
+                parent = parents[-1]
+                for i in range(len(parent) - 1, -1, -1):
+                    if parent[i] is el:
+                        del parent[i]
+                        break
+        return root
+
+    def _parse(self, brdfile, used_packages):
+        start = time.time()
         try:
-            brdxml = ElementTree.parse(brdfile)
+            root = self._read_board(brdfile, used_packages)
         except ElementTree.ParseError as err:
             self.logger.error(
                 "Exception occurred trying to parse {0}, message: {1}"
                 .format(brdfile.name, err.msg))
             return None, None
-        if brdxml is None:
+        if root is None:
             self.logger.error(
                 "No data was able to be parsed from {0}".format(brdfile.name))
             return None, None
 
+        start = self._log_stage("Reading board xml", start)
+
         # Pick out key sections
-        root = brdxml.getroot()
         board = root.find('drawing').find('board')
         plain = board.find('plain')
         elements = board.find('elements')
         signals = board.find('signals')
-
-        # Build library mapping elements' pads to nets
-        self._parse_pad_nets(signals)
+        # Board libraries only hold packages and signals only hold copper,
+        # neither of them has attributes, variants or design rules.
+        tags = self._index_tags(root, ['attribute', 'variantdef', 'param'],
+                                skipped={'libraries', 'signals'})
 
         # Parse needed design rules
 
         # Minimum via annular ring
         # (Needed in order to calculate through-hole pad diameters correctly)
         self.min_via_w = (
-            self._parse_param_length('rlMinViaOuter', root, default=0))
+            self._parse_param_length('rlMinViaOuter', tags['param'],
+                                     default=0))
 
         # Minimum drill diameter above which vias will be un-tented
         self.min_drill_via_untented = (
-            self._parse_param_length('mlViaStopLimit', root, default=0))
+            self._parse_param_length('mlViaStopLimit', tags['param'],
+                                     default=0))
 
-        # Signals --> nets
+        # Signals --> pad nets, nets, tracks, zones
+        self.elements_pad_nets = {}
         if self.config.include_nets:
             self.pcbdata['nets'] = []
-            for signal in signals.iter('signal'):
-                self.pcbdata['nets'].append(signal.attrib['name'])
-
-        # Signals --> tracks, zones
         if self.config.include_tracks:
             self.pcbdata['tracks'] = {'F': [], 'B': []}
             self.pcbdata['zones'] = {'F': [], 'B': []}
-            for signal in signals.iter('signal'):
-                for wire in signal.iter('wire'):
-                    self._add_track(wire, signal.attrib['name'])
-                for via in signal.iter('via'):
-                    self._add_track(via, signal.attrib['name'])
-                for poly in signal.iter('polygonpour'):
-                    self._add_zone(poly, signal.attrib['name'])
+        for signal in signals.iter('signal'):
+            self._parse_signal(signal)
+        start = self._log_stage("Signals", start)
 
         # Elements --> components, footprints, silkscreen, edges
+        package_index = self._index_packages(board)
+        warned_packages = set()
         for el in elements.iter('element'):
             populate = el.get('populate') != 'no'
             elr = self.Rot(el.get('rot'))
@@ -830,13 +1038,8 @@ class FusionEagleParser(EcadParser):
                              extra_fields=extra_fields)
 
             # For component, get footprint data
-            libs = [lib for lib in board.find('libraries').findall('library')
-                    if lib.attrib['name'] == el.attrib['library']]
-            packages = []
-            for lib in libs:
-                p = [pac for pac in lib.find('packages').findall('package')
-                     if pac.attrib['name'] == el.attrib['package']]
-                packages.extend(p)
+            key = (el.attrib['library'], el.attrib['package'])
+            packages = package_index.get(key)
             if not packages:
                 self.logger.error("Package {0} in library {1} not found in "
                                   "source file {2} for element {3}"
@@ -847,7 +1050,8 @@ class FusionEagleParser(EcadParser):
                 return None, None
             else:
                 package = packages[0]
-                if len(packages) > 1:
+                if len(packages) > 1 and key not in warned_packages:
+                    warned_packages.add(key)
                     self.logger.warn("Multiple packages found for package {0}"
                                      " in library {1}, using first instance "
                                      "found".format(el.attrib['package'],
@@ -865,21 +1069,24 @@ class FusionEagleParser(EcadParser):
             }
 
             elr = self.Rot(el.get('rot'))
-            footprint['pads'] = self._footprint_pads(package, elx, ely,
+            geometry = self._package_geometry(package)
+            footprint['pads'] = self._footprint_pads(geometry, elx, ely,
                                                      elr.angle, elr.mirrored,
                                                      refdes)
-            footprint['bbox'] = self._calculate_footprint_bbox(package, elx,
+            footprint['bbox'] = self._calculate_footprint_bbox(geometry, elx,
                                                                ely, elr.angle,
                                                                elr.mirrored)
             self.pcbdata['footprints'].append(footprint)
 
             # Add silkscreen, edges for component footprint & refdes
-            self._process_footprint(package, elx, ely, elr.angle, elr.mirrored,
-                                    populate)
-            self._element_refdes_to_silk(el, package)
+            self._process_footprint(geometry, elx, ely, elr.angle,
+                                    elr.mirrored, populate)
+            self._element_refdes_to_silk(el, geometry)
 
             self.components.append(comp)
 
+        start = self._log_stage("Footprints", start)
+
         # Edges & silkscreen (independent of elements)
         for el in plain.iter():
             self._add_drawing(el)
@@ -894,19 +1101,15 @@ class FusionEagleParser(EcadParser):
         self._add_parsed_font_data()
 
         # Fabrication & metadata
-        company = [a.attrib['value'] for a in root.iter('attribute') if
-                   a.attrib['name'] == 'COMPANY']
-        company = '' if not company else company[0]
-        rev = [a.attrib['value'] for a in root.iter('attribute') if
-               a.attrib['name'] == 'REVISION']
-        rev = '' if not rev else rev[0]
-
-        if not rev:
-            rev = ''
+        attributes = {}
+        for a in tags['attribute']:
+            attributes.setdefault(a.attrib['name'], a.attrib.get('value'))
+        company = attributes.get('COMPANY') or ''
+        rev = attributes.get('REVISION') or ''
 
         title = os.path.basename(self.file_name)
 
-        variant = [a.attrib['name'] for a in root.iter('variantdef') if
+        variant = [a.attrib['name'] for a in tags['variantdef'] if
                    a.get('current') == 'yes']
         variant = None if not variant else variant[0]
         if variant:
@@ -916,5 +1119,6 @@ class FusionEagleParser(EcadParser):
             os.path.getmtime(self.file_name)).strftime('%Y-%m-%d %H:%M:%S')
         self.pcbdata['metadata'] = {'title': title, 'revision': rev,
                                     'company': company, 'date': date}
+        self._log_stage("Drawings and metadata", start)
 
         return self.pcbdata, self.components
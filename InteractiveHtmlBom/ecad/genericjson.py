@@ -1,16 +1,67 @@
+import copy
 import io
 import json
 import os.path
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 from .common import EcadParser, Component, BoundingBox, ExtraFieldData
 from ..core.fontparser import FontParser
 from ..errors import ParsingException
 
+# Validators by spec version, schemas are loaded and checked once per process
+_validators = {}
+
+# Number of items of each list that are validated in structural mode
+STRUCTURAL_SAMPLE_SIZE = 16
+
+
+def get_validator(spec_version):
+    validator = _validators.get(spec_version)
+    if validator is None:
+        schema_dir = os.path.join(os.path.dirname(__file__), 'schema')
+        schema_file_name = os.path.join(
+            schema_dir, 'genericjsonpcbdata_v{}.schema'.format(spec_version))
+
+        with io.open(schema_file_name, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        validator = _validators[spec_version] = cls(schema)
+    return validator
+
+
+def sample(value, size=STRUCTURAL_SAMPLE_SIZE):
+    """
+    Returns copy of json value where lists longer than size are replaced by
+    size evenly spaced items including the last one. Only sampled items are
+    visited so the cost does not depend on length of the lists.
+    """
+    if isinstance(value, dict):
+        return {k: sample(v, size) for k, v in value.items()}
+    if isinstance(value, list):
+        if len(value) > size:
+            step = (len(value) - 1) / (size - 1)
+            value = [value[int(round(i * step))] for i in range(size)]
+        return [sample(v, size) for v in value]
+    return value
+
 
 class GenericJsonParser(EcadParser):
     COMPATIBLE_SPEC_VERSIONS = [1]
 
+    def __init__(self, file_name, config, logger, pcb=None):
+        """
+        :param pcb: json document of file_name if it was already loaded.
+        """
+        super(GenericJsonParser, self).__init__(file_name, config, logger)
+        self.pcb = pcb
+        # [(path, mtime), pcbdata, components] of the last parsed file,
+        # pcbdata is None once parse() took it
+        self.parsed = None
+
     def extra_data_file_filter(self):
         return "Json file ({f})|{f}".format(f=os.path.basename(self.file_name))
 
@@ -39,8 +90,12 @@ class GenericJsonParser(EcadParser):
         return ExtraFieldData(list(field_set), comp_dict, by_index)
 
     def get_generic_json_pcb(self):
-        with io.open(self.file_name, 'r', encoding='utf-8') as f:
-            pcb = json.load(f)
+        if self.pcb is not None:
+            # preloaded document is used once and not kept in memory
+            pcb, self.pcb = self.pcb, None
+        else:
+            with io.open(self.file_name, 'r', encoding='utf-8') as f:
+                pcb = json.load(f)
 
         if 'spec_version' not in pcb:
             raise ValidationError("'spec_version' is a required property")
@@ -49,15 +104,17 @@ class GenericJsonParser(EcadParser):
             raise ValidationError("Unsupported spec_version ({})"
                                   .format(pcb['spec_version']))
 
-        schema_dir = os.path.join(os.path.dirname(__file__), 'schema')
-        schema_file_name = os.path.join(schema_dir,
-                                        'genericjsonpcbdata_v{}.schema'.format(
-                                            pcb['spec_version']))
-
-        with io.open(schema_file_name, 'r', encoding='utf-8') as f:
-            schema = json.load(f)
+        if self.config.validation == 'full':
+            instance = pcb
+        elif self.config.validation == 'structural':
+            instance = sample(pcb)
+        else:
+            return pcb
 
-        validate(instance=pcb, schema=schema)
+        validator = get_validator(pcb['spec_version'])
+        error = best_match(validator.iter_errors(instance))
+        if error is not None:
+            raise error
 
         return pcb
 
@@ -110,7 +167,27 @@ class GenericJsonParser(EcadParser):
         else:
             return True
 
-    def _parse(self):
+    def _parse(self, take_pcbdata=False):
+        """
+        Returns (pcbdata, components) of the file. Result is cached until
+        the file is modified so that the file is loaded and validated once
+        for extra field data and for parse(). Cached components must not be
+        modified.
+
+        :param take_pcbdata: hand cached pcbdata over to the caller and drop
+                             it from the cache, the caller may modify it.
+        """
+        key = (os.path.abspath(self.file_name),
+               os.path.getmtime(self.file_name))
+        if (self.parsed is None or self.parsed[0] != key or
+                take_pcbdata and self.parsed[1] is None):
+            self.parsed = [key] + list(self._parse_file())
+        _, pcbdata, components = self.parsed
+        if take_pcbdata:
+            self.parsed[1] = None
+        return pcbdata, components
+
+    def _parse_file(self):
         try:
             pcb = self.get_generic_json_pcb()
         except ValidationError as e:
@@ -141,7 +218,13 @@ class GenericJsonParser(EcadParser):
         return pcbdata, components
 
     def parse(self):
-        pcbdata, components = self._parse()
+        # pcbdata is modified here and by the caller, so it is taken out of
+        # the cache and the next parse() loads the file again
+        pcbdata, components = self._parse(take_pcbdata=True)
+        if pcbdata is None:
+            return None, None
+        # extra fields are filtered below, cached components stay intact
+        components = [copy.copy(c) for c in components]
 
         # override board bounding box based on edges
         board_outline_bbox = BoundingBox()
@@ -157,10 +240,12 @@ class GenericJsonParser(EcadParser):
             extra_fields.add(self.config.dnp_field)
         if self.config.board_variant_field:
             extra_fields.add(self.config.board_variant_field)
-        if extra_fields:
-            for c in components:
+        for c in components:
+            if extra_fields:
                 c.extra_fields = {
                     f: c.extra_fields.get(f, "") for f in extra_fields}
+            else:
+                c.extra_fields = dict(c.extra_fields)
 
         self.config.kicad_text_formatting = False
 
@@ -1,5 +1,10 @@
 import os
-import pcbnew
+
+try:
+    import pcbnew
+except ImportError:
+    # Headless mode, see ecad/kicad_sexpr.py
+    pcbnew = None
 
 from .xmlparser import XmlParser
 from .netlistparser import NetlistParser
@@ -10,7 +15,7 @@ PARSERS = {
 }
 
 
-if hasattr(pcbnew, 'FOOTPRINT'):
+if pcbnew is None or hasattr(pcbnew, 'FOOTPRINT'):
     PARSERS['.kicad_pcb'] = None
 
 
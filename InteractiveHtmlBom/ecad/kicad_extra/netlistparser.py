@@ -1,22 +1,20 @@
 import io
+import re
 
 from .parser_base import ParserBase
-from .sexpressions import parse_sexpression
+from .sexpressions import iter_sexpression
 
 
 class NetlistParser(ParserBase):
     def get_extra_field_data(self):
         with io.open(self.file_name, 'r', encoding='utf-8') as f:
-            sexpression = parse_sexpression(f.read())
-        components = None
-        for s in sexpression:
-            if s[0] == 'components':
-                components = s[1:]
-        if components is None:
+            sexpression = f.read()
+        if not re.search(r'\(\s*components\b', sexpression):
             return None
         field_set = set()
         comp_dict = {}
-        for c in components:
+        # Only the components section is built, one comp at a time
+        for c in iter_sexpression(sexpression, ['components']):
             ref = None
             fields = None
             datasheet = None
@@ -1,32 +1,127 @@
 import re
+from itertools import chain
 
-term_regex = r'''(?mx)
-    \s*(?:
-        (?P<open>\()|
-        (?P<close>\))|
-        (?P<sq>"(?:\\\\|\\"|[^"])*")|
-        (?P<s>[^(^)\s]+)
-       )'''
-pattern = re.compile(term_regex)
+token_pattern = re.compile(r'[^\s()"]+|[()]|"(?:[^"\\]|\\.)*"')
+string_pattern = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+# Skips text outside of quoted strings and complete quoted strings, stops at
+# a quote whose string does not end before the end of the scanned range.
+skip_pattern = re.compile(r'[^"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"]*)*')
+escape_pattern = re.compile(r'\\(.)')
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
 
+# Tokens are matched a chunk at a time so that the token list of a large
+# file never has to be held in memory at once.
+CHUNK_SIZE = 1 << 20
 
-def parse_sexpression(sexpression):
+
+def _unescape(match):
+    return ESCAPES.get(match.group(1), match.group(1))
+
+
+def _unquote(token):
+    token = token[1:-1]
+    if '\\' in token:
+        token = escape_pattern.sub(_unescape, token)
+    return token
+
+
+def _chunks(text):
+    pos = 0
+    length = len(text)
+    while pos < length:
+        end = text.find('\n', pos + CHUNK_SIZE) + 1 or length
+        # Chunks end on a line break. Extend the chunk while it ends inside
+        # of a quoted string that spans several lines.
+        scan = skip_pattern.match(text, pos, end).end()
+        while scan < end:
+            string = string_pattern.match(text, scan)
+            if string is None:
+                # unterminated string, the rest of the text is one chunk
+                end = length
+                break
+            end = text.find('\n', string.end()) + 1 or length
+            scan = skip_pattern.match(text, string.end(), end).end()
+        yield pos, end
+        pos = end
+
+
+def _tokens(text):
+    return chain.from_iterable(token_pattern.findall(text, start, end)
+                               for start, end in _chunks(text))
+
+
+def _build(tokens):
+    """Builds the list whose opening bracket was just consumed."""
     stack = []
     out = []
-    for terms in pattern.finditer(sexpression):
-        term, value = [(t, v) for t, v in terms.groupdict().items() if v][0]
-        if term == 'open':
+    append = out.append
+    for token in tokens:
+        if token == '(':
             stack.append(out)
             out = []
-        elif term == 'close':
-            assert stack, "Trouble with nesting of brackets"
-            tmp, out = out, stack.pop(-1)
-            out.append(tmp)
-        elif term == 'sq':
-            out.append(value[1:-1].replace('\\\\', '\\').replace('\\"', '"'))
-        elif term == 's':
-            out.append(value)
+            append = out.append
+        elif token == ')':
+            if not stack:
+                return out
+            item = out
+            out = stack.pop()
+            append = out.append
+            append(item)
+        elif token[0] == '"':
+            append(_unquote(token))
         else:
-            raise NotImplementedError("Error: %s, %s" % (term, value))
-    assert not stack, "Trouble with nesting of brackets"
-    return out[0]
+            append(token)
+    raise AssertionError("Trouble with nesting of brackets")
+
+
+def parse_sexpression(sexpression):
+    """
+    Returns the first list of the s-expression as nested lists of strings.
+    Quoted strings are unquoted and unescaped.
+    """
+    tokens = _tokens(sexpression)
+    for token in tokens:
+        if token == '(':
+            return _build(tokens)
+    raise AssertionError("No lists in s-expression")
+
+
+def iter_sexpression(text, path=()):
+    """
+    Yields child lists of the list found by following path from the root
+    list, e.g. path ['components'] yields every comp of a netlist. Lists are
+    yielded one by one as soon as each of them is parsed. All other lists
+    are only scanned, not built, so only one child is kept in memory.
+
+    :param text: s-expression
+    :param path: heads of nested lists below the root list
+    """
+    target = len(path) + 1
+    tokens = _tokens(text)
+    depth = 0
+    # depth of the deepest list on the current branch that matches path
+    matched = 0
+    head = False
+    for token in tokens:
+        if token == '(':
+            depth += 1
+            head = False
+            if matched == target:
+                yield _build(tokens)
+                depth -= 1
+            elif matched == depth - 1:
+                if depth == 1:
+                    matched = 1
+                else:
+                    head = True
+        elif token == ')':
+            assert depth, "Trouble with nesting of brackets"
+            depth -= 1
+            head = False
+            if matched > depth:
+                matched = depth
+        elif head:
+            head = False
+            if token == path[depth - 2]:
+                matched = depth
+    assert not depth, "Trouble with nesting of brackets"
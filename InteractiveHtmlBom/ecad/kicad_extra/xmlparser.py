@@ -1,42 +1,47 @@
-from xml.dom import minidom
+from xml.etree import ElementTree
 
 from .parser_base import ParserBase
 
 
 class XmlParser(ParserBase):
+    # Large repeated elements that are not needed, cleared once parsed
+    SKIPPED_TAGS = {'libpart', 'net'}
+
     @staticmethod
-    def get_text(nodelist):
-        rc = []
-        for node in nodelist:
-            if node.nodeType == node.TEXT_NODE:
-                rc.append(node.data)
-        return ''.join(rc)
+    def get_text(element):
+        return (element.text or '') + ''.join(c.tail or '' for c in element)
+
+    def parse_comp(self, c, field_set, comp_dict):
+        ref_fields = comp_dict.setdefault(c.attrib['ref'], {})
+        datasheet = c.find('.//datasheet')
+        if datasheet is not None:
+            datasheet = self.get_text(datasheet)
+            if datasheet != '~':
+                field_set.add('Datasheet')
+                ref_fields['Datasheet'] = datasheet
+        libsource = c.find('.//libsource')
+        if libsource is not None and 'description' in libsource.attrib:
+            field_set.add('Description')
+            ref_fields['Description'] = libsource.attrib['description']
+        for f in c.iter('field'):
+            name = f.attrib['name']
+            field_set.add(name)
+            ref_fields[name] = self.get_text(f)
+        for f in c.iter('property'):
+            if f.attrib['name'] == 'dnp':
+                field_set.add('kicad_dnp')
+                ref_fields['kicad_dnp'] = "DNP"
 
     def get_extra_field_data(self):
-        xml = minidom.parse(self.file_name)
-        components = xml.getElementsByTagName('comp')
         field_set = set()
         comp_dict = {}
-        for c in components:
-            ref_fields = comp_dict.setdefault(c.attributes['ref'].value, {})
-            datasheet = c.getElementsByTagName('datasheet')
-            if datasheet:
-                datasheet = self.get_text(datasheet[0].childNodes)
-                if datasheet != '~':
-                    field_set.add('Datasheet')
-                    ref_fields['Datasheet'] = datasheet
-            libsource = c.getElementsByTagName('libsource')
-            if libsource and libsource[0].hasAttribute('description'):
-                field_set.add('Description')
-                attr = libsource[0].attributes['description']
-                ref_fields['Description'] = attr.value
-            for f in c.getElementsByTagName('field'):
-                name = f.attributes['name'].value
-                field_set.add(name)
-                ref_fields[name] = self.get_text(f.childNodes)
-            for f in c.getElementsByTagName('property'):
-                if f.attributes['name'].value == 'dnp':
-                    field_set.add('kicad_dnp')
-                    ref_fields['kicad_dnp'] = "DNP"
+        # Each comp is handled as soon as it is parsed and then dropped so
+        # memory use does not grow with the size of the netlist.
+        for _, element in ElementTree.iterparse(self.file_name):
+            if element.tag == 'comp':
+                self.parse_comp(element, field_set, comp_dict)
+                element.clear()
+            elif element.tag in self.SKIPPED_TAGS:
+                element.clear()
 
         return list(field_set), comp_dict
@@ -0,0 +1,925 @@
+"""
+Reads .kicad_pcb files directly, without pcbnew.
+
+The board file is tokenized in a single pass and handled one top level item
+at a time, so neither KiCad's board model nor the full s-expression tree is
+ever built. Output follows PcbnewParser.
+"""
+import io
+import math
+import os
+from datetime import datetime
+
+from .common import EcadParser, Component, ExtraFieldData, BoundingBox
+from .kicad_extra import find_latest_schematic_data, parse_schematic_data
+from .kicad_extra.sexpressions import iter_sexpression
+from ..core.fontparser import FontParser
+from ..errors import ParsingException
+
+# File format version of KiCad 7. Zone fills are not stroked since then.
+KICAD7_FILE_VERSION = 20221018
+
+OUTER_LAYERS = {'F.Cu': 'F', 'B.Cu': 'B'}
+
+CHAMFER_POSITIONS = {
+    'top_left': 1,
+    'top_right': 2,
+    'bottom_left': 4,
+    'bottom_right': 8,
+}
+
+# Segment count of circles that are approximated with polygons
+CIRCLE_SEGMENTS = 32
+
+
+def _child(node, name):
+    for c in node:
+        if c.__class__ is list and c and c[0] == name:
+            return c
+    return None
+
+
+def _children(node, name):
+    return [c for c in node if c.__class__ is list and c and c[0] == name]
+
+
+def _flag(node, name, start=1):
+    """
+    Checks bare "name" atoms written by KiCad 5-7 as well as
+    "(name yes)" lists written by later versions.
+    """
+    for c in node[start:]:
+        if c == name:
+            return True
+        if c.__class__ is list and c and c[0] == name:
+            return len(c) == 1 or c[1] in ('yes', 'true')
+    return False
+
+
+def _xy(node):
+    return [float(node[1]), float(node[2])]
+
+
+def _at(node):
+    at = _child(node, 'at')
+    angle = 0
+    if len(at) > 3 and at[3] != 'unlocked':
+        angle = float(at[3])
+    return _xy(at), angle
+
+
+def _width(node):
+    width = _child(node, 'width')
+    if width is None:
+        width = _child(_child(node, 'stroke') or [], 'width')
+    return float(width[1]) if width else 0
+
+
+def _filled(node, default):
+    fill = _child(node, 'fill')
+    if fill is None or len(fill) < 2:
+        return default
+    return fill[1] in ('solid', 'yes')
+
+
+def _pts(node):
+    points = []
+    for p in _child(node, 'pts')[1:]:
+        if p[0] == 'xy':
+            points.append(_xy(p))
+        elif p[0] == 'arc':
+            # approximated with its start, middle and end points
+            points.extend(_xy(_child(p, k)) for k in ('start', 'mid', 'end'))
+    return points
+
+
+def _angle(center, point):
+    return math.degrees(math.atan2(point[1] - center[1],
+                                   point[0] - center[0]))
+
+
+def _arc_from_points(start, mid, end):
+    # type: (list, list, list) -> tuple | None
+    """
+    Returns (center, radius, startangle, endangle) of the arc through three
+    points or None if points are collinear.
+    """
+    (ax, ay), (bx, by), (cx, cy) = start, mid, end
+    d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if d == 0:
+        return None
+    a2 = ax * ax + ay * ay
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+    center = [(a2 * (by - cy) + b2 * (cy - ay) + c2 * (ay - by)) / d,
+              (a2 * (cx - bx) + b2 * (ax - cx) + c2 * (bx - ax)) / d]
+    radius = math.hypot(ax - center[0], ay - center[1])
+    a1 = _angle(center, start)
+    sweep = (_angle(center, end) - a1) % 360
+    if (_angle(center, mid) - a1) % 360 > sweep:
+        # arc goes the other way around, draw it from the end point
+        a1 = _angle(center, end)
+        sweep = 360 - sweep
+    return center, radius, round(a1, 2), round(a1 + sweep, 2)
+
+
+def _circle_polygon(x, y, r):
+    return [[x + r * math.cos(2 * math.pi * i / CIRCLE_SEGMENTS),
+             y + r * math.sin(2 * math.pi * i / CIRCLE_SEGMENTS)]
+            for i in range(CIRCLE_SEGMENTS)]
+
+
+def _rect_polygon(start, end):
+    return [start, [end[0], start[1]], end, [start[0], end[1]]]
+
+
+def _oriented(polygon):
+    """Returns polygon with positive winding so that fills add up."""
+    area = sum(polygon[i - 1][0] * polygon[i][1] -
+               polygon[i][0] * polygon[i - 1][1]
+               for i in range(len(polygon)))
+    return polygon if area >= 0 else polygon[::-1]
+
+
+class Placement(object):
+    """Maps footprint local coordinates to board coordinates."""
+
+    def __init__(self, pos, angle):
+        self.pos = pos
+        self.angle = angle
+        self._cos = math.cos(math.radians(angle))
+        self._sin = math.sin(math.radians(angle))
+
+    def point(self, p):
+        x, y = p
+        return [round(self.pos[0] + x * self._cos + y * self._sin, 6),
+                round(self.pos[1] - x * self._sin + y * self._cos, 6)]
+
+
+class KicadSexprParser(EcadParser):
+    SHAPES = ['line', 'rect', 'circle', 'arc', 'poly', 'curve']
+
+    def __init__(self, file_name, config, logger):
+        super(KicadSexprParser, self).__init__(file_name, config, logger)
+        self.font_parser = FontParser()
+        self.version = 0
+        self.title_block = {}
+        self.output_directory = ''
+        self.tent_vias = True
+        # net number -> net name, empty if items refer to nets by name
+        self.net_names = {}
+        self.seen_nets = set()
+        self.footprints = []
+        self.board_drawings = []
+        self.footprint_drawings = []
+        self.tracks = {'F': [], 'B': []}
+        self.zones = {'F': [], 'B': []}
+        self.load()
+
+    def load(self):
+        with io.open(self.file_name, 'r', encoding='utf-8') as f:
+            text = f.read()
+        handlers = {
+            'version': self.read_version,
+            'title_block': self.read_title_block,
+            'setup': self.read_setup,
+            'net': self.read_net,
+            'footprint': self.read_footprint,
+            'module': self.read_footprint,
+            'segment': self.read_track,
+            'arc': self.read_track,
+            'via': self.read_via,
+            'zone': self.read_zone,
+        }
+        if not text.lstrip().startswith('(kicad_pcb'):
+            raise ParsingException(
+                'Not a KiCad board file: %s' % self.file_name)
+        for item in iter_sexpression(text):
+            if not item or item[0].__class__ is not str:
+                continue
+            tag = item[0]
+            if tag in handlers:
+                handlers[tag](item)
+            elif tag.startswith('gr_'):
+                for layer, drawing in self.read_drawing(item):
+                    self.board_drawings.append((layer, drawing))
+            elif tag.startswith('dimension'):
+                self.logger.info("Dimensions are not supported, skipping")
+
+    def read_version(self, node):
+        self.version = int(node[1])
+
+    def read_title_block(self, node):
+        for c in node[1:]:
+            if c.__class__ is list and len(c) > 1:
+                self.title_block[c[0]] = c[1]
+
+    def read_setup(self, node):
+        plot_params = _child(node, 'pcbplotparams') or []
+        output_directory = _child(plot_params, 'outputdirectory')
+        if output_directory:
+            self.output_directory = output_directory[1]
+        vias_on_mask = _child(plot_params, 'viasonmask')
+        if vias_on_mask:
+            self.tent_vias = vias_on_mask[1] not in ('true', 'yes')
+
+    def read_net(self, node):
+        self.net_names[node[1]] = node[2] if len(node) > 2 else ''
+
+    def net(self, node):
+        net = _child(node, 'net')
+        if net is None:
+            name = ''
+        else:
+            name = self.net_names.get(net[1], net[1])
+        self.seen_nets.add(name)
+        return name
+
+    def parse_text(self, node, text, in_footprint):
+        # type: (list, str, bool) -> dict | None
+        effects = _child(node, 'effects') or ['effects']
+        if in_footprint and (_flag(node, 'hide', 3) or
+                             _flag(effects, 'hide')):
+            return None
+        pos, angle = _at(node)
+        font = _child(effects, 'font') or ['font']
+        size = _child(font, 'size')
+        height, width = (float(size[1]), float(size[2])) if size else (1, 1)
+        thickness = _child(font, 'thickness')
+        thickness = float(thickness[1]) if thickness else height / 8
+        justify = _child(effects, 'justify') or []
+        if in_footprint:
+            # footprint text is kept upright
+            angle %= 360
+            if 90 < angle <= 270:
+                angle -= 180
+        self.font_parser.parse_font_for_string(text)
+        attributes = []
+        if 'mirror' in justify:
+            attributes.append("mirrored")
+        if _flag(font, 'italic'):
+            attributes.append("italic")
+        if _flag(font, 'bold'):
+            attributes.append("bold")
+
+        return {
+            "pos": pos,
+            "text": text,
+            "height": height,
+            "width": width,
+            "justify": [
+                -1 if 'left' in justify else 1 if 'right' in justify else 0,
+                -1 if 'top' in justify else 1 if 'bottom' in justify else 0,
+            ],
+            "thickness": thickness,
+            "attr": attributes,
+            "angle": angle
+        }
+
+    def parse_shape(self, node):
+        # type: (list) -> dict | None
+        shape = node[0][3:]
+        if shape not in self.SHAPES:
+            self.logger.info("Unsupported shape %s, skipping", node[0])
+            return None
+        width = _width(node)
+        if shape == "line":
+            return {
+                "type": "segment",
+                "start": _xy(_child(node, 'start')),
+                "end": _xy(_child(node, 'end')),
+                "width": width
+            }
+
+        if shape == "rect":
+            return {
+                "type": "polygon",
+                "pos": [0, 0],
+                "angle": 0,
+                "polygons": [_rect_polygon(_xy(_child(node, 'start')),
+                                           _xy(_child(node, 'end')))],
+                "width": width,
+                "filled": 1 if _filled(node, False) else 0
+            }
+
+        if shape == "circle":
+            center = _xy(_child(node, 'center'))
+            end = _xy(_child(node, 'end'))
+            shape_dict = {
+                "type": "circle",
+                "start": center,
+                "radius": math.hypot(end[0] - center[0], end[1] - center[1]),
+                "width": width
+            }
+            if _filled(node, False):
+                shape_dict["filled"] = 1
+            return shape_dict
+
+        if shape == "arc":
+            start = _xy(_child(node, 'start'))
+            end = _xy(_child(node, 'end'))
+            mid = _child(node, 'mid')
+            if mid is not None:
+                arc = _arc_from_points(start, _xy(mid), end)
+                if arc is None:
+                    return {
+                        "type": "segment",
+                        "start": start,
+                        "end": end,
+                        "width": width
+                    }
+                center, radius, a1, a2 = arc
+            else:
+                # KiCad 5 stores center, start point and angle
+                center = start
+                radius = math.hypot(end[0] - start[0], end[1] - start[1])
+                a1 = _angle(center, end)
+                a2 = a1 + float(_child(node, 'angle')[1])
+                if a2 < a1:
+                    a1, a2 = a2, a1
+                a1, a2 = round(a1, 2), round(a2, 2)
+            return {
+                "type": "arc",
+                "start": center,
+                "radius": radius,
+                "startangle": a1,
+                "endangle": a2,
+                "width": width
+            }
+
+        if shape == "poly":
+            shape_dict = {
+                "type": "polygon",
+                "pos": [0, 0],
+                "angle": 0,
+                "polygons": [_pts(node)]
+            }
+            if not _filled(node, True):
+                shape_dict["filled"] = 0
+                shape_dict["width"] = width
+            return shape_dict
+
+        if shape == "curve":
+            start, c1, c2, end = _pts(node)
+            return {
+                "type": "curve",
+                "start": start,
+                "cpa": c1,
+                "cpb": c2,
+                "end": end,
+                "width": width
+            }
+
+    def read_drawing(self, node, in_footprint=False, text=None):
+        # type: (list, bool, str) -> list
+        """Returns list of (layer name, drawing) in file coordinates."""
+        layer = _child(node, 'layer')
+        if layer is None:
+            return []
+        if node[0] in ('gr_text', 'fp_text', 'property'):
+            drawing = self.parse_text(
+                node, node[1] if text is None else text, in_footprint)
+        else:
+            drawing = self.parse_shape(node)
+        return [(layer[1], drawing)] if drawing else []
+
+    @staticmethod
+    def place_drawing(drawing, placement):
+        # type: (dict, Placement) -> dict
+        """Moves drawing from footprint coordinates to the board."""
+        if "text" in drawing:
+            # text angle is already absolute
+            drawing["pos"] = placement.point(drawing["pos"])
+            return drawing
+        for key in ("start", "end", "cpa", "cpb"):
+            if key in drawing:
+                drawing[key] = placement.point(drawing[key])
+        if "startangle" in drawing:
+            drawing["startangle"] = round(
+                drawing["startangle"] - placement.angle, 2)
+            drawing["endangle"] = round(
+                drawing["endangle"] - placement.angle, 2)
+        if "polygons" in drawing:
+            drawing["polygons"] = [[placement.point(p) for p in polygon]
+                                   for polygon in drawing["polygons"]]
+        return drawing
+
+    def parse_custom_pad_polygons(self, node, size):
+        options = _child(node, 'options') or []
+        anchor = _child(options, 'anchor')
+        if anchor and anchor[1] == 'rect':
+            polygons = [_rect_polygon([-size[0] / 2, -size[1] / 2],
+                                      [size[0] / 2, size[1] / 2])]
+        else:
+            polygons = [_circle_polygon(0, 0, size[0] / 2)]
+        for p in (_child(node, 'primitives') or [])[1:]:
+            width = _width(p)
+            if p[0] == 'gr_poly':
+                polygons.append(_pts(p))
+            elif p[0] == 'gr_rect':
+                polygons.append(_rect_polygon(_xy(_child(p, 'start')),
+                                              _xy(_child(p, 'end'))))
+            elif p[0] == 'gr_circle':
+                center = _xy(_child(p, 'center'))
+                end = _xy(_child(p, 'end'))
+                r = math.hypot(end[0] - center[0], end[1] - center[1])
+                polygons.append(
+                    _circle_polygon(center[0], center[1], r + width / 2))
+            elif p[0] == 'gr_line':
+                (x0, y0), (x1, y1) = (_xy(_child(p, 'start')),
+                                      _xy(_child(p, 'end')))
+                length = math.hypot(x1 - x0, y1 - y0)
+                if length == 0:
+                    continue
+                nx = -(y1 - y0) / length * width / 2
+                ny = (x1 - x0) / length * width / 2
+                polygons.append([[x0 + nx, y0 + ny], [x1 + nx, y1 + ny],
+                                 [x1 - nx, y1 - ny], [x0 - nx, y0 - ny]])
+            else:
+                self.logger.info(
+                    "Unsupported custom pad primitive %s, skipping", p[0])
+        return [_oriented(polygon) for polygon in polygons if polygon]
+
+    def parse_pad(self, node, placement):
+        # type: (list, Placement) -> dict | None
+        pad_type = node[2]
+        shape = node[3]
+        through_hole = pad_type in ('thru_hole', 'np_thru_hole')
+        layer_names = (_child(node, 'layers') or [])[1:]
+        layers = [letter for name, letter in OUTER_LAYERS.items()
+                  if name in layer_names or '*.Cu' in layer_names or
+                  'F&B.Cu' in layer_names]
+        if not layers and not through_hole:
+            return None
+
+        pos, angle = _at(node)
+        size = _xy(_child(node, 'size'))
+        pad_dict = {
+            "local_pos": pos,
+            "pos": placement.point(pos),
+            "size": size,
+            "angle": angle,
+            "shape": shape
+        }
+        chamfer = (_child(node, 'chamfer') or [])[1:]
+        if shape == "roundrect" and chamfer:
+            shape = pad_dict["shape"] = "chamfrect"
+        if shape == "custom":
+            pad_dict["polygons"] = self.parse_custom_pad_polygons(node, size)
+        elif shape == "trapezoid":
+            # treat trapezoid as custom shape
+            pad_dict["shape"] = "custom"
+            delta = _child(node, 'rect_delta')
+            delta = _xy(delta) if delta else [0, 0]
+            pad_dict["polygons"] = [[
+                [size[0] / 2 + delta[1] / 2, size[1] / 2 - delta[0] / 2],
+                [-size[0] / 2 - delta[1] / 2, size[1] / 2 + delta[0] / 2],
+                [-size[0] / 2 + delta[1] / 2, -size[1] / 2 - delta[0] / 2],
+                [size[0] / 2 - delta[1] / 2, -size[1] / 2 + delta[0] / 2],
+            ]]
+        elif shape not in ("rect", "oval", "circle", "roundrect",
+                           "chamfrect"):
+            self.logger.info("Unsupported pad shape %s, skipping.", shape)
+            return None
+
+        if shape in ["roundrect", "chamfrect"]:
+            ratio = _child(node, 'roundrect_rratio')
+            ratio = float(ratio[1]) if ratio else 0
+            pad_dict["radius"] = ratio * min(size)
+        if shape == "chamfrect":
+            pad_dict["chamfpos"] = sum(CHAMFER_POSITIONS.get(c, 0)
+                                       for c in chamfer)
+            ratio = _child(node, 'chamfer_ratio')
+            pad_dict["chamfratio"] = float(ratio[1]) if ratio else 0
+
+        drill = _child(node, 'drill') or ['drill']
+        offset = _child(drill, 'offset')
+        if through_hole:
+            pad_dict["type"] = "th"
+            sizes = [float(d) for d in drill[1:]
+                     if d.__class__ is not list and d != 'oval']
+            if not sizes:
+                sizes = [0]
+            pad_dict["drillshape"] = "oblong" if 'oval' in drill else "circle"
+            pad_dict["drillsize"] = [sizes[0], sizes[-1]]
+        else:
+            pad_dict["type"] = "smd"
+        pad_dict["offset"] = _xy(offset) if offset else [0, 0]
+        pad_dict["layers"] = layers
+        pad_dict["net"] = self.net(node)
+
+        return pad_dict
+
+    @staticmethod
+    def add_pad_bounding_box(pad, footprint_angle, bbox):
+        # type: (dict, float, BoundingBox) -> None
+        x, y = pad["local_pos"]
+        angle = footprint_angle - pad["angle"]
+        if "polygons" in pad:
+            for polygon in pad["polygons"]:
+                bbox.add_points([x + point[0] for point in polygon],
+                                [y + point[1] for point in polygon],
+                                x, y, angle)
+        else:
+            bbox.add_rectangle(x, y, pad["size"][0], pad["size"][1], angle)
+
+    def read_footprint(self, node):
+        placement = Placement(*_at(node))
+        layer = _child(node, 'layer')[1]
+        attr = (_child(node, 'attr') or [])[1:]
+        ref = value = ''
+        props = {}
+        ref_text = val_text = None
+        texts = []
+        graphics = []
+        pads = []
+        for c in node[2:]:
+            if c.__class__ is not list:
+                continue
+            tag = c[0]
+            if tag == 'fp_text':
+                if c[1] == 'reference':
+                    ref, ref_text = c[2], c
+                elif c[1] == 'value':
+                    value, val_text = c[2], c
+                else:
+                    texts.append(c)
+            elif tag == 'property':
+                name = c[1]
+                props[name] = c[2]
+                has_layer = _child(c, 'layer') is not None
+                if name == 'Reference':
+                    ref = c[2]
+                    ref_text = c if has_layer else ref_text
+                elif name == 'Value':
+                    value = c[2]
+                    val_text = c if has_layer else val_text
+                elif has_layer:
+                    texts.append(c)
+            elif tag == 'pad':
+                pads.append(c)
+            elif tag.startswith('fp_'):
+                graphics.append(c)
+
+        if "dnp" in props and props["dnp"] == "":
+            del props["dnp"]
+            props["kicad_dnp"] = "DNP"
+        if 'dnp' in attr:
+            props["kicad_dnp"] = "DNP"
+
+        def shown_text(c):
+            return (c[2].replace('${REFERENCE}', ref)
+                    .replace('${VALUE}', value))
+
+        bbox = BoundingBox()
+        drawings = []
+        copper_drawings = []
+        for marker, c in ([('ref', ref_text), ('val', val_text)] +
+                          [(None, g) for g in graphics] +
+                          [(None, t) for t in texts]):
+            if c is None:
+                continue
+            is_text = c[0] in ('fp_text', 'property')
+            for drawing_layer, drawing in self.read_drawing(
+                    c, True, shown_text(c) if is_text else None):
+                if not is_text:
+                    self.add_drawing_bounding_box(drawing, bbox)
+                self.place_drawing(drawing, placement)
+                if marker:
+                    drawing[marker] = 1
+                if drawing_layer in OUTER_LAYERS:
+                    copper_drawings.append({
+                        "layer": OUTER_LAYERS[drawing_layer],
+                        "drawing": drawing,
+                    })
+                else:
+                    drawings.append((drawing_layer, drawing))
+        self.footprint_drawings.extend(drawings)
+
+        parsed_pads = []
+        for p in pads:
+            pad_dict = self.parse_pad(p, placement)
+            if pad_dict is None:
+                continue
+            self.add_pad_bounding_box(pad_dict, placement.angle, bbox)
+            del pad_dict["local_pos"]
+            parsed_pads.append((p[1], pad_dict))
+
+        if parsed_pads:
+            # Try to guess first pin name.
+            parsed_pads = sorted(parsed_pads, key=lambda el: el[0])
+            pin1_pads = [p for p in parsed_pads if p[0] in
+                         ['1', 'A', 'A1', 'P1', 'PAD1']]
+            if pin1_pads:
+                pin1_pad_name = pin1_pads[0][0]
+            else:
+                # No pads have common first pin name,
+                # pick lexicographically smallest.
+                pin1_pad_name = parsed_pads[0][0]
+            for pad_name, pad_dict in parsed_pads:
+                if pad_name == pin1_pad_name:
+                    pad_dict['pin1'] = 1
+
+        if bbox.initialized():
+            rect = bbox.to_dict()
+            relpos = [rect["minx"], rect["miny"]]
+            size = [rect["maxx"] - rect["minx"], rect["maxy"] - rect["miny"]]
+        else:
+            relpos = size = [0, 0]
+
+        self.footprints.append({
+            "ref": ref,
+            "value": value,
+            "name": node[1].split(':')[-1],
+            "virtual": 'virtual' in attr or 'exclude_from_bom' in attr,
+            "props": props,
+            "pcbdata": {
+                "ref": ref,
+                "bbox": {
+                    "pos": placement.pos,
+                    "relpos": relpos,
+                    "size": size,
+                    "angle": placement.angle,
+                },
+                "pads": [p[1] for p in parsed_pads],
+                "drawings": copper_drawings,
+                "layer": OUTER_LAYERS.get(layer)
+            },
+        })
+
+    def read_track(self, node):
+        layer = OUTER_LAYERS.get(_child(node, 'layer')[1])
+        if layer is None:
+            return
+        start = _xy(_child(node, 'start'))
+        end = _xy(_child(node, 'end'))
+        width = _width(node)
+        arc = None
+        if node[0] == 'arc':
+            arc = _arc_from_points(start, _xy(_child(node, 'mid')), end)
+        if arc is not None:
+            center, radius, a1, a2 = arc
+            track_dict = {
+                "center": center,
+                "startangle": a1,
+                "endangle": a2,
+                "radius": radius,
+                "width": width,
+            }
+        else:
+            track_dict = {
+                "start": start,
+                "end": end,
+                "width": width,
+            }
+        track_dict["net"] = self.net(node)
+        self.tracks[layer].append((track_dict, False))
+
+    def read_via(self, node):
+        pos, _ = _at(node)
+        track_dict = {
+            "start": pos,
+            "end": pos,
+            "width": float(_child(node, 'size')[1]),
+            "net": self.net(node),
+        }
+        if not self.tent_vias:
+            track_dict["drillsize"] = float(_child(node, 'drill')[1])
+        layers = (_child(node, 'layers') or [])[1:]
+        for name, letter in OUTER_LAYERS.items():
+            if name in layers:
+                self.tracks[letter].append((track_dict, True))
+
+    def read_zone(self, node):
+        if _child(node, 'keepout') is not None:
+            # keepouts and rule areas have no copper
+            return
+        net_name = _child(node, 'net_name')
+        net = net_name[1] if net_name else self.net(node)
+        zone_layer = _child(node, 'layer')
+        width = 0
+        min_thickness = _child(node, 'min_thickness')
+        use_thickness = _child(node, 'filled_areas_thickness')
+        if (min_thickness and self.version < KICAD7_FILE_VERSION and
+                (use_thickness is None or use_thickness[1] != 'no')):
+            width = float(min_thickness[1])
+        polygons = {}
+        for filled in _children(node, 'filled_polygon'):
+            layer = _child(filled, 'layer') or zone_layer
+            if layer is None:
+                continue
+            polygons.setdefault(layer[1], []).append(_pts(filled))
+        for name, letter in OUTER_LAYERS.items():
+            if name in polygons:
+                self.zones[letter].append({
+                    "polygons": polygons[name],
+                    "width": width,
+                    "net": net,
+                })
+
+    def get_extra_field_data(self, file_name):
+        if os.path.abspath(file_name) == os.path.abspath(self.file_name):
+            return self.parse_extra_data_from_pcb()
+        if os.path.splitext(file_name)[1] == '.kicad_pcb':
+            return None
+
+        data = parse_schematic_data(file_name)
+
+        return ExtraFieldData(data[0], data[1])
+
+    def parse_extra_data_from_pcb(self):
+        field_set = set()
+        by_ref = {}
+        by_index = {}
+
+        for (i, f) in enumerate(self.footprints):
+            by_index[i] = f["props"]
+            ref_fields = by_ref.setdefault(f["ref"], {})
+
+            for k, v in f["props"].items():
+                field_set.add(k)
+                ref_fields[k] = v
+
+        return ExtraFieldData(list(field_set), by_ref, by_index)
+
+    def latest_extra_data(self, extra_dirs=None):
+        base_name = os.path.splitext(os.path.basename(self.file_name))[0]
+        extra_dirs.append(self.output_directory)
+        file_dir_name = os.path.dirname(self.file_name)
+        directories = [file_dir_name]
+        for dir in extra_dirs:
+            if not os.path.isabs(dir):
+                dir = os.path.join(file_dir_name, dir)
+            if os.path.exists(dir):
+                directories.append(dir)
+        return find_latest_schematic_data(base_name, directories)
+
+    def extra_data_file_filter(self):
+        return ("Netlist, xml and pcb files (*.net; *.xml; *.kicad_pcb)|"
+                "*.net;*.xml;*.kicad_pcb")
+
+    def parse_edges(self):
+        edges = []
+        bbox = BoundingBox()
+        for layer, drawing in self.board_drawings + self.footprint_drawings:
+            if layer != 'Edge.Cuts':
+                continue
+            edges.append(drawing)
+            if "text" not in drawing:
+                self.add_drawing_bounding_box(drawing, bbox)
+        return edges, bbox
+
+    def parse_drawings_on_layers(self, f_layer, b_layer):
+        front = []
+        back = []
+
+        for layer, drawing in self.board_drawings + self.footprint_drawings:
+            if layer == f_layer:
+                front.append(drawing)
+            elif layer == b_layer:
+                back.append(drawing)
+
+        return {
+            "F": front,
+            "B": back
+        }
+
+    def parse_tracks(self):
+        include_nets = self.config.include_nets
+        result = {}
+        for layer, tracks in self.tracks.items():
+            result[layer] = []
+            for track_dict, is_via in tracks:
+                if not include_nets and not is_via:
+                    track_dict = {k: v for k, v in track_dict.items()
+                                  if k != "net"}
+                result[layer].append(track_dict)
+        return result
+
+    def parse_zones(self):
+        if self.config.include_nets:
+            return self.zones
+        return {layer: [{k: v for k, v in zone.items() if k != "net"}
+                        for zone in zones]
+                for layer, zones in self.zones.items()}
+
+    def parse_footprints(self):
+        footprints = [f["pcbdata"] for f in self.footprints]
+        if self.config.include_nets:
+            return footprints
+        return [dict(footprint, pads=[
+                    {k: v for k, v in pad.items() if k != "net"}
+                    for pad in footprint["pads"]])
+                for footprint in footprints]
+
+    def parse_netlist(self):
+        if self.net_names:
+            return sorted(self.net_names.values())
+        return sorted(self.seen_nets)
+
+    def footprint_to_component(self, footprint, extra_fields):
+        # type: (dict, dict) -> Component
+        return Component(footprint["ref"],
+                         footprint["value"],
+                         footprint["name"],
+                         footprint["pcbdata"]["layer"],
+                         'Virtual' if footprint["virtual"] else 'Normal',
+                         extra_fields)
+
+    def parse(self):
+        # Get extra field data from netlist
+        field_set = set(self.config.show_fields)
+        field_set.discard("Value")
+        field_set.discard("Footprint")
+        need_extra_fields = (field_set or
+                             self.config.board_variant_whitelist or
+                             self.config.board_variant_blacklist or
+                             self.config.dnp_field)
+
+        if not self.config.extra_data_file and need_extra_fields:
+            self.config.extra_data_file = self.file_name
+            self.logger.warn('Assuming extra data file to be the pcb file '
+                             'since --extra-data-file was not specified.')
+
+        extra_field_data = None
+        if (self.config.extra_data_file and
+                os.path.isfile(self.config.extra_data_file)):
+            extra_field_data = self.parse_extra_data(
+                self.config.extra_data_file, self.config.normalize_field_case)
+
+        if extra_field_data is None and need_extra_fields:
+            raise ParsingException(
+                'Failed parsing %s' % self.config.extra_data_file)
+
+        title = self.title_block.get('title', '')
+        file_date = self.title_block.get('date', '')
+        if not file_date:
+            file_mtime = os.path.getmtime(self.file_name)
+            file_date = datetime.fromtimestamp(file_mtime).strftime(
+                '%Y-%m-%d %H:%M:%S')
+        pcb_file_name = os.path.basename(self.file_name)
+        if not title:
+            # remove .kicad_pcb extension
+            title = os.path.splitext(pcb_file_name)[0]
+        edges, bbox = self.parse_edges()
+        if not bbox.initialized():
+            self.logger.error('Please draw pcb outline on the edges '
+                              'layer on sheet or any footprint before '
+                              'generating BOM.')
+            return None, None
+
+        pcbdata = {
+            "edges_bbox": bbox.to_dict(),
+            "edges": edges,
+            "drawings": {
+                "silkscreen": self.parse_drawings_on_layers(
+                    'F.SilkS', 'B.SilkS'),
+                "fabrication": self.parse_drawings_on_layers(
+                    'F.Fab', 'B.Fab'),
+            },
+            "footprints": self.parse_footprints(),
+            "metadata": {
+                "title": title,
+                "revision": self.title_block.get('rev', ''),
+                "company": self.title_block.get('company', ''),
+                "date": file_date,
+                "variant": self.config.kicad_variant,
+            },
+            "bom": {},
+            "font_data": self.font_parser.get_parsed_font()
+        }
+        if self.config.include_tracks:
+            pcbdata["tracks"] = self.parse_tracks()
+            pcbdata["zones"] = self.parse_zones()
+        if self.config.include_nets:
+            pcbdata["nets"] = self.parse_netlist()
+
+        if extra_field_data and need_extra_fields:
+            extra_fields = extra_field_data.fields_by_index
+            if extra_fields:
+                extra_fields = extra_fields.values()
+
+            if extra_fields is None:
+                extra_fields = []
+                field_map = extra_field_data.fields_by_ref
+                warning_shown = False
+
+                for f in self.footprints:
+                    extra_fields.append(field_map.get(f["ref"], {}))
+                    if f["ref"] not in field_map:
+                        # Some components are on pcb but not in schematic data.
+                        # Show a warning about outdated extra data file.
+                        self.logger.warn(
+                            'Component %s is missing from schematic data.'
+                            % f["ref"])
+                        warning_shown = True
+
+                if warning_shown:
+                    self.logger.warn('Netlist/xml file is likely out of date.')
+        else:
+            extra_fields = [{}] * len(self.footprints)
+
+        components = [self.footprint_to_component(f, e)
+                      for (f, e) in zip(self.footprints, extra_fields)]
+
+        return pcbdata, components
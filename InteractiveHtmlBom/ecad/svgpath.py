@@ -12,7 +12,8 @@ from __future__ import division, absolute_import, print_function
 
 import re
 from cmath import exp
-from math import sqrt, cos, sin, acos, degrees, radians, pi
+from functools import lru_cache
+from math import sqrt, cos, sin, acos, atan2, hypot, degrees, radians, pi
 
 
 def clip(a, a_min, a_max):
@@ -343,6 +344,15 @@ UPPERCASE = set('MZLHVCSQTA')
 
 COMMAND_RE = re.compile("([MmZzLlHhVvCcSsQqTtAa])")
 FLOAT_RE = re.compile(r"[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?")
+TOKEN_RE = re.compile(
+    r"[MmZzLlHhVvCcSsQqTtAa]|[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?")
+
+CUBIC_BEZIER_WARNING = ('Encountered Cubic Bezier segment. '
+                        'It is currently not supported and will be replaced '
+                        'by a line segment.')
+QUADRATIC_BEZIER_WARNING = ('Encountered Quadratic Bezier segment. '
+                            'It is currently not supported and will be '
+                            'replaced by a line segment.')
 
 
 def _tokenize_path(path_def):
@@ -436,9 +446,7 @@ def parse_path(pathdef, logger, current_pos=0j):
             current_pos = pos
 
         elif command == 'C':
-            logger.warn('Encountered Cubic Bezier segment. '
-                        'It is currently not supported and will be replaced '
-                        'by a line segment.')
+            logger.warn(CUBIC_BEZIER_WARNING)
             for i in range(4):
                 # ignore control points
                 elements.pop()
@@ -451,9 +459,7 @@ def parse_path(pathdef, logger, current_pos=0j):
             current_pos = end
 
         elif command == 'S':
-            logger.warn('Encountered Quadratic Bezier segment. '
-                        'It is currently not supported and will be replaced '
-                        'by a line segment.')
+            logger.warn(QUADRATIC_BEZIER_WARNING)
             for i in range(2):
                 # ignore control points
                 elements.pop()
@@ -466,9 +472,7 @@ def parse_path(pathdef, logger, current_pos=0j):
             current_pos = end
 
         elif command == 'Q':
-            logger.warn('Encountered Quadratic Bezier segment. '
-                        'It is currently not supported and will be replaced '
-                        'by a line segment.')
+            logger.warn(QUADRATIC_BEZIER_WARNING)
             for i in range(2):
                 # ignore control points
                 elements.pop()
@@ -481,9 +485,7 @@ def parse_path(pathdef, logger, current_pos=0j):
             current_pos = end
 
         elif command == 'T':
-            logger.warn('Encountered Quadratic Bezier segment. '
-                        'It is currently not supported and will be replaced '
-                        'by a line segment.')
+            logger.warn(QUADRATIC_BEZIER_WARNING)
 
             end = float(elements.pop()) + float(elements.pop()) * 1j
 
@@ -510,6 +512,191 @@ def parse_path(pathdef, logger, current_pos=0j):
     return segments
 
 
+def _arc_bbox(x0, y0, rx, ry, rotation, large_arc, sweep, x1, y1):
+    """Same as Arc(...).bbox() but without creating the segment.
+
+    Extremes of the ellipse are found in closed form and kept if they lie
+    within the swept angle."""
+    if (x0 == x1 and y0 == y1) or rx == 0 or ry == 0:
+        # let Arc report degenerate arcs
+        Arc(x0 + y0 * 1j, rx + ry * 1j, rotation, large_arc, sweep,
+            x1 + y1 * 1j)
+    rx = abs(rx)
+    ry = abs(ry)
+    large_arc = bool(large_arc)
+    sweep = bool(sweep)
+    if rotation:
+        phi = radians(rotation)
+        cosphi = cos(phi)
+        sinphi = sin(phi)
+    else:
+        cosphi = 1.0
+        sinphi = 0.0
+
+    # Start point in the coordinate system aligned with ellipse axes,
+    # see Arc._parameterize() for the derivation
+    dx = (x0 - x1) / 2
+    dy = (y0 - y1) / 2
+    x1p = cosphi * dx + sinphi * dy
+    y1p = cosphi * dy - sinphi * dx
+    radius_check = (x1p * x1p) / (rx * rx) + (y1p * y1p) / (ry * ry)
+    if radius_check > 1:
+        rx *= sqrt(radius_check)
+        ry *= sqrt(radius_check)
+    rx_sqd = rx * rx
+    ry_sqd = ry * ry
+    tmp = rx_sqd * y1p * y1p + ry_sqd * x1p * x1p
+    radicand = (rx_sqd * ry_sqd - tmp) / tmp
+    radical = sqrt(radicand) if radicand > 0 else 0
+    if large_arc == sweep:
+        radical = -radical
+    cxp = radical * rx * y1p / ry
+    cyp = -radical * ry * x1p / rx
+    cx = cosphi * cxp - sinphi * cyp + (x0 + x1) / 2
+    cy = sinphi * cxp + cosphi * cyp + (y0 + y1) / 2
+
+    # Start and end directions on the unit circle, the arc sweeps delta
+    # degrees starting at theta
+    u1x = (x1p - cxp) / rx
+    u1y = (y1p - cyp) / ry
+    u2x = (-x1p - cxp) / rx
+    u2y = (-y1p - cyp) / ry
+    if u1y == 0:
+        theta = 0 if u1x > 0 else 180
+    else:
+        theta = degrees(atan2(u1y, u1x))
+    det_uv = u1x * u2y - u1y * u2x
+    dot_uv = u1x * u2x + u1y * u2y
+    if det_uv == 0:
+        delta = 0 if dot_uv > 0 else 180
+    else:
+        delta = degrees(atan2(det_uv, dot_uv))
+    if not sweep and delta >= 0:
+        delta -= 360
+    elif large_arc and delta <= 0:
+        delta += 360
+    if delta < 0:
+        theta += delta
+        delta = -delta
+
+    xmin, xmax = (x0, x1) if x0 < x1 else (x1, x0)
+    ymin, ymax = (y0, y1) if y0 < y1 else (y1, y0)
+    # x(a) = cx + rx*cos(phi)*cos(a) - ry*sin(phi)*sin(a)
+    #      = cx + hypot(rx*cos(phi), ry*sin(phi))*cos(a - atan_x)
+    # is largest at atan_x and smallest at atan_x + 180, same for y(a)
+    atan_x = degrees(atan2(-ry * sinphi, rx * cosphi))
+    atan_y = degrees(atan2(ry * cosphi, rx * sinphi))
+    if (atan_x - theta) % 360 <= delta:
+        xmax = max(xmax, cx + hypot(rx * cosphi, ry * sinphi))
+    if (atan_x + 180 - theta) % 360 <= delta:
+        xmin = min(xmin, cx - hypot(rx * cosphi, ry * sinphi))
+    if (atan_y - theta) % 360 <= delta:
+        ymax = max(ymax, cy + hypot(rx * sinphi, ry * cosphi))
+    if (atan_y + 180 - theta) % 360 <= delta:
+        ymin = min(ymin, cy - hypot(rx * sinphi, ry * cosphi))
+    return xmin, xmax, ymin, ymax
+
+
+@lru_cache(maxsize=1 << 14)
+def _path_bbox(pathdef):
+    tokens = TOKEN_RE.findall(pathdef)
+    count = len(tokens)
+    xmin = xmax = ymin = ymax = None
+    warnings = []
+    x = y = 0.0
+    start = None
+    command = None
+    absolute = False
+    i = 0
+
+    while i < count:
+        token = tokens[i]
+        if token in COMMANDS:
+            i += 1
+            absolute = token in UPPERCASE
+            command = token.upper()
+        elif command is None:
+            raise ValueError(
+                "Unallowed implicit command in %s, position %s" % (
+                    pathdef, len(pathdef.split()) - (count - i)))
+
+        if command == 'M':
+            nx, ny = map(float, tokens[i:i + 2])
+            i += 2
+            if absolute:
+                x, y = nx, ny
+            else:
+                x, y = x + nx, y + ny
+            start = (x, y)
+            command = 'L'
+            continue
+        elif command == 'Z':
+            if (x, y) == start:
+                command = None
+                continue
+            nx, ny = start
+            command = None
+            sx0, sx1 = (x, nx) if x < nx else (nx, x)
+            sy0, sy1 = (y, ny) if y < ny else (ny, y)
+        elif command == 'A':
+            rx, ry, rotation, large_arc, sweep, nx, ny = \
+                map(float, tokens[i:i + 7])
+            i += 7
+            if not absolute:
+                nx, ny = nx + x, ny + y
+            sx0, sx1, sy0, sy1 = _arc_bbox(x, y, rx, ry, rotation,
+                                           large_arc, sweep, nx, ny)
+        else:
+            if command == 'H':
+                nx = float(tokens[i])
+                ny = y if absolute else 0.0
+                i += 1
+            elif command == 'V':
+                nx = x if absolute else 0.0
+                ny = float(tokens[i])
+                i += 1
+            else:
+                if command != 'L':
+                    warnings.append(CUBIC_BEZIER_WARNING if command == 'C'
+                                    else QUADRATIC_BEZIER_WARNING)
+                    # control points are ignored
+                    i += {'C': 4, 'S': 2, 'Q': 2}.get(command, 0)
+                nx, ny = map(float, tokens[i:i + 2])
+                i += 2
+            if not absolute:
+                nx, ny = nx + x, ny + y
+            sx0, sx1 = (x, nx) if x < nx else (nx, x)
+            sy0, sy1 = (y, ny) if y < ny else (ny, y)
+        x, y = nx, ny
+
+        if xmin is None:
+            xmin, xmax, ymin, ymax = sx0, sx1, sy0, sy1
+            continue
+        if sx0 < xmin:
+            xmin = sx0
+        if sx1 > xmax:
+            xmax = sx1
+        if sy0 < ymin:
+            ymin = sy0
+        if sy1 > ymax:
+            ymax = sy1
+    bbox = None if xmin is None else (xmin, xmax, ymin, ymax)
+    return bbox, tuple(warnings)
+
+
+def path_bbox(pathdef, logger):
+    """Returns bounding box of the path in the form (xmin, xmax, ymin, ymax)
+    or None if the path has no segments.
+
+    Gives the same result as combining bbox() of parse_path() segments but
+    scans the path once and does not create segment objects. Results are
+    cached by path string."""
+    bbox, warnings = _path_bbox(pathdef)
+    for warning in warnings:
+        logger.warn(warning)
+    return bbox
+
+
 def create_path(lines, circles=[]):
     """Returns a path d-string."""
 
@@ -2,8 +2,12 @@
 from __future__ import absolute_import
 
 import argparse
+import glob
+import io
 import os
+import re
 import sys
+import time
 
 # Add ../ to the path
 # Works if this script is executed without installing the module
@@ -23,50 +27,96 @@ def to_utf(s):
         return s
 
 
-def main():
-    from .compat import get_wx, should_create_wx_app
-    wx = get_wx()
-    create_wx_app = should_create_wx_app()
+BOARD_EXTENSIONS = ['.kicad_pcb', '.json', '.fbrd', '.brd']
+MANIFEST_EXTENSIONS = ['.txt', '.lst']
+# Default bom name format in batch mode, one bom per board file
+BATCH_NAME_FORMAT = '%f'
 
-    if wx is None and create_wx_app:
-        print("wxpython is required unless INTERACTIVE_HTML_BOM_NO_DISPLAY "
-              "environment variable is set")
-        sys.exit(1)
 
-    if wx is not None:
-        if create_wx_app:
-            app = wx.App()
-            if hasattr(wx, "APP_ASSERT_SUPPRESS"):
-                app.SetAssertMode(wx.APP_ASSERT_SUPPRESS)
-        elif hasattr(wx, "DisableAsserts"):
-            wx.DisableAsserts()
+def _extension(path):
+    return os.path.splitext(path)[1].lower()
 
-    from .core import ibom
+
+def get_batch_files(path):
+    # type: (str) -> list | None
+    """Expands batch input into a list of board files.
+
+    Input can be a directory (all board files directly inside it), a
+    manifest file (.txt or .lst) listing one board file per line or a glob
+    pattern (recursive ** is supported) that is not an existing path.
+    Relative paths in the manifest are resolved against the manifest's
+    directory, empty lines and lines starting with # are ignored.
+
+    Returns None if path is a single board file.
+    """
+    if os.path.isdir(path):
+        files = [os.path.join(path, f) for f in sorted(os.listdir(path))]
+        return [f for f in files if os.path.isfile(f) and
+                _extension(f) in BOARD_EXTENSIONS]
+    if os.path.isfile(path):
+        if _extension(path) not in MANIFEST_EXTENSIONS:
+            return None
+        manifest_dir = os.path.dirname(os.path.abspath(path))
+        files = []
+        with io.open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                files.append(os.path.join(manifest_dir, line))
+        return files
+    if glob.has_magic(path):
+        return sorted(f for f in glob.glob(path, recursive=True)
+                      if os.path.isfile(f))
+    return None
+
+
+def get_arg_parser():
     from .core.config import Config
-    from .ecad import get_parser_by_extension
     from .version import version
-    from .errors import (ExitCodes, ParsingException, exit_error)
-
 
     parser = argparse.ArgumentParser(
             description='KiCad InteractiveHtmlBom plugin CLI.',
             formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     parser.add_argument('file',
                         type=lambda s: to_utf(s),
-                        help="KiCad PCB file")
+                        help="KiCad PCB file. A directory, glob pattern or "
+                             "manifest file (.txt or .lst) listing one board "
+                             "file per line runs in batch mode. In batch "
+                             "mode boms are named after their board files "
+                             "unless --name-format is given.")
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Number of worker processes in batch mode. '
+                             '0 means number of CPUs.')
 
     Config.add_options(parser, version)
-    logger = ibom.Logger(cli=True)
+    return parser
+
+
+def parse_board_args(file_name, argv, logger, batch=False):
+    # type: (str, list, ibom.Logger, bool) -> tuple
+    """Returns (config, args) for a single board file, exits on error.
+
+    In batch mode bom name format defaults to BATCH_NAME_FORMAT so that
+    boards sharing a directory do not overwrite each other's bom.
+    """
+    from .core.config import Config
+    from .version import version
+    from .errors import (ExitCodes, exit_error)
+
+    parser = get_arg_parser()
+    if batch:
+        parser.set_defaults(name_format=BATCH_NAME_FORMAT)
 
-    # First pass over the arguments to find the pcb file and --use-ini.
-    pre_args, _ = parser.parse_known_args()
+    # First pass over the arguments to find --use-ini.
+    pre_args, _ = parser.parse_known_args(argv)
 
-    if not os.path.isfile(pre_args.file):
+    if not os.path.isfile(file_name):
         exit_error(logger, ExitCodes.ERROR_FILE_NOT_FOUND,
-                   "File %s does not exist." % pre_args.file)
+                   "File %s does not exist." % file_name)
 
     config = Config(version,
-                    os.path.dirname(os.path.abspath(pre_args.file)))
+                    os.path.dirname(os.path.abspath(file_name)))
 
     # With --use-ini the ini values are installed as parser defaults before
     # the final parse: options given on the command line override the ini
@@ -79,14 +129,27 @@ def main():
         else:
             parser.set_defaults(**ini_defaults)
 
-    args = parser.parse_args()
+    return config, parser.parse_args(argv)
 
-    print("Loading %s" % args.file)
+
+def generate(file_name, argv, logger, create_wx_app, batch=False):
+    # type: (str, list, ibom.Logger, bool, bool) -> None
+    """Generates bom for a single board file, exits on error."""
+    from .core import ibom
+    from .ecad import get_parser_by_extension
+    from .errors import (ExitCodes, ParsingException, exit_error)
+
+    config, args = parse_board_args(file_name, argv, logger, batch)
+
+    print("Loading %s" % file_name)
 
     config.kicad_variant = args.kicad_variant
 
-    parser = get_parser_by_extension(
-        os.path.abspath(args.file), config, logger)
+    try:
+        parser = get_parser_by_extension(
+            os.path.abspath(file_name), config, logger)
+    except ParsingException as e:
+        exit_error(logger, ExitCodes.ERROR_PARSE, str(e))
 
     if args.show_dialog:
         if not create_wx_app:
@@ -99,12 +162,145 @@ def main():
             exit_error(logger, ExitCodes.ERROR_PARSE, e)
     else:
         config.set_from_args(args)
+        if batch:
+            # Do not spawn a browser tab per board.
+            config.open_browser = False
         try:
             ibom.main(parser, config, logger)
         except ParsingException as e:
             exit_error(logger, ExitCodes.ERROR_PARSE, str(e))
-    return 0
+
+
+_batch_logger = None
+
+
+def _init_batch_worker():
+    from .core import ibom
+    global _batch_logger
+    _batch_logger = ibom.Logger(cli=True)
+
+
+def _run_batch_job(job):
+    # type: (tuple) -> tuple
+    """Pool worker, returns (file name, exit code, run time in seconds)."""
+    import traceback
+
+    file_name, argv = job
+    start = time.time()
+    code = 0
+    try:
+        generate(file_name, argv, _batch_logger, False, batch=True)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except Exception:
+        _batch_logger.error('Failed to generate bom for %s:\n%s' %
+                            (file_name, traceback.format_exc()))
+        code = 1
+    return file_name, code, time.time() - start
+
+
+def find_output_collisions(files, argv, logger):
+    # type: (list, list, ibom.Logger) -> list
+    """
+    Returns lists of board files that would write the same bom file. Name
+    formats using pcb metadata are only known after parsing, boards with
+    such names are not checked.
+    """
+    from .core import ibom
+
+    metadata = {'title': '', 'company': '', 'revision': '', 'date': ''}
+    outputs = {}
+    for file_name in files:
+        if not os.path.isfile(file_name):
+            # reported by the job of the file
+            continue
+        config, args = parse_board_args(file_name, argv, logger, batch=True)
+        if re.search('%[pcrdvV]', args.name_format):
+            continue
+        config.bom_dest_dir = args.dest_dir
+        config.bom_name_format = args.name_format
+        bom_file_name = ibom.get_bom_file_name(
+            config, os.path.dirname(os.path.abspath(file_name)),
+            os.path.basename(file_name), metadata)
+        key = os.path.normcase(os.path.normpath(bom_file_name))
+        outputs.setdefault(key, []).append(file_name)
+    return [f for f in outputs.values() if len(f) > 1]
+
+
+def run_batch(files, jobs, argv, logger):
+    # type: (list, int, list, ibom.Logger) -> int
+    """Generates boms for all files in a process pool and prints a summary.
+    :return: 0 if all boms were generated, ExitCodes.ERROR_BATCH otherwise.
+    """
+    import multiprocessing
+    from .errors import ExitCodes
+
+    jobs = jobs or multiprocessing.cpu_count()
+    jobs = min(jobs, len(files))
+    logger.info("Generating %d boms using %d processes", len(files), jobs)
+
+    start = time.time()
+    with multiprocessing.Pool(jobs, initializer=_init_batch_worker) as pool:
+        results = pool.map(_run_batch_job, [(f, argv) for f in files],
+                           chunksize=1)
+    total_time = time.time() - start
+
+    failed = [r for r in results if r[1] != 0]
+    print("\nBatch summary:")
+    print("%-6s %9s  %s" % ("Code", "Time, s", "File"))
+    for file_name, code, run_time in results:
+        print("%-6d %9.2f  %s" % (code, run_time, file_name))
+    print("%d boms generated, %d failed in %.2f s" %
+          (len(results) - len(failed), len(failed), total_time))
+
+    return ExitCodes.ERROR_BATCH if failed else 0
+
+
+def main():
+    from .compat import get_wx, should_create_wx_app
+    wx = get_wx()
+    create_wx_app = should_create_wx_app()
+
+    if wx is None and create_wx_app:
+        print("wxpython is required unless INTERACTIVE_HTML_BOM_NO_DISPLAY "
+              "environment variable is set")
+        sys.exit(1)
+
+    if wx is not None:
+        if create_wx_app:
+            app = wx.App()
+            if hasattr(wx, "APP_ASSERT_SUPPRESS"):
+                app.SetAssertMode(wx.APP_ASSERT_SUPPRESS)
+        elif hasattr(wx, "DisableAsserts"):
+            wx.DisableAsserts()
+
+    from .core import ibom
+    from .errors import (ExitCodes, exit_error)
+
+    logger = ibom.Logger(cli=True)
+    argv = sys.argv[1:]
+    args, _ = get_arg_parser().parse_known_args(argv)
+
+    batch_files = get_batch_files(args.file)
+    if batch_files is None:
+        generate(args.file, argv, logger, create_wx_app)
+        return 0
+
+    if args.show_dialog:
+        exit_error(logger, ExitCodes.ERROR_BATCH,
+                   "Can not show dialog in batch mode.")
+    if not batch_files:
+        exit_error(logger, ExitCodes.ERROR_FILE_NOT_FOUND,
+                   "No board files found in %s." % args.file)
+    collisions = find_output_collisions(batch_files, argv, logger)
+    if collisions:
+        exit_error(logger, ExitCodes.ERROR_BATCH,
+                   "Boms of these boards would overwrite each other, use "
+                   "--name-format or --dest-dir to give them different "
+                   "names:\n" +
+                   "\n".join(", ".join(f) for f in collisions))
+    return run_batch(batch_files, args.jobs, argv, logger)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -917,10 +917,10 @@ function populateMetadata() {
       if (pad.type == "th") {
         pads_th++;
       } else {
-        if (pad.layers.includes("F")) {
+        if (padOnLayer(mod, pad, "F")) {
           pads_f++;
         }
-        if (pad.layers.includes("B")) {
+        if (padOnLayer(mod, pad, "B")) {
           pads_b++;
         }
       }
@@ -1300,7 +1300,10 @@ function topToggle() {
   }
 }
 
-window.onload = function (e) {
+function initPage() {
+  unpackGeometry();
+  initFootprintTemplates();
+  initNetIndices();
   initRender();
   initStorage();
   initDefaults();
@@ -1327,5 +1330,28 @@ window.onload = function (e) {
   });
 }
 
+function showLoadError(err) {
+  var div = document.createElement("div");
+  div.style.padding = "1em";
+  div.style.color = "red";
+  div.textContent = "Failed to load pcb data: " + err;
+  document.body.insertBefore(div, document.body.firstChild);
+}
+
+window.onload = function (e) {
+  if (typeof pcbdataPromise !== "undefined") {
+    // pcbdata is decompressed asynchronously
+    pcbdataPromise.then((data) => {
+      pcbdata = data;
+      initPage();
+    }).catch((err) => {
+      console.error(err);
+      showLoadError(err);
+    });
+  } else {
+    initPage();
+  }
+}
+
 window.onresize = resizeAll;
 window.matchMedia("print").addListener(resizeAll);
@@ -0,0 +1,198 @@
+/* Decoder for deflate compressed pcbdata */
+
+function base64ToBytes(str) {
+  var bin = atob(str);
+  var bytes = new Uint8Array(bin.length);
+  for (var i = 0; i < bin.length; i++) {
+    bytes[i] = bin.charCodeAt(i);
+  }
+  return bytes;
+}
+
+function asciiBytesToString(bytes) {
+  var parts = [];
+  for (var i = 0; i < bytes.length; i += 0x8000) {
+    parts.push(String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000)));
+  }
+  return parts.join("");
+}
+
+/*
+ * Minimal zlib stream decoder (RFC 1950/1951) used when the browser does not
+ * support DecompressionStream. Adler-32 checksum is not verified.
+ */
+var inflate = (function () {
+  var LENGTH_BASE = [
+    3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31,
+    35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258];
+  var LENGTH_EXTRA = [
+    0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2,
+    3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0];
+  var DIST_BASE = [
+    1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193,
+    257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145,
+    8193, 12289, 16385, 24577];
+  var DIST_EXTRA = [
+    0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6,
+    7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13];
+  var CODE_LENGTH_ORDER = [
+    16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14, 1, 15];
+
+  // Canonical huffman tree as code counts per length and sorted symbols.
+  function buildTree(lengths) {
+    var counts = new Uint16Array(16);
+    var offsets = new Uint16Array(16);
+    var symbols = new Uint16Array(lengths.length);
+    for (var i = 0; i < lengths.length; i++) counts[lengths[i]]++;
+    counts[0] = 0;
+    for (var len = 1; len < 15; len++) {
+      offsets[len + 1] = offsets[len] + counts[len];
+    }
+    for (var i = 0; i < lengths.length; i++) {
+      if (lengths[i]) symbols[offsets[lengths[i]]++] = i;
+    }
+    return { counts: counts, symbols: symbols };
+  }
+
+  var fixedLitTree, fixedDistTree;
+
+  function fixedTrees() {
+    if (!fixedLitTree) {
+      var lengths = new Uint8Array(288);
+      lengths.fill(8, 0, 144);
+      lengths.fill(9, 144, 256);
+      lengths.fill(7, 256, 280);
+      lengths.fill(8, 280, 288);
+      fixedLitTree = buildTree(lengths);
+      fixedDistTree = buildTree(new Uint8Array(30).fill(5));
+    }
+    return [fixedLitTree, fixedDistTree];
+  }
+
+  return function (data) {
+    var pos = 2; // skip zlib header
+    var bitBuf = 0;
+    var bitCnt = 0;
+    var out = new Uint8Array(Math.max(data.length * 4, 1024));
+    var outLen = 0;
+
+    function bits(n) {
+      while (bitCnt < n) {
+        if (pos >= data.length) throw new Error("Unexpected end of data");
+        bitBuf |= data[pos++] << bitCnt;
+        bitCnt += 8;
+      }
+      var v = bitBuf & ((1 << n) - 1);
+      bitBuf >>>= n;
+      bitCnt -= n;
+      return v;
+    }
+
+    function decodeSymbol(tree) {
+      var code = 0, first = 0, index = 0;
+      for (var len = 1; len < 16; len++) {
+        code |= bits(1);
+        var count = tree.counts[len];
+        if (code - first < count) return tree.symbols[index + code - first];
+        index += count;
+        first = (first + count) << 1;
+        code <<= 1;
+      }
+      throw new Error("Invalid huffman code");
+    }
+
+    function reserve(n) {
+      if (outLen + n <= out.length) return;
+      var grown = new Uint8Array(Math.max(out.length * 2, outLen + n));
+      grown.set(out.subarray(0, outLen));
+      out = grown;
+    }
+
+    function dynamicTrees() {
+      var hlit = bits(5) + 257;
+      var hdist = bits(5) + 1;
+      var hclen = bits(4) + 4;
+      var codeLengths = new Uint8Array(19);
+      for (var i = 0; i < hclen; i++) {
+        codeLengths[CODE_LENGTH_ORDER[i]] = bits(3);
+      }
+      var codeTree = buildTree(codeLengths);
+      var lengths = new Uint8Array(hlit + hdist);
+      for (var i = 0; i < hlit + hdist;) {
+        var sym = decodeSymbol(codeTree);
+        if (sym < 16) {
+          lengths[i++] = sym;
+        } else {
+          var value = 0, repeat;
+          if (sym == 16) {
+            value = lengths[i - 1];
+            repeat = 3 + bits(2);
+          } else if (sym == 17) {
+            repeat = 3 + bits(3);
+          } else {
+            repeat = 11 + bits(7);
+          }
+          lengths.fill(value, i, i + repeat);
+          i += repeat;
+        }
+      }
+      return [
+        buildTree(lengths.subarray(0, hlit)),
+        buildTree(lengths.subarray(hlit))
+      ];
+    }
+
+    var last = 0;
+    while (!last) {
+      last = bits(1);
+      var type = bits(2);
+      if (type == 0) {
+        // stored block, skip to byte boundary
+        bitBuf = 0;
+        bitCnt = 0;
+        var len = data[pos] | (data[pos + 1] << 8);
+        pos += 4;
+        reserve(len);
+        out.set(data.subarray(pos, pos + len), outLen);
+        outLen += len;
+        pos += len;
+        continue;
+      }
+      if (type == 3) throw new Error("Invalid block type");
+      var trees = type == 1 ? fixedTrees() : dynamicTrees();
+      while (true) {
+        var sym = decodeSymbol(trees[0]);
+        if (sym < 256) {
+          reserve(1);
+          out[outLen++] = sym;
+        } else if (sym == 256) {
+          break;
+        } else {
+          sym -= 257;
+          var length = LENGTH_BASE[sym] + bits(LENGTH_EXTRA[sym]);
+          var distSym = decodeSymbol(trees[1]);
+          var dist = DIST_BASE[distSym] + bits(DIST_EXTRA[distSym]);
+          reserve(length);
+          for (var i = 0; i < length; i++, outLen++) {
+            out[outLen] = out[outLen - dist];
+          }
+        }
+      }
+    }
+    return out.subarray(0, outLen);
+  }
+})();
+
+function decompressPcbdata(base64data) {
+  // Errors thrown by either decoder reject the returned promise
+  return new Promise((resolve) => {
+    var bytes = base64ToBytes(base64data);
+    if (typeof DecompressionStream !== "undefined") {
+      var stream = new Blob([bytes]).stream()
+        .pipeThrough(new DecompressionStream("deflate"));
+      resolve(new Response(stream).text().then(JSON.parse));
+    } else {
+      resolve(JSON.parse(asciiBytesToString(inflate(bytes))));
+    }
+  });
+}
@@ -135,6 +135,14 @@ function drawedge(ctx, scalefactor, edge, color) {
       ctx.moveTo(...edge.start);
       ctx.lineTo(...edge.end);
     }
+    if (edge.type == "segments") {
+      // packed geometry, coords are [x1, y1, x2, y2, ...]
+      var c = edge.coords;
+      for (var i = 0; i < c.length; i += 4) {
+        ctx.moveTo(c[i], c[i + 1]);
+        ctx.lineTo(c[i + 2], c[i + 3]);
+      }
+    }
     if (edge.type == "rect") {
       ctx.moveTo(...edge.start);
       ctx.lineTo(edge.start[0], edge.end[1]);
@@ -220,12 +228,26 @@ function getPolygonsPath(shape) {
     shape.path2d = new Path2D(shape.svgpath);
   } else {
     var path = new Path2D();
-    for (var polygon of shape.polygons) {
-      path.moveTo(...polygon[0]);
-      for (var i = 1; i < polygon.length; i++) {
-        path.lineTo(...polygon[i]);
+    if ("points" in shape.polygons) {
+      // packed geometry
+      var points = shape.polygons.points;
+      var j = 0;
+      for (var length of shape.polygons.lengths) {
+        path.moveTo(points[j], points[j + 1]);
+        for (var i = 1; i < length; i++) {
+          path.lineTo(points[j + 2 * i], points[j + 2 * i + 1]);
+        }
+        path.closePath();
+        j += 2 * length;
+      }
+    } else {
+      for (var polygon of shape.polygons) {
+        path.moveTo(...polygon[0]);
+        for (var i = 1; i < polygon.length; i++) {
+          path.lineTo(...polygon[i]);
+        }
+        path.closePath();
       }
-      path.closePath();
     }
     shape.path2d = path;
   }
@@ -252,7 +274,7 @@ function drawPolygonShape(ctx, scalefactor, shape, color) {
 }
 
 function drawDrawing(ctx, scalefactor, drawing, color) {
-  if (["segment", "arc", "circle", "curve", "rect"].includes(drawing.type)) {
+  if (["segment", "segments", "arc", "circle", "curve", "rect"].includes(drawing.type)) {
     drawedge(ctx, scalefactor, drawing, color);
   } else if (drawing.type == "polygon") {
     drawPolygonShape(ctx, scalefactor, drawing, color);
@@ -323,6 +345,56 @@ function drawPadHole(ctx, pad, padHoleColor) {
   ctx.restore();
 }
 
+var netIndices = null;
+
+function initNetIndices() {
+  // Geometry refers to nets by index in pcbdata.nets, see DATAFORMAT.md
+  if (!pcbdata.indexed_nets) return;
+  netIndices = {};
+  pcbdata.nets.forEach((net, i) => netIndices[net] = i);
+}
+
+function geometryNet(net) {
+  // Converts net name to the form used by tracks, zones and pads. Nets that
+  // are not in pcbdata.nets map to -1 which matches no geometry, undefined
+  // would loosely equal geometry without a net.
+  if (!netIndices || net === null) return net;
+  return netIndices.hasOwnProperty(net) ? netIndices[net] : -1;
+}
+
+function netName(net) {
+  // Inverse of geometryNet()
+  return netIndices && typeof net === "number" ? pcbdata.nets[net] : net;
+}
+
+function getNetColor(net, defaultColor) {
+  return settings.netColors[netName(net)] || defaultColor;
+}
+
+function padOnLayer(footprint, pad, layer) {
+  // Template pads of mirrored footprints are on the opposite side
+  if (footprint.transform && footprint.transform[3]) {
+    layer = layer == "F" ? "B" : "F";
+  }
+  return pad.layers.includes(layer);
+}
+
+function getPadNet(footprint, index) {
+  return footprint.nets ? footprint.nets[index] : footprint.pads[index].net;
+}
+
+function applyFootprintTransform(ctx, footprint) {
+  // Template pads are in footprint local coordinates
+  if (footprint.transform) {
+    var [x, y, angle, mirror] = footprint.transform;
+    ctx.translate(x, y);
+    ctx.rotate(-deg2rad(angle));
+    if (mirror) {
+      ctx.scale(-1, 1);
+    }
+  }
+}
+
 function drawFootprint(ctx, layer, scalefactor, footprint, colors, highlight, outline) {
   if (highlight) {
     // draw bounding box
@@ -350,8 +422,10 @@ function drawFootprint(ctx, layer, scalefactor, footprint, colors, highlight, ou
   ctx.lineWidth = 3 / scalefactor;
   // draw pads
   if (settings.renderPads) {
+    ctx.save();
+    applyFootprintTransform(ctx, footprint);
     for (var pad of footprint.pads) {
-      if (pad.layers.includes(layer)) {
+      if (padOnLayer(footprint, pad, layer)) {
         drawPad(ctx, pad, colors.pad, outline);
         if (pad.pin1 &&
           (settings.highlightpin1 == "all" ||
@@ -363,6 +437,7 @@ function drawFootprint(ctx, layer, scalefactor, footprint, colors, highlight, ou
     for (var pad of footprint.pads) {
       drawPadHole(ctx, pad, colors.padHole);
     }
+    ctx.restore();
   }
 }
 
@@ -421,9 +496,88 @@ function drawBgLayer(layername, canvas, layer, scalefactor, edgeColor, polygonCo
   }
 }
 
+function drawPackedTracks(ctx, tracks, defaultColor, highlight) {
+  var segments = tracks.segments;
+  var arcs = tracks.arcs;
+  var netOf = (group, i) => group.net ? group.net[i] : undefined;
+  var hlNet = geometryNet(highlightedNet);
+  var setStyle = (group, i) => {
+    var net = netOf(group, i);
+    ctx.strokeStyle = highlight ? defaultColor : getNetColor(net, defaultColor);
+    ctx.lineWidth = group.width[i];
+  }
+  var hasHole = (i) => {
+    var c = segments.coords;
+    return segments.drillsize && segments.drillsize[i] > 0 &&
+      c[4 * i] == c[4 * i + 2] && c[4 * i + 1] == c[4 * i + 3];
+  }
+
+  // First draw tracks and tented vias
+  for (var i = 0; i < arcs.width.length; i++) {
+    if (highlight && hlNet != netOf(arcs, i)) continue;
+    var c = arcs.coords;
+    setStyle(arcs, i);
+    ctx.beginPath();
+    ctx.arc(c[5 * i], c[5 * i + 1], c[5 * i + 2],
+      deg2rad(c[5 * i + 3]), deg2rad(c[5 * i + 4]));
+    ctx.stroke();
+  }
+  var polylines = tracks.polylines;
+  for (var i = 0, j = 0; polylines && i < polylines.width.length; i++) {
+    var c = polylines.coords;
+    var length = polylines.lengths[i];
+    j += 2 * length;
+    if (highlight && hlNet != netOf(polylines, i)) continue;
+    setStyle(polylines, i);
+    ctx.beginPath();
+    var k = j - 2 * length;
+    ctx.moveTo(c[k], c[k + 1]);
+    for (k += 2; k < j; k += 2) {
+      ctx.lineTo(c[k], c[k + 1]);
+    }
+    ctx.stroke();
+  }
+  for (var i = 0; i < segments.width.length; i++) {
+    if (highlight && hlNet != netOf(segments, i)) continue;
+    if (hasHole(i)) continue;
+    var c = segments.coords;
+    setStyle(segments, i);
+    ctx.beginPath();
+    ctx.moveTo(c[4 * i], c[4 * i + 1]);
+    ctx.lineTo(c[4 * i + 2], c[4 * i + 3]);
+    ctx.stroke();
+  }
+  // Second pass to draw untented vias
+  if (!segments.drillsize) return;
+  var style = getComputedStyle(topmostdiv);
+  var holeColor = style.getPropertyValue('--pad-hole-color')
+
+  for (var i = 0; i < segments.width.length; i++) {
+    if (highlight && hlNet != netOf(segments, i)) continue;
+    if (!hasHole(i)) continue;
+    var c = segments.coords;
+    setStyle(segments, i);
+    ctx.beginPath();
+    ctx.moveTo(c[4 * i], c[4 * i + 1]);
+    ctx.lineTo(c[4 * i + 2], c[4 * i + 3]);
+    ctx.stroke();
+    ctx.strokeStyle = holeColor;
+    ctx.lineWidth = segments.drillsize[i];
+    ctx.lineTo(c[4 * i + 2], c[4 * i + 3]);
+    ctx.stroke();
+  }
+}
+
 function drawTracks(canvas, layer, defaultColor, highlight) {
   ctx = canvas.getContext("2d");
   ctx.lineCap = "round";
+  ctx.lineJoin = "round";
+
+  if (!Array.isArray(pcbdata.tracks[layer])) {
+    drawPackedTracks(ctx, pcbdata.tracks[layer], defaultColor, highlight);
+    return;
+  }
+  var hlNet = geometryNet(highlightedNet);
 
   var hasHole = (track) => (
     'drillsize' in track &&
@@ -432,9 +586,9 @@ function drawTracks(canvas, layer, defaultColor, highlight) {
 
   // First draw tracks and tented vias
   for (var track of pcbdata.tracks[layer]) {
-    if (highlight && highlightedNet != track.net) continue;
+    if (highlight && hlNet != track.net) continue;
     if (!hasHole(track)) {
-      ctx.strokeStyle = highlight ? defaultColor : settings.netColors[track.net] || defaultColor;
+      ctx.strokeStyle = highlight ? defaultColor : getNetColor(track.net, defaultColor);
       ctx.lineWidth = track.width;
       ctx.beginPath();
       if ('radius' in track) {
@@ -443,6 +597,11 @@ function drawTracks(canvas, layer, defaultColor, highlight) {
           track.radius,
           deg2rad(track.startangle),
           deg2rad(track.endangle));
+      } else if ('points' in track) {
+        ctx.moveTo(...track.points[0]);
+        for (var i = 1; i < track.points.length; i++) {
+          ctx.lineTo(...track.points[i]);
+        }
       } else {
         ctx.moveTo(...track.start);
         ctx.lineTo(...track.end);
@@ -455,9 +614,9 @@ function drawTracks(canvas, layer, defaultColor, highlight) {
   var holeColor = style.getPropertyValue('--pad-hole-color')
 
   for (var track of pcbdata.tracks[layer]) {
-    if (highlight && highlightedNet != track.net) continue;
+    if (highlight && hlNet != track.net) continue;
     if (hasHole(track)) {
-      ctx.strokeStyle = highlight ? defaultColor : settings.netColors[track.net] || defaultColor;
+      ctx.strokeStyle = highlight ? defaultColor : getNetColor(track.net, defaultColor);
       ctx.lineWidth = track.width;
       ctx.beginPath();
       ctx.moveTo(...track.start);
@@ -474,10 +633,11 @@ function drawTracks(canvas, layer, defaultColor, highlight) {
 function drawZones(canvas, layer, defaultColor, highlight) {
   ctx = canvas.getContext("2d");
   ctx.lineJoin = "round";
+  var hlNet = geometryNet(highlightedNet);
   for (var zone of pcbdata.zones[layer]) {
-    if (highlight && highlightedNet != zone.net) continue;
-    ctx.strokeStyle = highlight ? defaultColor : settings.netColors[zone.net] || defaultColor;
-    ctx.fillStyle = highlight ? defaultColor : settings.netColors[zone.net] || defaultColor;
+    if (highlight && hlNet != zone.net) continue;
+    ctx.strokeStyle = highlight ? defaultColor : getNetColor(zone.net, defaultColor);
+    ctx.fillStyle = highlight ? defaultColor : getNetColor(zone.net, defaultColor);
     if (!zone.path2d) {
       zone.path2d = getPolygonsPath(zone);
     }
@@ -517,12 +677,16 @@ function drawNets(canvas, layer, highlight) {
     var padColor = style.getPropertyValue('--pad-color-highlight');
     var padHoleColor = style.getPropertyValue('--pad-hole-color');
     var ctx = canvas.getContext("2d");
+    var hlNet = geometryNet(highlightedNet);
     for (var footprint of pcbdata.footprints) {
       // draw pads
       var padDrawn = false;
-      for (var pad of footprint.pads) {
-        if (highlightedNet != pad.net) continue;
-        if (pad.layers.includes(layer)) {
+      ctx.save();
+      applyFootprintTransform(ctx, footprint);
+      for (var i = 0; i < footprint.pads.length; i++) {
+        var pad = footprint.pads[i];
+        if (hlNet != getPadNet(footprint, i)) continue;
+        if (padOnLayer(footprint, pad, layer)) {
           drawPad(ctx, pad, padColor, false);
           padDrawn = true;
         }
@@ -533,6 +697,7 @@ function drawNets(canvas, layer, highlight) {
           drawPadHole(ctx, pad, padHoleColor);
         }
       }
+      ctx.restore();
     }
   }
 }
@@ -756,17 +921,61 @@ function pointWithinPad(x, y, pad) {
   return emptyContext2d.isPointInPath(getCachedPadPath(pad), ...v);
 }
 
+function packedTracksHitScan(tracks, x, y) {
+  var segments = tracks.segments;
+  var arcs = tracks.arcs;
+  for (var i = 0; i < segments.width.length; i++) {
+    var c = segments.coords;
+    if (pointWithinDistanceToSegment(x, y, c[4 * i], c[4 * i + 1],
+        c[4 * i + 2], c[4 * i + 3], segments.width[i] / 2)) {
+      return segments.net ? netName(segments.net[i]) : undefined;
+    }
+  }
+  for (var i = 0; i < arcs.width.length; i++) {
+    var c = arcs.coords;
+    if (pointWithinDistanceToArc(x, y, c[5 * i], c[5 * i + 1], c[5 * i + 2],
+        c[5 * i + 3], c[5 * i + 4], arcs.width[i] / 2)) {
+      return arcs.net ? netName(arcs.net[i]) : undefined;
+    }
+  }
+  var polylines = tracks.polylines;
+  for (var i = 0, j = 0; polylines && i < polylines.width.length; i++) {
+    var c = polylines.coords;
+    var end = j + 2 * polylines.lengths[i];
+    for (; j + 2 < end; j += 2) {
+      if (pointWithinDistanceToSegment(x, y, c[j], c[j + 1],
+          c[j + 2], c[j + 3], polylines.width[i] / 2)) {
+        return polylines.net ? netName(polylines.net[i]) : undefined;
+      }
+    }
+    j = end;
+  }
+  return null;
+}
+
 function netHitScan(layer, x, y) {
   // Check track segments
-  if (settings.renderTracks && pcbdata.tracks) {
+  if (settings.renderTracks && pcbdata.tracks &&
+      !Array.isArray(pcbdata.tracks[layer])) {
+    var net = packedTracksHitScan(pcbdata.tracks[layer], x, y);
+    if (net !== null) {
+      return net;
+    }
+  } else if (settings.renderTracks && pcbdata.tracks) {
     for (var track of pcbdata.tracks[layer]) {
       if ('radius' in track) {
         if (pointWithinDistanceToArc(x, y, ...track.center, track.radius, track.startangle, track.endangle, track.width / 2)) {
-          return track.net;
+          return netName(track.net);
+        }
+      } else if ('points' in track) {
+        for (var i = 1; i < track.points.length; i++) {
+          if (pointWithinDistanceToSegment(x, y, ...track.points[i - 1], ...track.points[i], track.width / 2)) {
+            return netName(track.net);
+          }
         }
       } else {
         if (pointWithinDistanceToSegment(x, y, ...track.start, ...track.end, track.width / 2)) {
-          return track.net;
+          return netName(track.net);
         }
       }
     }
@@ -774,9 +983,17 @@ function netHitScan(layer, x, y) {
   // Check pads
   if (settings.renderPads) {
     for (var footprint of pcbdata.footprints) {
-      for (var pad of footprint.pads) {
-        if (pad.layers.includes(layer) && pointWithinPad(x, y, pad)) {
-          return pad.net;
+      var [px, py] = [x, y];
+      if (footprint.transform) {
+        // inverse of applyFootprintTransform()
+        var t = footprint.transform;
+        [px, py] = rotateVector([x - t[0], y - t[1]], t[2]);
+        if (t[3]) px = -px;
+      }
+      for (var i = 0; i < footprint.pads.length; i++) {
+        var pad = footprint.pads[i];
+        if (padOnLayer(footprint, pad, layer) && pointWithinPad(px, py, pad)) {
+          return netName(getPadNet(footprint, i));
         }
       }
     }
@@ -1040,6 +1257,59 @@ function setOffsetBackRotation(value) {
   resizeAll();
 }
 
+// Highest packed geometry version this page can read, see DATAFORMAT.md
+var GEOMETRY_ENCODING_VERSION = 1;
+
+function unpackGeometry() {
+  // Replaces buffer references of packed geometry with typed array views.
+  var encoding = pcbdata.geometry_encoding;
+  if (!encoding) return;
+  if (encoding.version > GEOMETRY_ENCODING_VERSION) {
+    throw new Error("Unsupported geometry encoding version " + encoding.version);
+  }
+  var decode = (base64) => {
+    var bin = atob(base64);
+    var bytes = new Uint8Array(bin.length);
+    for (var i = 0; i < bin.length; i++) {
+      bytes[i] = bin.charCodeAt(i);
+    }
+    return bytes.buffer;
+  }
+  var buffers = {
+    f32: new Float32Array(decode(encoding.float32)),
+    i32: new Int32Array(decode(encoding.int32)),
+  };
+  var resolve = (obj) => {
+    for (var key in obj) {
+      var value = obj[key];
+      if (value === null || typeof value !== "object") continue;
+      var type = "f32" in value ? "f32" : "i32" in value ? "i32" : null;
+      if (type) {
+        var [offset, length] = value[type];
+        obj[key] = buffers[type].subarray(offset, offset + length);
+      } else {
+        resolve(value);
+      }
+    }
+  }
+  resolve(pcbdata.edges);
+  resolve(pcbdata.footprints);
+  if (pcbdata.footprint_templates) resolve(pcbdata.footprint_templates);
+  if (pcbdata.tracks) resolve(pcbdata.tracks);
+  if (pcbdata.zones) resolve(pcbdata.zones);
+  delete pcbdata.geometry_encoding;
+}
+
+function initFootprintTemplates() {
+  // Templated footprints share pad objects and their cached paths.
+  if (!pcbdata.footprint_templates) return;
+  for (var footprint of pcbdata.footprints) {
+    if ("template" in footprint) {
+      footprint.pads = pcbdata.footprint_templates[footprint.template].pads;
+    }
+  }
+}
+
 function initRender() {
   allcanvas = {
     front: {
@@ -1,10 +1,11 @@
 /* Utility functions */
 
-var storagePrefix = 'KiCad_HTML_BOM__' + pcbdata.metadata.title + '__' +
-  pcbdata.metadata.revision + '__#';
+var storagePrefix;
 var storage;
 
 function initStorage(key) {
+  storagePrefix = 'KiCad_HTML_BOM__' + pcbdata.metadata.title + '__' +
+    pcbdata.metadata.revision + '__#';
   try {
     window.localStorage.getItem("blank");
     storage = window.localStorage;
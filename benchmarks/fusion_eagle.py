@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Time FusionEagleParser on a synthetic or existing Eagle .brd file.
+
+Synthetic boards have many libraries with many packages each and thousands
+of elements placing them, which is the shape of boards exported with large
+embedded libraries.
+
+Usage: python benchmarks/fusion_eagle.py [board.brd] [--elements N]
+           [--libraries N] [--packages N] [--inner-layers N] [--runs N]
+           [--save FILE]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEADER = '''<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE eagle SYSTEM "eagle.dtd">
+<eagle version="9.6.2">
+<drawing>
+<board>
+<plain>
+<wire x1="0" y1="0" x2="200" y2="0" width="0" layer="20"/>
+<wire x1="200" y1="0" x2="200" y2="150" width="0" layer="20"/>
+<wire x1="200" y1="150" x2="0" y2="150" width="0" layer="20"/>
+<wire x1="0" y1="150" x2="0" y2="0" width="0" layer="20"/>
+</plain>
+'''
+
+FOOTER = '''<designrules name="default">
+<param name="rlMinViaOuter" value="4mil"/>
+<param name="mlViaStopLimit" value="0mil"/>
+</designrules>
+</board>
+</drawing>
+</eagle>
+'''
+
+
+def package_xml(name, pads):
+    lines = ['<package name="%s">' % name]
+    for i in range(pads):
+        x = (i % 2) * 2.54 - 1.27
+        y = (i // 2) * 1.27
+        if i % 3:
+            lines.append('<smd name="%d" x="%.2f" y="%.2f" dx="1" dy="0.6" '
+                         'layer="1" roundness="25"/>' % (i + 1, x, y))
+        else:
+            lines.append('<pad name="%d" x="%.2f" y="%.2f" drill="0.8" '
+                         'shape="octagon"/>' % (i + 1, x, y))
+    height = (pads // 2) * 1.27 + 1
+    for x1, y1, x2, y2 in ((-2, -1, 2, -1), (2, -1, 2, height),
+                           (2, height, -2, height), (-2, height, -2, -1)):
+        lines.append('<wire x1="%s" y1="%s" x2="%s" y2="%s" width="0.127" '
+                     'layer="21"/>' % (x1, y1, x2, y2))
+    lines.append('<rectangle x1="-1" y1="0" x2="1" y2="1" layer="51"/>')
+    lines.append('<circle x="0" y="0" radius="0.3" width="0.1" layer="21"/>')
+    lines.append('<wire x1="-1" y1="-1" x2="1" y2="-1" width="0.1" '
+                 'layer="51" curve="90"/>')
+    lines.append('<polygon width="0.1" layer="21">'
+                 '<vertex x="-0.5" y="0"/><vertex x="0.5" y="0"/>'
+                 '<vertex x="0" y="0.5"/></polygon>')
+    if pads > 8:
+        lines.append('<hole x="0" y="%s" drill="1"/>' % (height / 2))
+    lines.append('<text x="0" y="%s" size="1" layer="25">&gt;NAME</text>'
+                 % (height + 1))
+    lines.append('<text x="0" y="%s" size="1" layer="27">&gt;VALUE</text>'
+                 % (height + 2))
+    # keepout and stop mask layers are never rendered
+    lines.append('<wire x1="-2" y1="-1" x2="2" y2="-1" width="0.1" '
+                 'layer="39"/>')
+    lines.append('<rectangle x1="-1" y1="0" x2="1" y2="1" layer="29"/>')
+    lines.append('</package>')
+    return '\n'.join(lines)
+
+
+def generate_board(file_name, elements, libraries, packages,
+                   inner_layers=6, seed=0):
+    rnd = random.Random(seed)
+    with open(file_name, 'w') as f:
+        f.write(HEADER)
+        f.write('<libraries>\n')
+        for lib in range(libraries):
+            f.write('<library name="lib%d">\n<packages>\n' % lib)
+            for pac in range(packages):
+                f.write(package_xml('pkg%d' % pac, 2 + pac % 14) + '\n')
+            f.write('</packages>\n</library>\n')
+        f.write('</libraries>\n<elements>\n')
+        placed = []
+        for i in range(elements):
+            lib = rnd.randrange(libraries)
+            pac = rnd.randrange(packages)
+            rot = rnd.choice(['', ' rot="R90"', ' rot="MR180"', ' rot="R270"'])
+            if not i % 50:
+                rot += ' populate="no"'
+            f.write('<element name="U%d" library="lib%d" package="pkg%d" '
+                    'value="%dk" x="%.2f" y="%.2f"%s/>\n'
+                    % (i, lib, pac, i % 100, rnd.uniform(5, 195),
+                       rnd.uniform(5, 145), rot))
+            placed.append(i)
+        f.write('</elements>\n<signals>\n')
+        for n in range(0, len(placed) - 1, 2):
+            f.write('<signal name="N%d">\n'
+                    '<contactref element="U%d" pad="1"/>\n'
+                    '<contactref element="U%d" pad="2"/>\n'
+                    '<wire x1="%d" y1="1" x2="%d" y2="2" width="0.2" '
+                    'layer="1"/>\n' % (n, n, n + 1, n % 200, n % 200))
+            for layer in range(2, 2 + inner_layers):
+                f.write('<wire x1="%d" y1="2" x2="%d" y2="3" width="0.2" '
+                        'layer="%d"/>\n' % (n % 200, n % 200, layer))
+            f.write('</signal>\n')
+        f.write('</signals>\n')
+        f.write(FOOTER)
+
+
+def peak_rss_mb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024
+
+
+def parse_board(file_name):
+    sys.path.insert(0, REPO_DIR)
+    os.environ['INTERACTIVE_HTML_BOM_CLI_MODE'] = '1'
+    from InteractiveHtmlBom.core.config import Config
+    from InteractiveHtmlBom.core.ibom import Logger
+    from InteractiveHtmlBom.ecad.fusion_eagle import FusionEagleParser
+    from InteractiveHtmlBom.version import version
+
+    config = Config(version, os.path.dirname(file_name))
+    config.include_tracks = True
+    config.include_nets = True
+    parser = FusionEagleParser(file_name, config, Logger(cli=True))
+    start = time.perf_counter()
+    pcbdata, components = parser.parse()
+    return time.perf_counter() - start, len(pcbdata['footprints'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('file', nargs='?',
+                        help='.brd file, a synthetic board is generated if '
+                             'omitted')
+    parser.add_argument('--elements', type=int, default=5000)
+    parser.add_argument('--libraries', type=int, default=40)
+    parser.add_argument('--packages', type=int, default=100,
+                        help='Packages per library.')
+    parser.add_argument('--inner-layers', type=int, default=6,
+                        help='Inner layer wires per signal.')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Number of runs, best time is reported.')
+    parser.add_argument('--save', help='Keep the generated board here.')
+    args = parser.parse_args()
+
+    if args.file:
+        file_name = os.path.abspath(args.file)
+    else:
+        file_name = os.path.abspath(
+            args.save or os.path.join(tempfile.mkdtemp(), 'synthetic.brd'))
+        generate_board(file_name, args.elements, args.libraries,
+                       args.packages, args.inner_layers)
+        print('Generated %s: %d elements, %d libraries x %d packages'
+              % (file_name, args.elements, args.libraries, args.packages))
+
+    times = []
+    footprints = 0
+    for _ in range(args.runs):
+        elapsed, footprints = parse_board(file_name)
+        times.append(elapsed)
+    print('Footprints: %d, best parse time: %.3f s, peak RSS: %.1f MB'
+          % (footprints, min(times), peak_rss_mb()))
+    if not args.file and not args.save:
+        os.remove(file_name)
+        os.rmdir(os.path.dirname(file_name))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Time generate_bom on a synthetic BOM.
+
+Components use a few hundred distinct values spread over resistors,
+capacitors, inductors and parts without units, like large boards do.
+With --filters the config blacklists test points and mounting holes and
+selects a board variant, the component filter pass is timed separately.
+
+Usage: python benchmarks/generate_bom.py [--components N] [--values N]
+           [--filters] [--runs N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ['INTERACTIVE_HTML_BOM_CLI_MODE'] = '1'
+
+from InteractiveHtmlBom.core import ibom  # noqa: E402
+from InteractiveHtmlBom.core.config import Config  # noqa: E402
+from InteractiveHtmlBom.ecad.common import Component  # noqa: E402
+from InteractiveHtmlBom.version import version  # noqa: E402
+
+PARTS = [
+    ('R', ['{}', '{}R', '{}k', '{}K', '{}M', '{}R5', '{}Ohm']),
+    ('C', ['{}n', '{}nF', '{}u', '{}uF', '{}p', '{}pF']),
+    ('L', ['{}uH', '{}n', '{}mH']),
+    ('U', ['LM{}', 'STM32F{}', 'TPS{}']),
+    ('D', ['LED{}', '1N{}', 'BAT{}']),
+    ('TP', ['{}']),
+    ('MH', ['M{}']),
+]
+
+
+def generate_components(count, values, rnd):
+    value_sets = []
+    for prefix, formats in PARTS:
+        value_set = set()
+        while len(value_set) < values // len(PARTS):
+            value_set.add(rnd.choice(formats).format(rnd.randint(1, 999)))
+        value_sets.append((prefix, sorted(value_set)))
+    components = []
+    for i in range(count):
+        prefix, value_set = rnd.choice(value_sets)
+        extra_fields = {'Variant': rnd.choice(['', 'A', 'B'])}
+        if not i % 20:
+            extra_fields['DNP'] = 'DNP'
+        components.append(Component(
+            '%s%d' % (prefix, i + 1), rnd.choice(value_set),
+            rnd.choice(['0402', '0603', '0805']), rnd.choice('FB'),
+            extra_fields=extra_fields))
+    return components
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--components', type=int, default=50000)
+    parser.add_argument('--values', type=int, default=200,
+                        help='Distinct values.')
+    parser.add_argument('--filters', action='store_true',
+                        help='Enable component filters.')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs, best time is reported.')
+    args = parser.parse_args()
+
+    components = generate_components(args.components, args.values,
+                                     random.Random(0))
+    times = []
+    filter_times = []
+    for _ in range(args.runs):
+        config = Config(version, REPO_DIR)
+        if args.filters:
+            config.component_blacklist = ['TP*', 'MH*', 'R1']
+            config.blacklist_empty_val = True
+            config.dnp_field = 'DNP'
+            config.board_variant_field = 'Variant'
+            config.board_variant_whitelist = ['<empty>', 'A']
+            config.board_variant_blacklist = ['B']
+        start = time.perf_counter()
+        skip = ibom.ComponentFilter(config)
+        skipped = sum(1 for c in components if skip(c))
+        filter_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        bom = ibom.generate_bom(components, config)
+        times.append(time.perf_counter() - start)
+    print('Components: %d, skipped: %d, groups: %d'
+          % (len(components), skipped, len(bom['both'])))
+    print('Best time: filter %.3f s, generate_bom %.3f s'
+          % (min(filter_times), min(times)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
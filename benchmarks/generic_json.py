@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Time generic json parsing with each --validation mode.
+
+Without a file argument a synthetic generic json board is made by parsing
+the synthetic Eagle board of fusion_eagle.py and dumping its pcbdata.
+
+Usage: python benchmarks/generic_json.py [board.json] [--elements N]
+           [--runs N]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ['INTERACTIVE_HTML_BOM_CLI_MODE'] = '1'
+
+from fusion_eagle import generate_board  # noqa: E402
+from InteractiveHtmlBom.core.config import Config  # noqa: E402
+from InteractiveHtmlBom.core.ibom import Logger  # noqa: E402
+from InteractiveHtmlBom.ecad import genericjson  # noqa: E402
+from InteractiveHtmlBom.ecad.fusion_eagle import \
+    FusionEagleParser  # noqa: E402
+from InteractiveHtmlBom.version import version  # noqa: E402
+
+
+def generate_json(file_name, elements):
+    brd_file_name = os.path.splitext(file_name)[0] + '.brd'
+    generate_board(brd_file_name, elements, libraries=20, packages=50,
+                   inner_layers=0)
+    config = Config(version, os.path.dirname(file_name))
+    config.include_tracks = True
+    config.include_nets = True
+    parser = FusionEagleParser(brd_file_name, config, Logger())
+    pcbdata, components = parser.parse()
+    os.remove(brd_file_name)
+    pcb = {
+        'spec_version': 1,
+        'pcbdata': pcbdata,
+        'components': [{k: v for k, v in vars(c).items() if v is not None}
+                       for c in components],
+    }
+    with io.open(file_name, 'w', encoding='utf-8') as f:
+        json.dump(pcb, f)
+
+
+def parse(file_name, validation):
+    config = Config(version, os.path.dirname(file_name))
+    config.validation = validation
+    parser = genericjson.GenericJsonParser(file_name, config,
+                                           Logger(cli=True))
+    start = time.perf_counter()
+    pcbdata, _ = parser.parse()
+    elapsed = time.perf_counter() - start
+    if pcbdata is None:
+        raise SystemExit('%s is not valid' % file_name)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('file', nargs='?',
+                        help='generic json file, a synthetic board is '
+                             'generated if omitted')
+    parser.add_argument('--elements', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Runs per mode, best time is reported.')
+    args = parser.parse_args()
+
+    if args.file:
+        file_name = os.path.abspath(args.file)
+    else:
+        file_name = os.path.join(tempfile.mkdtemp(), 'synthetic.json')
+        generate_json(file_name, args.elements)
+    print('%s: %.1f MB' % (file_name, os.path.getsize(file_name) / 1e6))
+
+    print('%-11s %9s' % ('Validation', 'Time, s'))
+    for validation in Config.validation_choices:
+        times = [parse(file_name, validation) for _ in range(args.runs)]
+        print('%-11s %9.3f' % (validation, min(times)))
+
+    if not args.file:
+        os.remove(file_name)
+        os.rmdir(os.path.dirname(file_name))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare pcbnew and headless s-expression readers of a .kicad_pcb file.
+
+Each parser runs in a fresh process so that import time of pcbnew and its
+memory are accounted for. Reported time covers imports, board loading and
+parse(); memory is the peak resident set size of the process.
+
+Usage: python benchmarks/kicad_parsers.py board.kicad_pcb [--runs N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARSERS = ['pcbnew', 'sexpr']
+
+
+def peak_rss_mb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024
+
+
+def run_worker(parser_name, file_name):
+    start = time.perf_counter()
+    sys.path.insert(0, REPO_DIR)
+    os.environ['INTERACTIVE_HTML_BOM_CLI_MODE'] = '1'
+    from InteractiveHtmlBom.core.config import Config
+    from InteractiveHtmlBom.core.ibom import Logger
+    from InteractiveHtmlBom.version import version
+    from InteractiveHtmlBom import ecad
+
+    config = Config(version, os.path.dirname(file_name))
+    config.include_tracks = True
+    config.include_nets = True
+    logger = Logger(cli=True)
+    if parser_name == 'pcbnew':
+        from InteractiveHtmlBom.ecad.kicad import PcbnewParser
+        parser = PcbnewParser(file_name, config, logger)
+    else:
+        parser = ecad.get_kicad_sexpr_parser(file_name, config, logger)
+    pcbdata, components = parser.parse()
+    print(json.dumps({
+        'time': time.perf_counter() - start,
+        'rss': peak_rss_mb(),
+        'footprints': len(pcbdata['footprints']),
+        'components': len(components),
+    }))
+
+
+def run_parser(parser_name, file_name):
+    # type: (str, str) -> dict | None
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), file_name,
+         '--worker', parser_name],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True)
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ['unknown error'])[-1]
+        print('%s failed: %s' % (parser_name, error))
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('file', help='.kicad_pcb file')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Runs per parser, best time is reported.')
+    parser.add_argument('--worker', choices=PARSERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    file_name = os.path.abspath(args.file)
+
+    if args.worker:
+        run_worker(args.worker, file_name)
+        return 0
+
+    print('%-8s %9s %12s %11s' % ('Parser', 'Time, s', 'Peak RSS, MB',
+                                  'Footprints'))
+    for parser_name in PARSERS:
+        results = []
+        for _ in range(args.runs):
+            result = run_parser(parser_name, file_name)
+            if result is None:
+                break
+            results.append(result)
+        if not results:
+            print('%-8s %9s' % (parser_name, 'n/a'))
+            continue
+        best = min(results, key=lambda r: r['time'])
+        print('%-8s %9.3f %12.1f %11d' % (parser_name, best['time'],
+                                          best['rss'], best['footprints']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Time the fast LZString compressor against the reference implementation.
+
+Input is json of a synthetic board with the given numbers of tracks.
+
+Usage: python benchmarks/lzstring.py [--tracks N [N ...]] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ['INTERACTIVE_HTML_BOM_CLI_MODE'] = '1'
+
+from InteractiveHtmlBom.core import lzstring_fast  # noqa: E402
+from InteractiveHtmlBom.core.lzstring import LZString  # noqa: E402
+
+
+def synthetic_pcbdata(tracks, rnd):
+    return json.dumps({
+        "tracks": {"F": [{
+            "start": [round(rnd.uniform(0, 100), 6),
+                      round(rnd.uniform(0, 100), 6)],
+            "end": [round(rnd.uniform(0, 100), 6),
+                    round(rnd.uniform(0, 100), 6)],
+            "width": 0.25,
+            "net": "Net-(U%d-Pad%d)" % (rnd.randint(1, 50), rnd.randint(1, 9)),
+        } for _ in range(tracks)]},
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--tracks', type=int, nargs='+',
+                        default=[1000, 10000, 50000])
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Number of runs, best time is reported.')
+    args = parser.parse_args()
+
+    for tracks in args.tracks:
+        data = synthetic_pcbdata(tracks, random.Random(0))
+        ref = min(timeit.repeat(
+            lambda: LZString().compress_to_base64(data),
+            number=1, repeat=args.runs))
+        fast = min(timeit.repeat(
+            lambda: lzstring_fast.compress_to_base64(data),
+            number=1, repeat=args.runs))
+        print("%8d chars: reference %.3fs, fast %.3fs, speedup %.2fx" %
+              (len(data), ref, fast, ref / fast))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
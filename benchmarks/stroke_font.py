@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Time stroke font import and glyph parsing for text heavy boards.
+
+Each simulated board has many text items, half of them ascii and the rest
+using greek, cyrillic and symbol glyphs. Every board gets a new FontParser
+like every parser run does.
+
+Usage: python benchmarks/stroke_font.py [--texts N] [--boards N] [--runs N]
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ['INTERACTIVE_HTML_BOM_CLI_MODE'] = '1'
+
+IMPORT_SCRIPT = '''
+import time
+start = time.perf_counter()
+import InteractiveHtmlBom.core.fontparser
+print(time.perf_counter() - start)
+'''
+
+CHARS = [chr(c) for c in range(0x20, 0x7f)]
+EXTRA_CHARS = ([chr(c) for c in range(0x391, 0x3ca)] +
+               [chr(c) for c in range(0x410, 0x450)] +
+               [chr(c) for c in range(0x2190, 0x21ff)])
+
+
+def import_time():
+    output = subprocess.check_output(
+        [sys.executable, '-c', IMPORT_SCRIPT], cwd=REPO_DIR)
+    return float(output)
+
+
+def generate_texts(count, rnd):
+    texts = []
+    for i in range(count):
+        chars = CHARS + EXTRA_CHARS if i % 2 else CHARS
+        texts.append(''.join(rnd.choice(chars)
+                             for _ in range(rnd.randint(2, 12))))
+    return texts
+
+
+def parse_boards(texts, boards):
+    from InteractiveHtmlBom.core.fontparser import FontParser
+
+    start = time.perf_counter()
+    for _ in range(boards):
+        font_parser = FontParser()
+        for text in texts:
+            font_parser.parse_font_for_string(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--texts', type=int, default=20000,
+                        help='Text items per board.')
+    parser.add_argument('--boards', type=int, default=10)
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs, best time is reported.')
+    args = parser.parse_args()
+
+    print('Import: %.1f ms' % (
+        1000 * min(import_time() for _ in range(args.runs))))
+    texts = generate_texts(args.texts, random.Random(0))
+    # first board in the process includes loading and decoding glyphs
+    print('First board: %.1f ms' % (1000 * parse_boards(texts, 1)))
+    print('%d boards: %.1f ms' % (args.boards, 1000 * min(
+        parse_boards(texts, args.boards) for _ in range(args.runs))))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Time svg path bounding boxes, path_bbox() against parse_path().
+
+Paths are curved silkscreen items in the form EasyEDA boards store them and
+the Eagle parser generates them for curved wires. EasyEDA outlines also mix
+arcs with line segments.
+
+Usage: python benchmarks/svgpath_bbox.py [--items N] [--runs N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ['INTERACTIVE_HTML_BOM_CLI_MODE'] = '1'
+
+from InteractiveHtmlBom.core.ibom import Logger  # noqa: E402
+from InteractiveHtmlBom.ecad import svgpath  # noqa: E402
+
+
+def easyeda_paths(items, rnd):
+    paths = []
+    for i in range(items):
+        x = rnd.uniform(3000, 5000)
+        y = rnd.uniform(3000, 5000)
+        r = rnd.uniform(1, 20)
+        if i % 4:
+            paths.append('M%.4f,%.4f A%.4f,%.4f 0 %d 1 %.4f,%.4f' % (
+                x, y, r, r, rnd.randint(0, 1), x + r, y + r))
+        else:
+            # rounded outline
+            paths.append(
+                'M %.4f %.4f L %.4f %.4f A %.4f %.4f 0 0 1 %.4f %.4f '
+                'L %.4f %.4f A %.4f %.4f 0 0 1 %.4f %.4f Z' % (
+                    x, y, x + 20, y, r, r, x + 20 + r, y + r,
+                    x + 20 + r, y + 10 + r, r, r, x + 20, y + 10 + 2 * r))
+    return paths
+
+
+def eagle_paths(items, rnd):
+    paths = []
+    for _ in range(items):
+        x = rnd.uniform(0, 200)
+        y = rnd.uniform(-150, 0)
+        r = rnd.uniform(0.2, 5)
+        # same format as FusionEagleParser._curve_to_svgpath()
+        paths.append('M {} {} A {} {} 0 {} {} {} {}'.format(
+            x, y, r, r, rnd.randint(0, 1), rnd.randint(0, 1),
+            x + r * rnd.uniform(-1, 1), y + r))
+    return paths
+
+
+def parse_path_bbox(paths, logger):
+    for path in paths:
+        for segment in svgpath.parse_path(path, logger):
+            segment.bbox()
+
+
+def path_bbox(paths, logger):
+    svgpath._path_bbox.cache_clear()
+    for path in paths:
+        svgpath.path_bbox(path, logger)
+
+
+def path_bbox_cached(paths, logger):
+    for path in paths:
+        svgpath.path_bbox(path, logger)
+
+
+def best_time(func, paths, runs):
+    logger = Logger(cli=True)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(paths, logger)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--items', type=int, default=10000,
+                        help='Curved items per board.')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs, best time is reported.')
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    boards = [('EasyEDA', easyeda_paths(args.items, rnd)),
+              ('Eagle', eagle_paths(args.items, rnd))]
+    funcs = [('parse_path', parse_path_bbox),
+             ('path_bbox', path_bbox),
+             ('path_bbox, cached', path_bbox_cached)]
+
+    print('%-8s %-18s %9s' % ('Board', 'Method', 'Time, s'))
+    for board, paths in boards:
+        for name, func in funcs:
+            print('%-8s %-18s %9.3f' % (
+                board, name, best_time(func, paths, args.runs)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import copy
+
+import pytest
+
+_GENERIC_PCB = {
+    'spec_version': 1,
+    'pcbdata': {
+        'edges_bbox': {'minx': 0, 'miny': 0, 'maxx': 10, 'maxy': 10},
+        'edges': [],
+        'drawings': {
+            'silkscreen': {'F': [], 'B': []},
+            'fabrication': {'F': [], 'B': []},
+        },
+        'footprints': [{
+            'ref': 'R1',
+            'center': [5, 5],
+            'bbox': {'pos': [5, 5], 'relpos': [-1, -1], 'size': [2, 2],
+                     'angle': 0},
+            'pads': [],
+            'drawings': [],
+            'layer': 'F',
+        }],
+        'metadata': {'title': 'test', 'revision': 'A', 'company': '',
+                     'date': '2024-01-01'},
+    },
+    'components': [{
+        'ref': 'R1', 'val': '10k', 'footprint': 'R0603', 'layer': 'F',
+        'extra_fields': {'MPN': 'RC0603', 'Note': 'x'},
+    }],
+}
+
+
+@pytest.fixture
+def generic_pcb():
+    """Minimal valid generic json board document."""
+    return copy.deepcopy(_GENERIC_PCB)
@@ -0,0 +1,93 @@
+import io
+import json
+import os
+
+import pytest
+
+from InteractiveHtmlBom import generate_interactive_bom as cli
+from InteractiveHtmlBom.core.ibom import Logger
+from InteractiveHtmlBom.errors import ExitCodes
+
+
+@pytest.fixture
+def boards(tmp_path):
+    (tmp_path / 'a.kicad_pcb').write_text('')
+    (tmp_path / 'B.BRD').write_text('<eagle/>')
+    (tmp_path / 'notes.txt').write_text('a.kicad_pcb\n')
+    sub = tmp_path / 'sub [rev2]'
+    sub.mkdir()
+    (sub / 'c.json').write_text('{}')
+    return tmp_path
+
+
+def test_directory(boards):
+    assert cli.get_batch_files(str(boards)) == [
+        str(boards / 'B.BRD'), str(boards / 'a.kicad_pcb')]
+
+
+def test_glob(boards):
+    pattern = str(boards / '**' / '*.json')
+    assert cli.get_batch_files(pattern) == [
+        str(boards / 'sub [rev2]' / 'c.json')]
+
+
+def test_manifest(boards, tmp_path):
+    manifest = boards / 'sub [rev2]' / 'boards.lst'
+    manifest.write_text('# boards\n\n../a.kicad_pcb\n  c.json  \n%s\n'
+                        % (boards / 'B.BRD'))
+    sub = str(boards / 'sub [rev2]')
+    assert cli.get_batch_files(str(manifest)) == [
+        os.path.join(sub, '../a.kicad_pcb'), os.path.join(sub, 'c.json'),
+        str(boards / 'B.BRD')]
+
+
+@pytest.mark.parametrize('name', [
+    'a.kicad_pcb', 'B.BRD', 'sub [rev2]/c.json', 'missing.kicad_pcb'])
+def test_single_file(boards, name):
+    # existing files are never globbed or read as manifests
+    assert cli.get_batch_files(str(boards / name)) is None
+
+
+def write_boards(directory, pcb, names):
+    files = []
+    for name in names:
+        file_name = str(directory / name)
+        with io.open(file_name, 'w', encoding='utf-8') as f:
+            json.dump(pcb, f)
+        files.append(file_name)
+    return files
+
+
+def test_run_batch_exit_code(tmp_path, capsys, generic_pcb):
+    pytest.importorskip('jsonschema')
+    board, = write_boards(tmp_path, generic_pcb, ['board.json'])
+    missing = str(tmp_path / 'missing.json')
+    argv = [str(tmp_path), '--no-browser']
+    logger = Logger(cli=True)
+
+    assert cli.run_batch([board], 2, argv, logger) == 0
+    assert (tmp_path / 'bom' / 'board.html').is_file()
+    assert cli.run_batch([board, missing], 2, argv, logger) == \
+        ExitCodes.ERROR_BATCH
+    summary = capsys.readouterr().out
+    assert '1 boms generated, 1 failed' in summary
+    assert '%-6d' % ExitCodes.ERROR_FILE_NOT_FOUND in summary
+
+
+def test_boards_in_one_directory(tmp_path, generic_pcb):
+    pytest.importorskip('jsonschema')
+    files = write_boards(tmp_path, generic_pcb, ['a.json', 'b.json'])
+    logger = Logger(cli=True)
+
+    # boms are named after boards by default
+    argv = [str(tmp_path), '--no-browser']
+    assert cli.find_output_collisions(files, argv, logger) == []
+    assert cli.run_batch(files, 2, argv, logger) == 0
+    assert sorted(os.listdir(str(tmp_path / 'bom'))) == ['a.html', 'b.html']
+
+    argv += ['--name-format', 'ibom']
+    assert cli.find_output_collisions(
+        files + [str(tmp_path / 'missing.json')], argv, logger) == [files]
+    # names using metadata are not known before parsing
+    argv += ['--name-format', '%p']
+    assert cli.find_output_collisions(files, argv, logger) == []
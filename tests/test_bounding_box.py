@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from InteractiveHtmlBom.ecad.common import BoundingBox
+
+
+def points_bbox(xs, ys, rx=0, ry=0, angle=0, bbox=None):
+    bbox = bbox or BoundingBox()
+    for x, y in zip(xs, ys):
+        bbox.add_point(x, y, rx, ry, angle)
+    return bbox.to_dict()
+
+
+@pytest.mark.parametrize('angle', [0, 30, -90, 180])
+def test_add_points(angle):
+    rnd = random.Random(angle)
+    xs = [rnd.uniform(-10, 10) for _ in range(50)]
+    ys = [rnd.uniform(-10, 10) for _ in range(50)]
+    bbox = BoundingBox().add_point(20, 20).add_points(xs, ys, 1, 2, angle)
+    expected = points_bbox(xs, ys, 1, 2, angle,
+                           BoundingBox().add_point(20, 20))
+    assert bbox.to_dict() == pytest.approx(expected)
+
+
+def test_add_points_numpy(monkeypatch):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(BoundingBox, 'NUMPY_MIN_POINTS', 1)
+    xs = [0, 1, 2]
+    ys = [0, -1, 3]
+    bbox = BoundingBox().add_points(xs, ys, 1, 1, 45).to_dict()
+    assert bbox == pytest.approx(points_bbox(xs, ys, 1, 1, 45))
+    assert all(type(v) is float for v in bbox.values())
+
+
+def test_add_points_empty():
+    assert not BoundingBox().add_points([], []).initialized()
@@ -0,0 +1,46 @@
+from InteractiveHtmlBom.core.config import Config
+from InteractiveHtmlBom.core.ibom import ComponentFilter, generate_bom
+from InteractiveHtmlBom.ecad.common import Component
+
+
+def component(ref, val='1k', attr=None, **extra_fields):
+    return Component(ref, val, 'R0603', 'F', attr, extra_fields)
+
+
+def test_blacklist():
+    config = Config('test', '.')
+    config.component_blacklist = ['TP*', 'R2', '*']
+    config.blacklist_empty_val = True
+    skip = ComponentFilter(config)
+    assert skip(component('TP1'))
+    assert not skip(component('TPA1'))
+    assert skip(component('R2'))
+    assert not skip(component('R20'))
+    # '*' matches references without a prefix
+    assert skip(component('1'))
+    assert skip(component('R3', val='~'))
+    assert skip(component('R4', attr='Virtual'))
+
+
+def test_variants():
+    config = Config('test', '.')
+    config.dnp_field = 'DNP'
+    config.board_variant_field = 'Variant'
+    config.board_variant_whitelist = ['<empty>', 'A']
+    config.board_variant_blacklist = ['<empty>', 'B']
+    skip = ComponentFilter(config)
+    assert not skip(component('R1'))
+    assert not skip(component('R2', Variant='A'))
+    assert skip(component('R3', Variant='B'))
+    assert skip(component('R4', Variant='C'))
+    assert skip(component('R5', DNP='DNP'))
+    assert not skip(component('R6', DNP=''))
+
+
+def test_generate_bom_skipped():
+    config = Config('test', '.')
+    config.component_blacklist = ['TP*']
+    components = [component('R1'), component('TP1'), component('R2')]
+    bom = generate_bom(components, config)
+    assert bom['skipped'] == [1]
+    assert bom['both'] == [[('R1', 0), ('R2', 2)]]
@@ -0,0 +1,140 @@
+import copy
+import io
+import json
+
+import pytest
+
+from InteractiveHtmlBom import ecad
+from InteractiveHtmlBom.core.config import Config
+from InteractiveHtmlBom.core.ibom import Logger
+
+EASYEDA_PCB = {
+    'head': {'docType': '3', 'editorVersion': '6.5'},
+    'canvas': '~'.join(['CA'] + ['0'] * 17),
+    'shape': [],
+    'BBox': {'x': 0, 'y': 0, 'width': 100, 'height': 50},
+}
+
+
+@pytest.fixture
+def json_loads(monkeypatch):
+    """Counts how many times json documents are loaded."""
+    loads = []
+    load = json.load
+
+    def counting_load(f, *args, **kwargs):
+        loads.append(f.name)
+        return load(f, *args, **kwargs)
+
+    monkeypatch.setattr(json, 'load', counting_load)
+    return loads
+
+
+def test_easyeda_loaded_once(tmp_path, json_loads):
+    file_name = str(tmp_path / 'board.json')
+    with io.open(file_name, 'w', encoding='utf-8') as f:
+        json.dump(EASYEDA_PCB, f)
+    config = Config('test', str(tmp_path))
+    parser = ecad.get_parser_by_extension(file_name, config,
+                                          Logger(cli=True))
+    pcbdata, components = parser.parse()
+    assert pcbdata['edges_bbox'] == {
+        'minx': 0, 'miny': 0, 'maxx': 100, 'maxy': 50}
+    assert components == []
+    assert json_loads == [file_name]
+    # handed over document is not kept, later parses load the file again
+    assert parser.pcb is None
+    parser.parse()
+    assert json_loads == [file_name, file_name]
+
+
+def test_generic_json_validated_once(tmp_path, json_loads, monkeypatch,
+                                     generic_pcb):
+    pytest.importorskip('jsonschema')
+    from InteractiveHtmlBom.ecad import genericjson
+
+    validations = []
+    get_validator = genericjson.get_validator
+
+    def counting_get_validator(spec_version):
+        validations.append(spec_version)
+        return get_validator(spec_version)
+
+    monkeypatch.setattr(genericjson, 'get_validator', counting_get_validator)
+    file_name = str(tmp_path / 'board.json')
+    with io.open(file_name, 'w', encoding='utf-8') as f:
+        json.dump(generic_pcb, f)
+    config = Config('test', str(tmp_path))
+    config.show_fields = ['Value', 'Footprint', 'MPN']
+    parser = ecad.get_parser_by_extension(file_name, config,
+                                          Logger(cli=True))
+
+    data = parser.parse_extra_data(file_name, False)
+    assert data.fields == ['MPN', 'Note']
+    pcbdata, components = parser.parse()
+    assert components[0].extra_fields == {'MPN': 'RC0603'}
+    # parse() does not change cached components
+    data = parser.parse_extra_data(file_name, False)
+    assert data.fields_by_ref['R1'] == {'MPN': 'RC0603', 'Note': 'x'}
+    assert validations == [1]
+    assert json_loads.count(file_name) == 1
+
+
+def test_generic_json_parse_repeatable(tmp_path, json_loads, generic_pcb):
+    pytest.importorskip('jsonschema')
+    generic_pcb['pcbdata']['edges'] = [
+        {'type': 'segment', 'start': [0, 0], 'end': [20, 10], 'width': 0}]
+    file_name = str(tmp_path / 'board.json')
+    with io.open(file_name, 'w', encoding='utf-8') as f:
+        json.dump(generic_pcb, f)
+    config = Config('test', str(tmp_path))
+    parser = ecad.get_parser_by_extension(file_name, config,
+                                          Logger(cli=True))
+
+    pcbdata, components = parser.parse()
+    expected = copy.deepcopy(pcbdata)
+    assert pcbdata['edges_bbox'] == {
+        'minx': 0, 'miny': 0, 'maxx': 20, 'maxy': 10}
+    # callers pack and rewrite the returned data
+    pcbdata['edges'] = []
+    pcbdata['footprints'][0]['ref'] = 'R2'
+    components[0].extra_fields['MPN'] = 'changed'
+    pcbdata, components = parser.parse()
+    assert pcbdata == expected
+    assert components[0].extra_fields == {'MPN': 'RC0603', 'Note': 'x'}
+    # returned pcbdata is not cached, the file is loaded again
+    assert json_loads.count(file_name) == 2
+
+
+@pytest.mark.parametrize('validation, valid', [
+    ('full', False), ('structural', True), ('none', True)])
+def test_generic_json_validation_modes(tmp_path, generic_pcb, validation,
+                                      valid):
+    pytest.importorskip('jsonschema')
+    footprint = generic_pcb['pcbdata']['footprints'][0]
+    generic_pcb['pcbdata']['footprints'] = [footprint] * 100
+    generic_pcb['components'] = generic_pcb['components'] * 100
+    # only the second footprint is invalid, it is not in the sample
+    generic_pcb['pcbdata']['footprints'][1] = dict(footprint, layer='X')
+    file_name = str(tmp_path / 'board.json')
+    with io.open(file_name, 'w', encoding='utf-8') as f:
+        json.dump(generic_pcb, f)
+    config = Config('test', str(tmp_path))
+    config.validation = validation
+    parser = ecad.get_parser_by_extension(file_name, config,
+                                          Logger(cli=True))
+    pcbdata, _ = parser.parse()
+    assert (pcbdata is not None) == valid
+
+
+def test_generic_json_structural_validation(tmp_path, generic_pcb):
+    pytest.importorskip('jsonschema')
+    del generic_pcb['pcbdata']['metadata']['title']
+    file_name = str(tmp_path / 'board.json')
+    with io.open(file_name, 'w', encoding='utf-8') as f:
+        json.dump(generic_pcb, f)
+    config = Config('test', str(tmp_path))
+    config.validation = 'structural'
+    parser = ecad.get_parser_by_extension(file_name, config,
+                                          Logger(cli=True))
+    assert parser.parse() == (None, None)
@@ -0,0 +1,30 @@
+import io
+
+import pytest
+
+from InteractiveHtmlBom.core import fontparser
+from InteractiveHtmlBom.core.fontparser import FontParser
+
+
+def test_glyph_store_up_to_date():
+    # regenerate with python -m InteractiveHtmlBom.core.fontparser
+    with io.open(fontparser.GLYPH_STORE, 'rb') as f:
+        assert f.read() == fontparser.build_glyph_store()
+
+
+def test_parse_font_char():
+    glyph = FontParser().parse_font_char('-')
+    # "E_JSZS" in NEWSTROKE_FONT
+    scale = FontParser.STROKE_FONT_SCALE
+    assert glyph['w'] == 26 * scale
+    assert len(glyph['l']) == 1
+    assert glyph['l'][0] == [pytest.approx([5 * scale, -9 * scale]),
+                             pytest.approx([21 * scale, -9 * scale])]
+    assert FontParser().parse_font_char(chr(0x10ffff)) == \
+        FontParser().parse_font_char('?')
+
+
+def test_parse_font_for_string():
+    font_parser = FontParser()
+    font_parser.parse_font_for_string('a\tba')
+    assert list(font_parser.get_parsed_font()) == ['a', ' ', 'b']
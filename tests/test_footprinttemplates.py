@@ -0,0 +1,105 @@
+"""Checks that templated footprints transform back to their original pads."""
+import copy
+import math
+
+import pytest
+
+from InteractiveHtmlBom.core.footprinttemplates import FootprintTemplates
+
+LOCAL_PADS = [
+    {'pos': [-0.5, 0], 'size': [0.6, 0.5], 'angle': 0, 'shape': 'rect',
+     'type': 'smd', 'layers': ['F'], 'pin1': 1},
+    {'pos': [1, 0.5], 'size': [1.2, 0.8], 'angle': 30, 'shape': 'chamfrect',
+     'radius': 0.05, 'chamfpos': 5, 'chamfratio': 0.2, 'type': 'smd',
+     'layers': ['F']},
+    {'pos': [2, 1], 'size': [1, 1], 'angle': 0, 'shape': 'custom',
+     'polygons': [[[0, 0], [1, 0.2], [0.3, 0.9]]], 'type': 'smd',
+     'layers': ['F']},
+    {'pos': [-2, 1], 'size': [1.5, 1], 'angle': 45, 'shape': 'oval',
+     'offset': [0.3, 0.1], 'type': 'th', 'drillshape': 'oblong',
+     'drillsize': [0.8, 0.4], 'layers': ['F', 'B']},
+]
+
+
+def rotate(v, angle):
+    angle = math.radians(angle)
+    return [v[0] * math.cos(angle) - v[1] * math.sin(angle),
+            v[0] * math.sin(angle) + v[1] * math.cos(angle)]
+
+
+def place(pads, transform, nets=None):
+    """Board coordinates of template pads as described in DATAFORMAT.md."""
+    x, y, angle, mirror = transform
+    result = []
+    for i, pad in enumerate(pads):
+        pad = copy.deepcopy(pad)
+        px, py = pad['pos']
+        if mirror:
+            px = -px
+            pad['angle'] = -pad['angle']
+            if 'offset' in pad:
+                pad['offset'][0] = -pad['offset'][0]
+            if 'polygons' in pad:
+                pad['polygons'] = [[[-p[0], p[1]] for p in polygon]
+                                   for polygon in pad['polygons']]
+            if 'chamfpos' in pad:
+                c = pad['chamfpos']
+                pad['chamfpos'] = ((c & 5) << 1) | ((c & 10) >> 1)
+            pad['layers'] = [{'F': 'B', 'B': 'F'}[l] for l in pad['layers']]
+        px, py = rotate([px, py], -angle)
+        pad['pos'] = [x + px, y + py]
+        pad['angle'] = (pad['angle'] + angle) % 360
+        if nets:
+            pad['net'] = nets[i]
+        result.append(pad)
+    return result
+
+
+def footprint(ref, x, y, angle, mirror):
+    pads = place(LOCAL_PADS, [x, y, angle, mirror],
+                 ['%s-%d' % (ref, i) for i in range(len(LOCAL_PADS))])
+    return {'ref': ref, 'layer': 'B' if mirror else 'F', 'drawings': [],
+            'bbox': {'pos': [x, y], 'angle': angle, 'relpos': [-3, -3],
+                     'size': [6, 6]},
+            'pads': pads}
+
+
+def assert_pads_equal(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert a.keys() == e.keys()
+        for key in a:
+            if key == 'angle':
+                assert a[key] % 360 == pytest.approx(e[key] % 360)
+            elif key in ('pos', 'offset'):
+                assert a[key] == pytest.approx(e[key])
+            else:
+                assert a[key] == e[key]
+
+
+def test_templates():
+    footprints = [
+        footprint('R1', 10, 10, 0, 0),
+        footprint('R2', 20, 5, 90, 0),
+        footprint('R3', 3, 7, -45, 1),
+        footprint('R4', 40, 40, 180, 1),
+    ]
+    lonely = {'ref': 'U1', 'layer': 'F', 'drawings': [],
+              'bbox': {'pos': [0, 0], 'angle': 0, 'relpos': [0, 0],
+                       'size': [1, 1]},
+              'pads': [{'pos': [1, 1], 'size': [1, 1], 'angle': 0,
+                        'shape': 'rect', 'type': 'smd', 'layers': ['F']}]}
+    pcbdata = {'footprints': copy.deepcopy(footprints) + [lonely]}
+
+    FootprintTemplates().apply(pcbdata)
+
+    templates = pcbdata['footprint_templates']
+    assert len(templates) == 1
+    for original, templated in zip(footprints, pcbdata['footprints']):
+        assert 'pads' not in templated
+        assert templated['template'] == 0
+        assert_pads_equal(
+            place(templates[0]['pads'], templated['transform'],
+                  templated['nets']),
+            original['pads'])
+    assert pcbdata['footprints'][-1] == lonely
@@ -0,0 +1,155 @@
+import zipfile
+
+import pytest
+
+from InteractiveHtmlBom.core.config import Config
+from InteractiveHtmlBom.core.ibom import Logger
+from InteractiveHtmlBom.ecad.fusion_eagle import FusionEagleParser
+
+BOARD = '''<?xml version="1.0" encoding="utf-8"?>
+<eagle version="9.6.2">
+<drawing>
+<board>
+<plain>
+<wire x1="0" y1="0" x2="50" y2="0" width="0" layer="20"/>
+<wire x1="50" y1="0" x2="50" y2="40" width="0" layer="20"/>
+</plain>
+<libraries>
+<library name="small">
+<packages>
+<package name="R0603">
+<smd name="1" x="-0.8" y="0" dx="0.8" dy="0.9" layer="1" roundness="50"/>
+<smd name="2" x="0.8" y="0" dx="0.8" dy="0.9" layer="1"/>
+<wire x1="-1.5" y1="-0.7" x2="1.5" y2="-0.7" width="0.1" layer="21"/>
+</package>
+</packages>
+</library>
+<library name="large">
+<packages>
+<package name="R0603">
+<smd name="1" x="-1.6" y="0" dx="1.6" dy="1.8" layer="1"/>
+<smd name="2" x="1.6" y="0" dx="1.6" dy="1.8" layer="1"/>
+</package>
+<package name="PIN">
+<pad name="1" x="0" y="0" drill="1" diameter="1.7" shape="square"/>
+<text x="0" y="2" size="1" layer="27">&gt;VALUE</text>
+</package>
+<package name="UNUSED">
+<pad name="1" x="0" y="0" drill="1"/>
+</package>
+</packages>
+</library>
+</libraries>
+<attributes>
+<attribute name="REVISION" value="B"/>
+</attributes>
+<elements>
+<element name="R1" library="small" package="R0603" value="10k" x="10" y="20"/>
+<element name="R2" library="large" package="R0603" value="1k" x="20" y="20"
+ rot="R90"/>
+<element name="R3" library="small" package="R0603" value="10k" x="30" y="20"
+ rot="MR180"/>
+<element name="J1" library="large" package="PIN" x="40" y="10"/>
+</elements>
+<signals>
+<signal name="GND">
+<contactref element="R1" pad="1"/>
+<contactref element="J1" pad="1"/>
+<wire x1="10" y1="20" x2="40" y2="10" width="0.25" layer="1"/>
+<wire x1="10" y1="20" x2="40" y2="10" width="0.25" layer="2"/>
+</signal>
+</signals>
+<designrules name="default">
+<param name="rlMinViaOuter" value="4mil"/>
+<param name="mlViaStopLimit" value="0mil"/>
+</designrules>
+</board>
+</drawing>
+</eagle>
+'''
+
+
+@pytest.fixture
+def parser(tmp_path):
+    file_name = tmp_path / 'board.brd'
+    file_name.write_text(BOARD)
+    config = Config('test', str(tmp_path))
+    config.include_tracks = True
+    config.include_nets = True
+    return FusionEagleParser(str(file_name), config, Logger(cli=True))
+
+
+def test_packages_resolved_by_library(parser):
+    pcbdata, components = parser.parse()
+    r1, r2, r3, j1 = pcbdata['footprints']
+    assert [p['size'] for p in r1['pads']] == [[0.8, 0.9], [0.8, 0.9]]
+    assert [p['size'] for p in r2['pads']] == [[1.6, 1.8], [1.6, 1.8]]
+    assert r1['pads'][0]['net'] == 'GND'
+    assert r3['layer'] == 'B'
+    assert r3['pads'][0]['layers'] == ['B']
+    assert j1['pads'][0]['shape'] == 'rect'
+    # placements of the same package share extents
+    assert r1['bbox']['size'] == r3['bbox']['size'] == [3, 1.15]
+    assert [(c.ref, c.val, c.footprint, c.layer) for c in components] == [
+        ('R1', '10k', 'R0603', 'F'),
+        ('R2', '1k', 'R0603', 'F'),
+        ('R3', '10k', 'R0603', 'B'),
+        ('J1', '', 'PIN', 'F'),
+    ]
+    assert pcbdata['metadata']['revision'] == 'B'
+
+
+def test_missing_package(parser, tmp_path):
+    (tmp_path / 'board.brd').write_text(
+        BOARD.replace('package="PIN"', 'package="MISSING"'))
+    assert parser.parse() == (None, None)
+
+
+def test_package_geometry_reused(parser):
+    pcbdata, _ = parser.parse()
+    # R1 and R3 place the same package, geometry is parsed once
+    assert len(parser.package_geometry) == 3
+    r1, _, r3, _ = pcbdata['footprints']
+    assert r1['pads'][0]['size'] == r3['pads'][0]['size']
+    assert r1['pads'][0]['size'] is not r3['pads'][0]['size']
+    assert r1['pads'][0]['pos'] == [9.2, -20]
+    assert r3['pads'][0]['pos'] == pytest.approx([29.2, -20])
+    silk_f = pcbdata['drawings']['silkscreen']['F']
+    silk_b = pcbdata['drawings']['silkscreen']['B']
+    assert silk_f[0]['start'] == [8.5, -19.3]
+    assert silk_b[0]['start'] == pytest.approx([28.5, -20.7])
+
+
+def test_signals(parser):
+    pcbdata, _ = parser.parse()
+    assert pcbdata['nets'] == ['GND']
+    assert pcbdata['tracks']['F'] == [{
+        'net': 'GND', 'start': [10, -20], 'end': [40, -10], 'width': 0.25}]
+    assert pcbdata['tracks']['B'] == []
+    assert parser.elements_pad_nets == {'R1': {'1': 'GND'},
+                                        'J1': {'1': 'GND'}}
+
+
+def test_unused_subtrees_discarded(parser, monkeypatch):
+    # element tags are split between chunks
+    monkeypatch.setattr(FusionEagleParser, 'SCAN_CHUNK_SIZE', 7)
+    with parser._open_board() as brdfile:
+        used_packages = parser._used_packages(brdfile)
+    assert used_packages == {('small', 'R0603'), ('large', 'R0603'),
+                             ('large', 'PIN')}
+    with parser._open_board() as brdfile:
+        root = parser._read_board(brdfile, used_packages)
+    packages = [p.attrib['name'] for p in root.iter('package')]
+    assert packages == ['R0603', 'R0603', 'PIN']
+    assert [t.text for t in root.iter('text')] == []
+    signal = next(root.iter('signal'))
+    assert [w.attrib['layer'] for w in signal.iter('wire')] == ['1']
+
+
+def test_fbrd(parser, tmp_path):
+    file_name = tmp_path / 'board.fbrd'
+    with zipfile.ZipFile(str(file_name), 'w') as z:
+        z.writestr('board.brd', BOARD)
+    parser.file_name = str(file_name)
+    pcbdata, components = parser.parse()
+    assert len(pcbdata['footprints']) == len(components) == 4
@@ -0,0 +1,93 @@
+"""Checks that packed geometry references decode back to original data."""
+import base64
+import copy
+from array import array
+
+import pytest
+
+from InteractiveHtmlBom.core.geometrypacker import GeometryPacker
+
+
+def unpack(pcbdata):
+    """Python equivalent of unpackGeometry() in render.js."""
+    encoding = pcbdata.pop('geometry_encoding')
+    buffers = {
+        'f32': array('f', base64.b64decode(encoding['float32'])).tolist(),
+        'i32': array('i', base64.b64decode(encoding['int32'])).tolist(),
+    }
+
+    def resolve(o):
+        if isinstance(o, dict):
+            for kind in ('f32', 'i32'):
+                if kind in o:
+                    offset, length = o[kind]
+                    return buffers[kind][offset:offset + length]
+            return {k: resolve(v) for k, v in o.items()}
+        if isinstance(o, list):
+            return [resolve(v) for v in o]
+        return o
+
+    return resolve(pcbdata)
+
+
+def polygons(packed):
+    points, lengths = packed['points'], packed['lengths']
+    result = []
+    for length in lengths:
+        result.append([points[i:i + 2] for i in range(0, 2 * length, 2)])
+        points = points[2 * length:]
+    return result
+
+
+@pytest.fixture
+def pcbdata():
+    return {
+        'edges': [
+            {'type': 'segment', 'start': [0, 0], 'end': [10, 0], 'width': 0.1},
+            {'type': 'circle', 'start': [5, 5], 'radius': 1, 'width': 0.1},
+            {'type': 'segment', 'start': [10, 0], 'end': [10, 10],
+             'width': 0.1},
+        ],
+        'footprints': [{'pads': [
+            {'shape': 'custom', 'pos': [1, 1],
+             'polygons': [[[0, 0], [1, 0], [1, 1]]]},
+            {'shape': 'rect', 'pos': [2, 2]},
+        ]}],
+        'tracks': {'F': [
+            {'start': [1, 2], 'end': [3, 4], 'width': 0.25, 'net': 'A'},
+            {'center': [5, 5], 'radius': 2, 'startangle': 0,
+             'endangle': 90, 'width': 0.5, 'net': 'B'},
+            {'start': [6, 6], 'end': [6, 6], 'width': 0.8, 'net': 'A',
+             'drillsize': 0.4},
+        ], 'B': []},
+        'zones': {'F': [{'polygons': [[[0, 0], [2, 0], [2, 2]],
+                                      [[0.5, 0.5], [1, 0.5], [1, 1]]],
+                         'net': 'GND'}],
+                  'B': [{'svgpath': 'M 0 0 L 1 1', 'net': 'GND'}]},
+    }
+
+
+def test_round_trip(pcbdata):
+    packed = unpack(GeometryPacker().pack(copy.deepcopy(pcbdata)))
+
+    assert packed['edges'][0] == pcbdata['edges'][1]
+    assert packed['edges'][1] == {'type': 'segments', 'width': 0.1,
+                                  'coords': [0, 0, 10, 0, 10, 0, 10, 10]}
+
+    pads = packed['footprints'][0]['pads']
+    assert polygons(pads[0]['polygons']) == \
+        pcbdata['footprints'][0]['pads'][0]['polygons']
+    assert pads[1] == pcbdata['footprints'][0]['pads'][1]
+
+    tracks = packed['tracks']['F']
+    assert tracks['segments']['coords'] == [1, 2, 3, 4, 6, 6, 6, 6]
+    assert tracks['segments']['width'] == [0.25, pytest.approx(0.8)]
+    assert tracks['segments']['drillsize'] == [0, pytest.approx(0.4)]
+    assert tracks['segments']['net'] == ['A', 'A']
+    assert tracks['arcs']['coords'] == [5, 5, 2, 0, 90]
+    assert tracks['arcs']['net'] == ['B']
+    assert packed['tracks']['B']['segments']['width'] == []
+
+    assert polygons(packed['zones']['F'][0]['polygons']) == \
+        pcbdata['zones']['F'][0]['polygons']
+    assert packed['zones']['B'] == pcbdata['zones']['B']
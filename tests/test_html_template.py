@@ -0,0 +1,64 @@
+import io
+
+from InteractiveHtmlBom.core.ibom import HtmlTemplate
+
+TEMPLATE = '''<html><head>
+<style>///CSS///</style><style>///USERCSS///</style>
+<script>///CONFIG///</script>
+<script>///PCBDATA///</script>
+</head><body>
+///USERHEADER/// ///UNKNOWN/// ///lower/// ////CSS/// //CSS// ///CSS
+///USERFOOTER///</body></html>
+'''
+
+
+class RecordingFile(io.StringIO):
+    def __init__(self):
+        super(RecordingFile, self).__init__()
+        self.writes = []
+
+    def write(self, s):
+        self.writes.append(s)
+        return super(RecordingFile, self).write(s)
+
+
+def replace_chain(html, substitutions):
+    """Page assembly before HtmlTemplate, pcbdata is replaced last."""
+    for name, value in substitutions.items():
+        if name != 'PCBDATA':
+            html = html.replace('///%s///' % name, value)
+    return html.replace('///PCBDATA///', substitutions['PCBDATA'])
+
+
+def test_matches_replace_chain(monkeypatch):
+    monkeypatch.setattr(HtmlTemplate, 'CHUNK_SIZE', 7)
+    pcbdata = 'var pcbdata = {"tracks": %s}' % ([0.5] * 100)
+    substitutions = {
+        'PCBDATA': pcbdata,
+        'CSS': 'body { color: red; }',
+        'USERCSS': '',
+        'CONFIG': 'var config = {"dark_mode": false}',
+        'USERHEADER': u'<p>ünïcødé µ</p>',
+        'USERFOOTER': '\n',
+    }
+    expected = replace_chain(TEMPLATE, substitutions)
+    assert '///UNKNOWN///' in expected
+
+    template = HtmlTemplate(TEMPLATE)
+    f = RecordingFile()
+    template.write(f, substitutions)
+    assert f.getvalue() == expected
+    # large values are written in chunks
+    assert pcbdata not in f.writes
+    assert pcbdata[:7] in f.writes
+
+    # values can stream themselves in chunks
+    chunks = [pcbdata[i:i + 10] for i in range(0, len(pcbdata), 10)]
+
+    def write_pcbdata(f):
+        for chunk in chunks:
+            f.write(chunk)
+
+    f = io.StringIO()
+    template.write(f, dict(substitutions, PCBDATA=write_pcbdata))
+    assert f.getvalue() == expected
@@ -0,0 +1,83 @@
+"""Checks PcbdataEncoder output against json.dumps() of rounded data."""
+import collections
+import json
+import random
+
+import pytest
+
+from InteractiveHtmlBom.core.jsonencoder import PcbdataEncoder
+
+
+def round_floats(o, precision):
+    if isinstance(o, float):
+        return round(o, precision)
+    if isinstance(o, dict):
+        return {k: round_floats(v, precision) for k, v in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [round_floats(x, precision) for x in o]
+    return o
+
+
+def sample_pcbdata(seed=0):
+    rnd = random.Random(seed)
+
+    def point():
+        return [rnd.uniform(-100, 100), rnd.uniform(-100, 100)]
+
+    return {
+        "edges_bbox": {"minx": 0.1234567891, "maxx": 1e-9, "miny": -1e20,
+                       "maxy": 12345678.123456789},
+        "tracks": {"F": [{"start": point(), "end": point(), "width": 0.25,
+                          "net": u"Net-(U1-Padµ)"}
+                         for _ in range(5000)], "B": []},
+        "zones": {"F": [{"polygons": [[point() for _ in range(100)]],
+                         "net": "GND"}], "B": []},
+        "footprints": [{"ref": "R%d" % i, "center": tuple(point()),
+                        "pads": [{"pin1": 1, "size": [1, 0.5]}]}
+                       for i in range(100)],
+        "nets": ["", "GND", "\"quoted\"\n"],
+        "misc": [None, True, False, 0, -5, float("nan"), float("inf"),
+                 -float("inf"), [float("nan"), 1.5], {}, [], {1: 2.5}],
+    }
+
+
+@pytest.mark.parametrize('precision', [0, 3, 6])
+def test_matches_json_dumps(precision):
+    pcbdata = sample_pcbdata()
+    expected = json.dumps(round_floats(pcbdata, precision))
+    assert PcbdataEncoder(precision).encode(pcbdata) == expected
+
+
+def test_streamed_chunks_match_encode():
+    pcbdata = sample_pcbdata()
+    chunks = []
+    PcbdataEncoder().dump(pcbdata, chunks.append)
+    assert len(chunks) > 1
+    assert ''.join(chunks) == PcbdataEncoder().encode(pcbdata)
+
+
+def test_section_precision():
+    pcbdata = sample_pcbdata()
+    encoded = json.loads(PcbdataEncoder(6, {"zones": 2}).encode(pcbdata))
+    expected = round_floats(pcbdata, 6)
+    expected["zones"] = round_floats(pcbdata["zones"], 2)
+    assert encoded == json.loads(json.dumps(expected))
+
+
+class Float64(float):
+    """Float subclass with its own repr like numpy.float64."""
+
+    def __repr__(self):
+        return 'Float64(%s)' % float.__repr__(self)
+
+
+def test_subclasses():
+    pcbdata = collections.OrderedDict([
+        ("a", Float64(1.23456789)),
+        ("b", [Float64(0.1), 2.000001, True, 3]),
+        ("c", collections.OrderedDict([("d", (Float64(2.5e-9), False))])),
+    ])
+    expected = json.dumps(round_floats(json.loads(json.dumps(pcbdata)), 3))
+    assert PcbdataEncoder(3).encode(pcbdata) == expected
+    assert expected == ('{"a": 1.235, "b": [0.1, 2.0, true, 3], '
+                        '"c": {"d": [0.0, false]}}')
@@ -0,0 +1,176 @@
+import pytest
+
+from InteractiveHtmlBom.core.config import Config
+from InteractiveHtmlBom.core.ibom import Logger
+from InteractiveHtmlBom.ecad.kicad_sexpr import KicadSexprParser
+
+BOARD = r'''(kicad_pcb (version 20240108) (generator "pcbnew")
+  (title_block (title "Test") (rev "B"))
+  (net 0 "")
+  (net 1 "GND")
+  (net 2 "VCC")
+  (footprint "Resistor_SMD:R_0603" (layer "F.Cu") (at 10 20 90)
+    (property "Reference" "R1" (at 0 -1.5 90) (layer "F.SilkS")
+      (effects (font (size 1 1) (thickness 0.15))))
+    (property "Value" "10k" (at 0 1.5 90) (layer "F.Fab")
+      (effects (font (size 1 1) (thickness 0.15))))
+    (property "MPN" "RC0603" (at 0 0 90) (layer "F.Fab") (hide yes)
+      (effects (font (size 1 1))))
+    (attr smd)
+    (fp_line (start -1.5 -0.7) (end 1.5 -0.7) (stroke (width 0.1))
+      (layer "F.SilkS"))
+    (pad "1" smd roundrect (at -0.8 0 90) (size 0.8 0.9)
+      (layers "F.Cu" "F.Mask") (roundrect_rratio 0.25) (net 1 "GND"))
+    (pad "2" smd rect (at 0.8 0 90) (size 0.8 0.9)
+      (layers "F.Cu" "F.Mask") (net 2 "VCC")))
+  (footprint "Connector:Pin" (layer "B.Cu") (at 30 20)
+    (property "Reference" "J1" (at 0 -2 0) (layer "B.SilkS")
+      (effects (font (size 1 1)) (justify mirror)))
+    (property "Value" "Conn" (at 0 2 0) (layer "B.Fab") (hide yes)
+      (effects (font (size 1 1)) (justify mirror)))
+    (attr through_hole exclude_from_bom)
+    (pad "1" thru_hole oval (at 0 0) (size 1.7 1.7) (drill oval 1 1.2)
+      (layers "*.Cu" "*.Mask") (net 1 "GND")))
+  (gr_rect (start 0 0) (end 50 40) (stroke (width 0.1)) (fill none)
+    (layer "Edge.Cuts"))
+  (gr_text "Line 1\nLine \"2\"" (at 25 35 0) (layer "F.SilkS")
+    (effects (font (size 1.5 1.5) (thickness 0.3)) (justify left)))
+  (segment (start 10 20) (end 30 20) (width 0.25) (layer "F.Cu") (net 1))
+  (arc (start 0 5) (mid 1.464466 1.464466) (end 5 0) (width 0.2)
+    (layer "B.Cu") (net 2))
+  (via (at 30 20) (size 0.6) (drill 0.3) (layers "F.Cu" "B.Cu") (net 1))
+  (zone (net 1) (net_name "GND") (layers "F.Cu" "B.Cu")
+    (filled_polygon (layer "B.Cu") (pts (xy 2 2) (xy 48 2) (xy 48 38))))
+  (zone (net 0) (net_name "") (layer "F.Cu") (keepout (tracks not_allowed))
+    (filled_polygon (layer "F.Cu") (pts (xy 1 1) (xy 2 1) (xy 2 2))))
+)
+'''
+
+
+@pytest.fixture
+def parser(tmp_path):
+    file_name = tmp_path / 'board.kicad_pcb'
+    file_name.write_text(BOARD)
+    config = Config('test', str(tmp_path))
+    config.include_tracks = True
+    config.include_nets = True
+    return KicadSexprParser(str(file_name), config, Logger(cli=True))
+
+
+def test_footprints(parser):
+    pcbdata, components = parser.parse()
+    r1, j1 = pcbdata['footprints']
+    assert r1['bbox']['pos'] == [10, 20]
+    assert r1['bbox']['angle'] == 90
+    assert r1['layer'] == 'F'
+    # pads are rotated with the footprint, pad angles are absolute
+    assert [p['pos'] for p in r1['pads']] == [[10, 20.8], [10, 19.2]]
+    assert r1['pads'][0]['angle'] == 90
+    assert r1['pads'][0]['radius'] == 0.2
+    assert r1['pads'][0]['net'] == 'GND'
+    assert r1['pads'][0]['pin1'] == 1
+    assert j1['layer'] == 'B'
+    assert j1['pads'][0]['type'] == 'th'
+    assert j1['pads'][0]['layers'] == ['F', 'B']
+    assert j1['pads'][0]['drillshape'] == 'oblong'
+    assert j1['pads'][0]['drillsize'] == [1, 1.2]
+
+    assert [(c.ref, c.val, c.footprint, c.layer, c.attr)
+            for c in components] == [
+        ('R1', '10k', 'R_0603', 'F', 'Normal'),
+        ('J1', 'Conn', 'Pin', 'B', 'Virtual'),
+    ]
+
+
+def test_drawings(parser):
+    pcbdata, _ = parser.parse()
+    assert pcbdata['edges_bbox'] == {
+        'minx': 0, 'miny': 0, 'maxx': 50, 'maxy': 40}
+    assert pcbdata['metadata']['title'] == 'Test'
+    assert pcbdata['metadata']['revision'] == 'B'
+    silk_f = pcbdata['drawings']['silkscreen']['F']
+    assert silk_f[0]['text'] == 'Line 1\nLine "2"'
+    assert silk_f[0]['justify'] == [-1, 0]
+    assert silk_f[1]['text'] == 'R1'
+    assert silk_f[1]['ref'] == 1
+    assert silk_f[1]['pos'] == [8.5, 20]
+    assert silk_f[2]['start'] == [9.3, 21.5]
+    silk_b = pcbdata['drawings']['silkscreen']['B']
+    assert silk_b[0]['attr'] == ['mirrored']
+    # hidden value text
+    assert pcbdata['drawings']['fabrication']['B'] == []
+
+
+def test_tracks_and_zones(parser):
+    pcbdata, _ = parser.parse()
+    tracks = pcbdata['tracks']
+    assert tracks['F'][0] == {
+        'start': [10, 20], 'end': [30, 20], 'width': 0.25, 'net': 'GND'}
+    arc = tracks['B'][0]
+    assert arc['center'] == pytest.approx([5, 5], abs=1e-5)
+    assert arc['radius'] == pytest.approx(5, abs=1e-5)
+    assert (arc['startangle'], arc['endangle']) == (180, 270)
+    via = {'start': [30, 20], 'end': [30, 20], 'width': 0.6, 'net': 'GND'}
+    assert tracks['F'][1] == tracks['B'][1] == via
+    assert pcbdata['zones'] == {'F': [], 'B': [{
+        'polygons': [[[2, 2], [48, 2], [48, 38]]], 'width': 0, 'net': 'GND'
+    }]}
+    assert pcbdata['nets'] == ['', 'GND', 'VCC']
+
+
+def test_without_nets(parser):
+    parser.config.include_nets = False
+    pcbdata, _ = parser.parse()
+    assert 'nets' not in pcbdata
+    assert 'net' not in pcbdata['footprints'][0]['pads'][0]
+    assert 'net' not in pcbdata['tracks']['F'][0]
+    # vias always keep their net
+    assert pcbdata['tracks']['F'][1]['net'] == 'GND'
+
+
+def test_extra_data_from_pcb(parser):
+    data = parser.parse_extra_data(parser.file_name, False)
+    assert data.fields_by_ref['R1']['MPN'] == 'RC0603'
+    assert 'MPN' in data.fields
+
+
+CURVE_BOARD = r'''(kicad_pcb (version 20240108) (generator "pcbnew")
+  ()
+  (footprint "Logo" (layer "F.Cu") (at 10 10)
+    (property "Reference" "G1" (at 0 0 0) (layer "F.SilkS") (hide yes)
+      (effects (font (size 1 1))))
+    (property "Value" "Logo" (at 0 0 0) (layer "F.Fab") (hide yes)
+      (effects (font (size 1 1))))
+    (fp_curve (pts (xy 0 0) (xy 1 -3) (xy 3 -3) (xy 4 0))
+      (stroke (width 0.2)) (layer "F.SilkS")))
+  (gr_line (start 0 0) (end 20 0) (stroke (width 0)) (layer "Edge.Cuts"))
+  (gr_curve (pts (xy 20 0) (xy 25 5) (xy 25 15) (xy 20 20))
+    (stroke (width 0)) (layer "Edge.Cuts"))
+)
+'''
+
+
+def test_curves(tmp_path):
+    file_name = tmp_path / 'board.kicad_pcb'
+    file_name.write_text(CURVE_BOARD)
+    parser = KicadSexprParser(str(file_name), Config('test', str(tmp_path)),
+                              Logger(cli=True))
+    pcbdata, _ = parser.parse()
+    # bounding boxes use the hull of the control points
+    assert pcbdata['edges_bbox'] == {
+        'minx': 0, 'miny': 0, 'maxx': 25, 'maxy': 20}
+    bbox = pcbdata['footprints'][0]['bbox']
+    assert bbox['relpos'] == pytest.approx([-0.1, -3.1])
+    assert bbox['size'] == pytest.approx([4.2, 3.2])
+    curve = pcbdata['drawings']['silkscreen']['F'][0]
+    assert curve['type'] == 'curve'
+
+
+def test_not_a_board(tmp_path):
+    from InteractiveHtmlBom.errors import ParsingException
+
+    file_name = tmp_path / 'board.kicad_pcb'
+    file_name.write_text('(kicad_sch (version 20231120))')
+    with pytest.raises(ParsingException):
+        KicadSexprParser(str(file_name), Config('test', str(tmp_path)),
+                         Logger(cli=True))
@@ -0,0 +1,117 @@
+"""Checks that the fast LZString compressor output is byte-identical to the
+reference implementation and decompresses back to the input.
+
+benchmarks/lzstring.py times both compressors.
+"""
+import base64
+import json
+import random
+
+import pytest
+
+from InteractiveHtmlBom.core import lzstring_fast
+from InteractiveHtmlBom.core.lzstring import LZString
+
+
+def decompress_from_base64(compressed):
+    """Port of _decompress() from web/lz-string.js."""
+    data = base64.b64decode(compressed)
+
+    def read_bits():
+        for byte in data:
+            for shift in range(7, -1, -1):
+                yield (byte >> shift) & 1
+
+    bit_stream = read_bits()
+
+    def read(num_bits):
+        value = 0
+        for i in range(num_bits):
+            value |= next(bit_stream) << i
+        return value
+
+    dictionary = {0: 0, 1: 1, 2: 2}
+    enlarge_in = 4
+    dict_size = 4
+    num_bits = 3
+
+    marker = read(2)
+    if marker == 2:
+        return ''
+    w = chr(read(8 if marker == 0 else 16))
+    dictionary[3] = w
+    result = [w]
+    while True:
+        c = read(num_bits)
+        if c in (0, 1):
+            dictionary[dict_size] = chr(read(8 if c == 0 else 16))
+            c = dict_size
+            dict_size += 1
+            enlarge_in -= 1
+        elif c == 2:
+            return ''.join(result)
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+        if c in dictionary:
+            entry = dictionary[c]
+        else:
+            assert c == dict_size
+            entry = w + w[0]
+        result.append(entry)
+        dictionary[dict_size] = w + entry[0]
+        dict_size += 1
+        enlarge_in -= 1
+        w = entry
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+
+
+def synthetic_pcbdata(tracks, seed=0):
+    rnd = random.Random(seed)
+    return json.dumps({
+        "tracks": {"F": [{
+            "start": [round(rnd.uniform(0, 100), 6),
+                      round(rnd.uniform(0, 100), 6)],
+            "end": [round(rnd.uniform(0, 100), 6),
+                    round(rnd.uniform(0, 100), 6)],
+            "width": 0.25,
+            "net": "Net-(U%d-Pad%d)" % (rnd.randint(1, 50), rnd.randint(1, 9)),
+        } for _ in range(tracks)]},
+    })
+
+
+def corpus():
+    rnd = random.Random(42)
+    yield ''
+    yield 'a'
+    yield 'ab'
+    yield 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa'
+    yield 'abcabcabcabcabcabcabcabcabcabcabcabcabcabcabc'
+    yield 'hello world, ' * 100
+    yield u'ünïcødé ✓ 中文 μΩ ' * 20
+    yield ''.join(chr(rnd.randint(1, 0xd7ff)) for _ in range(2000))
+    for _ in range(100):
+        yield ''.join(rnd.choice('ab{}[]",.:0123456789')
+                      for _ in range(rnd.randint(1, 500)))
+    # Large enough for codes to outgrow 16 bits
+    yield synthetic_pcbdata(20000)
+
+
+@pytest.mark.parametrize('s', list(corpus()))
+def test_fast_compressor_matches_reference(s):
+    assert lzstring_fast.compress(s) == LZString.compress(s)
+    assert lzstring_fast.compress_to_base64(s) == \
+        LZString().compress_to_base64(s)
+
+
+@pytest.mark.parametrize('s', list(corpus()))
+def test_round_trip(s):
+    assert decompress_from_base64(lzstring_fast.compress_to_base64(s)) == s
+
+
+def test_none():
+    assert lzstring_fast.compress(None) == ''
+    assert lzstring_fast.compress_to_base64(None) == ''
+
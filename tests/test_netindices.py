@@ -0,0 +1,24 @@
+from InteractiveHtmlBom.core.netindices import index_nets
+
+
+def test_index_nets():
+    pcbdata = {
+        'nets': ['', 'GND', 'VCC'],
+        'tracks': {'F': [{'net': 'VCC'}, {'net': 'GND'}], 'B': [{}]},
+        'zones': {'F': [{'net': 'GND'}], 'B': []},
+        'footprints': [{'pads': [{'net': ''}, {'net': 'NC'}, {}]}],
+    }
+
+    index_nets(pcbdata)
+
+    assert pcbdata['indexed_nets'] == 1
+    assert pcbdata['nets'] == ['', 'GND', 'VCC', 'NC']
+    assert pcbdata['tracks'] == {'F': [{'net': 2}, {'net': 1}], 'B': [{}]}
+    assert pcbdata['zones']['F'] == [{'net': 1}]
+    assert pcbdata['footprints'][0]['pads'] == [{'net': 0}, {'net': 3}, {}]
+
+
+def test_no_nets():
+    pcbdata = {'footprints': [{'pads': [{'net': 'GND'}]}]}
+    index_nets(pcbdata)
+    assert pcbdata == {'footprints': [{'pads': [{'net': 'GND'}]}]}
@@ -0,0 +1,59 @@
+import random
+
+from InteractiveHtmlBom.core.polylines import merge_tracks
+
+
+def segment_set(tracks):
+    result = []
+    for t in tracks:
+        points = t['points'] if 'points' in t else [t['start'], t['end']]
+        for a, b in zip(points, points[1:]):
+            result.append((t['width'], t.get('net'),
+                           tuple(sorted([tuple(a), tuple(b)]))))
+    return sorted(result)
+
+
+def test_chain():
+    tracks = [
+        {'start': [1, 0], 'end': [2, 0], 'width': 0.2, 'net': 'A'},
+        {'start': [0, 0], 'end': [1, 0], 'width': 0.2, 'net': 'A'},
+        {'start': [2, 1], 'end': [2, 0], 'width': 0.2, 'net': 'A'},
+    ]
+    merged = merge_tracks(tracks)
+    assert len(merged) == 1
+    assert merged[0]['points'] in ([[0, 0], [1, 0], [2, 0], [2, 1]],
+                                   [[2, 1], [2, 0], [1, 0], [0, 0]])
+    assert segment_set(merged) == segment_set(tracks)
+
+
+def test_other_tracks_are_kept():
+    via = {'start': [1, 0], 'end': [1, 0], 'width': 0.6, 'net': 'A',
+           'drillsize': 0.3}
+    arc = {'center': [0, 0], 'radius': 1, 'startangle': 0, 'endangle': 90,
+           'width': 0.2, 'net': 'A'}
+    tracks = [
+        via, arc,
+        {'start': [0, 0], 'end': [1, 0], 'width': 0.2, 'net': 'A'},
+        # different width and net are not merged
+        {'start': [1, 0], 'end': [2, 0], 'width': 0.3, 'net': 'A'},
+        {'start': [1, 0], 'end': [1, 1], 'width': 0.2, 'net': 'B'},
+    ]
+    merged = merge_tracks(tracks)
+    assert merged[:2] == [via, arc]
+    assert sorted(merged[2:], key=repr) == sorted(tracks[2:], key=repr)
+
+
+def test_random_networks():
+    rnd = random.Random(0)
+    tracks = []
+    for n in range(50):
+        p = [rnd.randint(0, 20), rnd.randint(0, 20)]
+        for _ in range(rnd.randint(1, 10)):
+            q = [p[0] + rnd.randint(-1, 1), p[1] + rnd.randint(-1, 1)]
+            if q != p:
+                tracks.append({'start': p, 'end': q, 'width': 0.25,
+                               'net': 'N%d' % (n % 3)})
+            p = q
+    merged = merge_tracks(tracks)
+    assert len(merged) < len(tracks)
+    assert segment_set(merged) == segment_set(tracks)
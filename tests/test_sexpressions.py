@@ -0,0 +1,71 @@
+from InteractiveHtmlBom.ecad.kicad_extra import sexpressions
+from InteractiveHtmlBom.ecad.kicad_extra.netlistparser import NetlistParser
+from InteractiveHtmlBom.ecad.kicad_extra.sexpressions import (
+    iter_sexpression, parse_sexpression)
+
+NETLIST = r'''(export (version "E")
+  (design (source "test.kicad_sch"))
+  (components
+    (comp (ref "R1")
+      (value "10k")
+      (datasheet "~")
+      (fields
+        (field (name "MPN") "RC0603")
+        (field (name "Note") "say \"hi\""))
+      (libsource (lib "Device") (part "R") (description "Resistor")))
+    (comp (ref "C1")
+      (value "1u")
+      (datasheet "http://example.com")
+      (property (name "dnp"))))
+  (nets
+    (net (code "1") (name "GND") (node (ref "R1") (pin "1")))))
+'''
+
+
+def test_parse_sexpression():
+    assert parse_sexpression(
+        '(root head (a 1 "two words") (b (c "q\\"uote\\\\")) ())') == [
+        'root', 'head', ['a', '1', 'two words'], ['b', ['c', 'q"uote\\']],
+        []]
+
+
+def test_iter_sexpression():
+    text = '(root head (a 1) (b (c 2)) (a (d 3)))'
+    assert list(iter_sexpression(text)) == [
+        ['a', '1'], ['b', ['c', '2']], ['a', ['d', '3']]]
+    assert list(iter_sexpression(text, ['a'])) == [['d', '3']]
+    assert list(iter_sexpression(text, ['b'])) == [['c', '2']]
+    assert list(iter_sexpression(text, ['b', 'c'])) == []
+    assert list(iter_sexpression(text, ['x'])) == []
+
+
+def test_iter_sexpression_chunks(monkeypatch):
+    monkeypatch.setattr(sexpressions, 'CHUNK_SIZE', 4)
+    text = '(root\n(a "x\ny")\n(b c)\n)'
+    assert list(iter_sexpression(text)) == [['a', 'x\ny'], ['b', 'c']]
+
+
+def test_chunks_after_escaped_backslash(monkeypatch):
+    monkeypatch.setattr(sexpressions, 'CHUNK_SIZE', 4)
+    text = ('(root\n(source "C:\\\\out\\\\")\n(a "x\\"\n\\\\")\n' +
+            '(b c)\n' * 100 + ')')
+    chunks = list(sexpressions._chunks(text))
+    # the string ending in a backslash does not extend chunks to the end
+    assert len(chunks) > 100
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(text)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    assert parse_sexpression(text)[:3] == [
+        'root', ['source', 'C:\\out\\'], ['a', 'x"\n\\']]
+
+
+def test_netlist_parser(tmp_path):
+    file_name = tmp_path / 'test.net'
+    file_name.write_text(NETLIST)
+    fields, comp_dict = NetlistParser(str(file_name)).get_extra_field_data()
+    assert sorted(fields) == [
+        'Datasheet', 'Description', 'MPN', 'Note', 'kicad_dnp']
+    assert comp_dict == {
+        'R1': {'Description': 'Resistor', 'MPN': 'RC0603',
+               'Note': 'say "hi"'},
+        'C1': {'Datasheet': 'http://example.com', 'kicad_dnp': 'DNP'},
+    }
@@ -0,0 +1,70 @@
+import math
+
+from InteractiveHtmlBom.core.simplify import simplify_ring, simplify_zones
+
+
+def circle(r, n, reverse=False):
+    step = (-2 if reverse else 2) * math.pi / n
+    return [[r * math.cos(i * step), r * math.sin(i * step)]
+            for i in range(n)]
+
+
+def distance_to_ring(p, ring):
+    best = float('inf')
+    for a, b in zip(ring, ring[1:] + ring[:1]):
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        t = ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / (dx * dx + dy * dy)
+        t = max(0, min(1, t))
+        best = min(best, math.hypot(a[0] + t * dx - p[0],
+                                    a[1] + t * dy - p[1]))
+    return best
+
+
+def test_collinear_points_removed():
+    ring = [[0, 0], [1, 0], [2, 0.001], [3, 0], [3, 1], [0, 1]]
+    assert simplify_ring(ring, 0.01) == [[0, 0], [3, 0], [3, 1], [0, 1]]
+
+
+def test_within_tolerance():
+    ring = circle(10, 1000)
+    simplified = simplify_ring(ring, 0.01)
+    assert 10 < len(simplified) < 200
+    assert all(p in ring for p in simplified)
+    assert max(distance_to_ring(p, simplified) for p in ring) <= 0.01
+
+
+def test_small_rings_are_kept():
+    zone = {'polygons': [circle(10, 500), circle(0.001, 40, reverse=True)]}
+    pcbdata = {'zones': {'F': [zone], 'B': [{'svgpath': 'M 0 0'}]}}
+    removed, total = simplify_zones(pcbdata, 0.1)
+    assert total == 540
+    polygons = zone['polygons']
+    assert len(polygons) == 2
+    assert removed == 540 - len(polygons[0]) - len(polygons[1])
+    # hole collapses to less than 3 points, so it is kept as is
+    assert polygons[1] == circle(0.001, 40, reverse=True)
+
+
+def test_outline_does_not_cross_hole():
+    # the dent is within tolerance but a hole sits inside it
+    outer = [[0, 0], [4, 0], [5, -0.09], [6, 0], [10, 0], [10, 10], [0, 10]]
+    hole = [[4.9, -0.05], [5, 0.05], [5.1, -0.05]]
+    zone = {'polygons': [outer, hole]}
+    removed, total = simplify_zones({'zones': {'F': [zone]}}, 0.1)
+    assert (removed, total) == (0, 10)
+    assert zone['polygons'] == [outer, hole]
+    # without the hole the dent is removed
+    zone = {'polygons': [outer]}
+    simplify_zones({'zones': {'F': [zone]}}, 0.1)
+    assert zone['polygons'] == [[[0, 0], [10, 0], [10, 10], [0, 10]]]
+
+
+def test_outline_does_not_cross_itself():
+    # the dent is within tolerance but a slit from the top reaches into it
+    ring = [[0, 0], [4, 0], [5, -0.09], [6, 0], [10, 0], [10, 10],
+            [5.05, 10], [5.05, -0.04], [4.95, -0.04], [4.95, 10], [0, 10]]
+    assert simplify_ring(ring, 0.1) != ring
+    zone = {'polygons': [ring]}
+    removed, _ = simplify_zones({'zones': {'F': [zone]}}, 0.1)
+    assert removed == 0
+    assert zone['polygons'] == [ring]
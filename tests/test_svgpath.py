@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from InteractiveHtmlBom.ecad.svgpath import parse_path, path_bbox
+
+
+class RecordingLogger(object):
+    def __init__(self):
+        self.warnings = []
+
+    def warn(self, *args):
+        self.warnings.append(args)
+
+
+def segments_bbox(path, logger):
+    bbox = None
+    for segment in parse_path(path, logger):
+        x0, x1, y0, y1 = segment.bbox()
+        if bbox is None:
+            bbox = [x0, x1, y0, y1]
+        else:
+            bbox = [min(bbox[0], x0), max(bbox[1], x1),
+                    min(bbox[2], y0), max(bbox[3], y1)]
+    return bbox
+
+
+@pytest.mark.parametrize('path', [
+    'M 0 0 L 10 0 L 10 5 Z',
+    'm1,1 h5 v-3 H0 V10 l1 1 z',
+    'M 0 0 A 5 5 0 0 1 10 0',
+    'M 0 0 A 5 5 0 1 0 10 0',
+    'M 0 0 A 1 1 0 0 1 10 0',
+    'M 3 4 a 10 3 30 1 1 5 5 A 2 7 -45 0 0 0 0',
+    'M 2 2 L 4 4 M 8 8',
+    'M 0 0 C 1 2 3 4 5 6 S 1 2 3 3 Q 0 9 1 1 T 4 4',
+])
+def test_path_bbox(path):
+    expected_logger = RecordingLogger()
+    logger = RecordingLogger()
+    expected = segments_bbox(path, expected_logger)
+    assert list(path_bbox(path, logger)) == pytest.approx(expected)
+    assert logger.warnings == expected_logger.warnings
+
+
+def test_path_bbox_random_arcs():
+    rnd = random.Random(0)
+    for _ in range(1000):
+        x0, y0, x1, y1 = (rnd.uniform(-10, 10) for _ in range(4))
+        path = 'M %s %s A %s %s %s %d %d %s %s' % (
+            x0, y0, rnd.uniform(0.1, 10), rnd.uniform(0.1, 10),
+            rnd.choice([0, 30, 90, rnd.uniform(-180, 180)]),
+            rnd.randint(0, 1), rnd.randint(0, 1), x1, y1)
+        expected = segments_bbox(path, None)
+        assert list(path_bbox(path, None)) == pytest.approx(expected)
+
+
+def test_path_bbox_cached():
+    logger = RecordingLogger()
+    path = 'M 0 0 Q 1 1 2 0'
+    assert path_bbox(path, logger) == path_bbox(path, logger)
+    # warnings are repeated for cached paths
+    assert len(logger.warnings) == 2
+    assert path_bbox('M 1 1', logger) is None
@@ -0,0 +1,27 @@
+import pytest
+
+from InteractiveHtmlBom.core import units
+
+
+@pytest.mark.parametrize('value, ref, expected', [
+    ('10k', 'R1', ('10000.000000000000000', 'R')),
+    ('4.7uF', 'C2', ('0.000004700000000', 'F')),
+    (u'4.7µ', 'C3', ('0.000004700000000', 'F')),
+    ('0R05', 'R4', ('0.050000000000000', 'R')),
+    ('100n', 'L5', ('0.000000100000000', 'H')),
+    ('100n', 'U6', ('0.000000100000000', None)),
+    ('2Meg', 'RV7', ('2000000.000000000000000', 'R')),
+    ('LM358', 'U8', ('LM358', None)),
+])
+def test_component_value(value, ref, expected):
+    assert units.componentValue(value, ref) == expected
+
+
+def test_component_value_memoized():
+    units.compMatch.cache_clear()
+    units.componentValue('10k', 'R1')
+    units.componentValue('10k', 'R2')
+    # unit implied by reference is not part of the cached value
+    assert units.componentValue('10', 'C3') == ('10.000000000000000', 'F')
+    assert units.componentValue('10', 'R4') == ('10.000000000000000', 'R')
+    assert units.compMatch.cache_info().hits == 2
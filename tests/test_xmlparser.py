@@ -0,0 +1,43 @@
+from InteractiveHtmlBom.ecad.kicad_extra.xmlparser import XmlParser
+
+NETLIST = '''<?xml version="1.0" encoding="UTF-8"?>
+<export version="E">
+  <components>
+    <comp ref="R1">
+      <value>10k</value>
+      <datasheet>~</datasheet>
+      <fields>
+        <field name="MPN">RC0603</field>
+        <field name="Note">say &quot;hi&quot;</field>
+      </fields>
+      <libsource lib="Device" part="R" description="Resistor"/>
+    </comp>
+    <comp ref="C1">
+      <value>1u</value>
+      <datasheet>http://example.com</datasheet>
+      <property name="dnp"/>
+    </comp>
+  </components>
+  <libparts>
+    <libpart lib="Device" part="R">
+      <fields><field name="Reference">R</field></fields>
+    </libpart>
+  </libparts>
+  <nets>
+    <net code="1" name="GND"><node ref="R1" pin="1"/></net>
+  </nets>
+</export>
+'''
+
+
+def test_xml_parser(tmp_path):
+    file_name = tmp_path / 'test.xml'
+    file_name.write_text(NETLIST)
+    fields, comp_dict = XmlParser(str(file_name)).get_extra_field_data()
+    assert sorted(fields) == [
+        'Datasheet', 'Description', 'MPN', 'Note', 'kicad_dnp']
+    assert comp_dict == {
+        'R1': {'Description': 'Resistor', 'MPN': 'RC0603',
+               'Note': 'say "hi"'},
+        'C1': {'Datasheet': 'http://example.com', 'kicad_dnp': 'DNP'},
+    }